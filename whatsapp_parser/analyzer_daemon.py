@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Analyzer Daemon
+Long-running process that keeps the parser, analyzers, price caches and
+leaderboard aggregates warm, and runs jobs sent over a Unix socket or
+token-protected local HTTP
+"""
+
+import argparse
+import hmac
+import json
+import os
+import secrets
+import socketserver
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from columnar_io import is_columnar_path
+from http_replay import build_http_client, price_base_urls
+from leaderboard import GROUP_FIELDS, PerformanceAggregator, state_path_for
+from metrics import METRICS
+from signal_analyzer import TradingSignalAnalyzer
+from signal_store import SignalStore
+from simple_price_analyzer import SimplePriceAnalyzer
+from trading_calendar import HOLIDAYS_HELP, TradingCalendar
+from trading_parser import TradingSignalParser
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default local HTTP port of the daemon
+DEFAULT_PORT = 8770
+
+# Default Unix socket path of the daemon (the default transport)
+DEFAULT_SOCKET_PATH = 'analyzer.sock'
+
+# Default file holding the per-start HTTP API token
+DEFAULT_TOKEN_PATH = 'analyzer.token'
+
+# Jobs without side effects, the only ones served over HTTP GET
+READ_ONLY_JOBS = {'ping'}
+
+# Maximum signals or rows returned by a job unless it asks for a limit
+DEFAULT_RESULT_LIMIT = 1000
+
+# Signal store filters accepted by the query, analyze and score jobs
+QUERY_FILTERS = ('stock', 'sender', 'action', 'start_date', 'end_date',
+                 'cutoff_start', 'cutoff_end', 'expired_as_of')
+
+
+def _json_default(value):
+    """Encode numpy scalars and other non-JSON values in job responses"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class JobError(Exception):
+    """A job request that cannot be run (unknown job, missing or bad parameters)"""
+
+
+class AnalyzerDaemon:
+    """Resident analyzers and caches, and the jobs that run against them"""
+
+    def __init__(self, api_key: Optional[str] = None, cache_path: Optional[str] = 'price_cache.db',
+                 workers: int = 4, trading_days: bool = False, holidays_path: Optional[str] = None,
+                 store_path: Optional[str] = 'signals.db', leaderboard_path: Optional[str] = None,
+                 base_urls: Optional[Dict[str, str]] = None, http_client=None):
+        """
+        Initialize daemon state
+
+        Args:
+            api_key: API key for stock data provider (optional)
+            cache_path: Path to the on-disk price cache (None keeps it in memory)
+            workers: Number of concurrent price fetch workers
+            trading_days: Count signal time frames in NSE trading days
+            holidays_path: File of extra exchange holidays (optional)
+            store_path: SQLite signal store queried and filled by jobs (None disables it)
+            leaderboard_path: Leaderboard snapshot kept up to date by score jobs (optional)
+            base_urls: Per-provider base URL overrides (optional)
+            http_client: Client used for provider requests (optional)
+        """
+        calendar = TradingCalendar.from_file(holidays_path) if holidays_path else None
+        self.parser = TradingSignalParser()
+        self.signal_analyzer = TradingSignalAnalyzer(trading_days=trading_days or bool(holidays_path),
+                                                     calendar=calendar)
+        self.price_analyzer = SimplePriceAnalyzer(api_key, cache_path=cache_path, max_workers=workers,
+                                                  base_urls=base_urls, http_client=http_client)
+        self.store = SignalStore(store_path, analyzer=self.signal_analyzer) if store_path else None
+        self.leaderboard_path = leaderboard_path
+        self.aggregator = (PerformanceAggregator(state_path_for(leaderboard_path))
+                           if leaderboard_path else None)
+
+        # Parser and loader state is per file, so those jobs run one at a time
+        self.load_lock = threading.Lock()
+        self.started_at = time.time()
+        self.jobs_run = Counter()
+
+        self.jobs: Dict[str, Callable[[Dict], Dict]] = {
+            'ping': self.job_ping,
+            'parse': self.job_parse,
+            'analyze': self.job_analyze,
+            'score': self.job_score,
+            'query': self.job_query,
+            'quotes': self.job_quotes,
+            'leaderboard': self.job_leaderboard,
+            'metrics': self.job_metrics,
+        }
+
+    def run_job(self, name: str, params: Dict) -> Dict:
+        """
+        Run one job and wrap its result
+
+        Args:
+            name: Job name
+            params: Job parameters
+
+        Returns:
+            {'ok': True, 'job', 'result', 'seconds'} or {'ok': False, 'job', 'error'}
+        """
+        start = time.perf_counter()
+        try:
+            job = self.jobs.get(name)
+            if job is None:
+                raise JobError(f"Unknown job '{name}' (available: {', '.join(sorted(self.jobs))})")
+            result = job(params or {})
+            self.jobs_run[name] += 1
+            return {'ok': True, 'job': name, 'result': result, 'seconds': round(time.perf_counter() - start, 6)}
+        except JobError as e:
+            return {'ok': False, 'job': name, 'error': str(e)}
+        except Exception as e:
+            logger.error(f"Job {name} failed: {e}")
+            return {'ok': False, 'job': name, 'error': f"{type(e).__name__}: {e}"}
+        finally:
+            METRICS.observe('daemon_job_seconds', time.perf_counter() - start,
+                            job=name if name in self.jobs else 'unknown')
+
+    def _limit(self, params: Dict) -> int:
+        """Get the result limit of a job"""
+        return int(params.get('limit', DEFAULT_RESULT_LIMIT))
+
+    def _load_signals(self, params: Dict) -> List[Dict]:
+        """
+        Get the raw signals a job works on
+
+        Taken from params['signals'], a signal file in params['path'] (JSON,
+        NDJSON, CSV or columnar), or else the signal store filtered by the
+        QUERY_FILTERS present in params.
+        """
+        if 'signals' in params:
+            return list(params['signals'])
+
+        path = params.get('path')
+        if path:
+            if not os.path.exists(path):
+                raise JobError(f"File not found: {path}")
+            with self.load_lock:
+                if path.endswith('.csv'):
+                    self.signal_analyzer.load_signals_from_csv(path)
+                elif is_columnar_path(path):
+                    self.signal_analyzer.load_signals_from_columnar(path)
+                else:
+                    self.signal_analyzer.load_signals_from_json(path)
+                return self.signal_analyzer.signals
+
+        if self.store is None:
+            raise JobError("Give 'signals' or 'path' (no signal store configured)")
+        filters = {key: params[key] for key in QUERY_FILTERS if key in params}
+        return list(self.store.query(**filters))
+
+    def job_ping(self, params: Dict) -> Dict:
+        """Report that the daemon is up, with its uptime and job counts"""
+        return {
+            'uptime_seconds': round(time.time() - self.started_at, 3),
+            'jobs_run': dict(self.jobs_run),
+            'stored_signals': self.store.count() if self.store else None,
+        }
+
+    def job_parse(self, params: Dict) -> Dict:
+        """
+        Parse a chat export; params: path, store (default true), include_signals, limit
+
+        New signals are added to the signal store and counted as leaderboard tips.
+        """
+        path = params.get('path')
+        if not path or not os.path.exists(path):
+            raise JobError(f"Chat export not found: {path}")
+
+        with self.load_lock:
+            signals = self.parser.parse_file(path)
+
+        result = {'signals': len(signals)}
+        if self.store is not None and params.get('store', True):
+            result['stored'] = self.store.add_signals(signals)
+        if self.aggregator is not None:
+            result['new_tips'] = self.aggregator.add_signals(signals)
+        if params.get('include_signals'):
+            result['items'] = signals[:self._limit(params)]
+        return result
+
+    def job_analyze(self, params: Dict) -> Dict:
+        """Run cutoff/expiry analysis; params: signals, path or store filters, today, include_signals, limit"""
+        analyzed = self.signal_analyzer.analyze_signal_batch(self._load_signals(params), params.get('today'))
+        expired = sum(signal['is_expired'] for signal in analyzed)
+        result = {'total': len(analyzed), 'expired': expired, 'active': len(analyzed) - expired}
+        if params.get('include_signals'):
+            result['items'] = analyzed[:self._limit(params)]
+        return result
+
+    def job_score(self, params: Dict) -> Dict:
+        """
+        Score expired signals against prices; params: signals, path or store filters, today, limit
+
+        Returns outcome counts and performance report rows. Results are folded
+        into the resident leaderboard, whose snapshot is rewritten.
+        """
+        analyzed = self.signal_analyzer.analyze_signal_batch(self._load_signals(params), params.get('today'))
+        expired = [signal for signal in analyzed if signal['is_expired']]
+        results = self.price_analyzer.analyze_multiple_signals(expired)
+
+        if self.aggregator is not None:
+            self.aggregator.add_results(results)
+            self.aggregator.save_state()
+            self.aggregator.save_snapshot(self.leaderboard_path)
+
+        outcomes = Counter(result['price_analysis'].get('outcome', 'NO_DATA') for result in results)
+        return {
+            'total': len(analyzed),
+            'scored': len(results),
+            'outcomes': dict(outcomes),
+            'rows': [self.price_analyzer.performance_row(result) for result in results[:self._limit(params)]],
+        }
+
+    def job_query(self, params: Dict) -> Dict:
+        """Query the signal store; params: QUERY_FILTERS and limit"""
+        if self.store is None:
+            raise JobError("No signal store configured")
+        filters = {key: params[key] for key in QUERY_FILTERS if key in params}
+        signals = list(self.store.query(limit=self._limit(params), **filters))
+        return {'count': len(signals), 'items': signals}
+
+    def job_quotes(self, params: Dict) -> Dict:
+        """Get current prices from the shared quote cache; params: symbols"""
+        symbols = params.get('symbols')
+        if isinstance(symbols, str):
+            symbols = symbols.split(',')
+        if not symbols:
+            raise JobError("Give 'symbols'")
+        return {'prices': self.price_analyzer.fetch_current_prices(symbols)}
+
+    def job_leaderboard(self, params: Dict) -> Dict:
+        """Get ranked leaderboard rows; params: group (brokers or stocks), limit"""
+        if self.aggregator is None:
+            raise JobError("No leaderboard configured (start the daemon with --leaderboard)")
+        group = params.get('group', 'brokers')
+        if group not in GROUP_FIELDS:
+            raise JobError(f"Unknown group '{group}' (available: {', '.join(GROUP_FIELDS)})")
+        return {'group': group, 'items': self.aggregator.leaderboard(group)[:self._limit(params)]}
+
+    def job_metrics(self, params: Dict) -> Dict:
+        """Get the metrics collected since the daemon started"""
+        return METRICS.summary()
+
+    def close(self):
+        """Save the leaderboard and release the caches and store"""
+        if self.aggregator is not None:
+            self.aggregator.save_state()
+            self.aggregator.save_snapshot(self.leaderboard_path)
+            self.aggregator.close()
+        if self.store is not None:
+            self.store.close()
+        self.price_analyzer.close()
+
+
+def write_token_file(token_path: str) -> str:
+    """
+    Generate the per-start API token and write it to a file only the owner can read
+
+    Args:
+        token_path: File the thin client reads the token from
+
+    Returns:
+        The token
+    """
+    token = secrets.token_urlsafe(32)
+    fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+    # The mode passed to os.open is ignored when the file already existed
+    os.chmod(token_path, 0o600)
+    return token
+
+
+def make_http_server(daemon: AnalyzerDaemon, token: str, host: str = '127.0.0.1',
+                     port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """
+    Build the HTTP front end: POST /jobs/<name> with JSON parameters
+
+    Every request must carry the per-start token as "Authorization: Bearer
+    <token>", and POSTs must be application/json. Requests whose Host or
+    Origin is not this server are refused, so web pages cannot reach the API
+    through the browser (cross-site forms, images, DNS rebinding). GET only
+    serves the read-only READ_ONLY_JOBS.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def _job_name(self) -> Optional[str]:
+            parts = self.path.split('?', 1)[0].strip('/').split('/')
+            return parts[1] if len(parts) == 2 and parts[0] == 'jobs' else None
+
+        def _reply(self, status: int, body: Dict):
+            payload = json.dumps(body, default=_json_default).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _refusal(self) -> Optional[Tuple[int, str]]:
+            """Get the status and reason a request is refused for, or None if it is allowed"""
+            local_hosts = {f'{name}:{self.server.server_address[1]}'
+                           for name in (host, '127.0.0.1', 'localhost')}
+            if self.headers.get('Host') not in local_hosts:
+                return 403, 'Host not allowed'
+            origin = self.headers.get('Origin')
+            if origin is not None and origin not in {f'http://{name}' for name in local_hosts}:
+                return 403, 'Cross-origin requests are not allowed'
+            scheme, _, supplied = (self.headers.get('Authorization') or '').partition(' ')
+            if scheme != 'Bearer' or not hmac.compare_digest(supplied.encode(), token.encode()):
+                return 401, 'Missing or wrong API token'
+            return None
+
+        def _run(self, params: Dict):
+            name = self._job_name()
+            if name is None:
+                self._reply(404, {'ok': False, 'error': 'Use /jobs/<name>'})
+                return
+            if name == 'shutdown':
+                self._reply(200, {'ok': True, 'job': 'shutdown', 'result': {'stopping': True}})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            response = daemon.run_job(name, params)
+            self._reply(200 if response['ok'] else 400, response)
+
+        def do_GET(self):
+            refusal = self._refusal()
+            if refusal is not None:
+                self._reply(refusal[0], {'ok': False, 'error': refusal[1]})
+            elif self._job_name() not in READ_ONLY_JOBS:
+                self._reply(405, {'ok': False, 'error': 'Use POST with a JSON body to run jobs'})
+            else:
+                self._run({})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length)
+            refusal = self._refusal()
+            if refusal is not None:
+                self._reply(refusal[0], {'ok': False, 'error': refusal[1]})
+                return
+            if self.headers.get_content_type() != 'application/json':
+                self._reply(415, {'ok': False, 'error': 'Content-Type must be application/json'})
+                return
+            try:
+                params = json.loads(body or b'{}')
+            except ValueError as e:
+                self._reply(400, {'ok': False, 'error': f"Invalid JSON: {e}"})
+                return
+            if not isinstance(params, dict):
+                self._reply(400, {'ok': False, 'error': 'Job parameters must be a JSON object'})
+                return
+            self._run(params)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def make_unix_server(daemon: AnalyzerDaemon, socket_path: str = DEFAULT_SOCKET_PATH):
+    """
+    Build the Unix socket front end: one JSON request per line, one JSON response per line
+
+    Requests look like {"job": "score", "params": {...}}. The socket is
+    created owner-only (0600), so file permissions are the access control.
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                stopping = False
+                try:
+                    request = json.loads(line)
+                    name, params = request['job'], request.get('params') or {}
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {'ok': False, 'error': f"Invalid request: {e}"}
+                else:
+                    if name == 'shutdown':
+                        stopping = True
+                        response = {'ok': True, 'job': 'shutdown', 'result': {'stopping': True}}
+                    else:
+                        response = daemon.run_job(name, params)
+                self.wfile.write(json.dumps(response, default=_json_default).encode('utf-8') + b'\n')
+                self.wfile.flush()
+                if stopping:
+                    # Only after the reply is sent, since the process exits once serving stops
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+
+    if os.path.exists(socket_path):
+        # Left behind by a daemon that did not shut down cleanly
+        os.unlink(socket_path)
+    # Bind with a restrictive umask so the socket is never reachable by others, even briefly
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Run the analyzer as a long-lived local job server')
+    parser.add_argument('--socket', metavar='PATH', default=DEFAULT_SOCKET_PATH,
+                        help=f'Unix socket to serve on (default: {DEFAULT_SOCKET_PATH})')
+    parser.add_argument('--port', type=int,
+                        help=f'Serve local HTTP on this port instead of the Unix socket (e.g. {DEFAULT_PORT})')
+    parser.add_argument('--host', default='127.0.0.1', help='HTTP interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--token-file', default=DEFAULT_TOKEN_PATH,
+                        help=f'File the HTTP API token is written to, mode 0600 (default: {DEFAULT_TOKEN_PATH})')
+    parser.add_argument('--api-key', help='API key for stock data provider (Alpha Vantage)')
+    parser.add_argument('--cache-db', default='price_cache.db',
+                        help='SQLite file used to cache daily price bars (default: price_cache.db)')
+    parser.add_argument('--store', default='signals.db',
+                        help='SQLite signal store used by parse and query jobs (default: signals.db)')
+    parser.add_argument('--leaderboard', help='Leaderboard snapshot (JSON) kept up to date by score jobs')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of concurrent price fetch workers (default: 4)')
+    parser.add_argument('--trading-days', action='store_true',
+                        help='Count time frames in NSE trading days (weekends and holidays skipped)')
+    parser.add_argument('--holidays', help=HOLIDAYS_HELP)
+    parser.add_argument('--price-url',
+                        help='Base URL serving both price provider APIs, e.g. a local stand-in server')
+    parser.add_argument('--replay', metavar='DIR',
+                        help='Answer price provider requests from responses saved with --record (no network)')
+    parser.add_argument('--metrics', default='run_metrics',
+                        help='Base path of the metrics written on shutdown (default: run_metrics)')
+    args = parser.parse_args()
+
+    daemon = AnalyzerDaemon(
+        api_key=args.api_key, cache_path=args.cache_db, workers=args.workers,
+        trading_days=args.trading_days, holidays_path=args.holidays, store_path=args.store,
+        leaderboard_path=args.leaderboard, base_urls=price_base_urls(args.price_url),
+        http_client=build_http_client(replay_dir=args.replay)
+    )
+
+    if args.port is not None:
+        token = write_token_file(args.token_file)
+        server = make_http_server(daemon, token, args.host, args.port)
+        print(f"Analyzer daemon listening on http://{args.host}:{server.server_address[1]} "
+              f"(token in {args.token_file})")
+    else:
+        server = make_unix_server(daemon, args.socket)
+        print(f"Analyzer daemon listening on unix:{args.socket}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        cleanup_path = args.token_file if args.port is not None else args.socket
+        if os.path.exists(cleanup_path):
+            os.unlink(cleanup_path)
+        daemon.close()
+        METRICS.write(args.metrics)
+        print("Analyzer daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
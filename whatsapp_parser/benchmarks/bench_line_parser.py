@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Line Parser Micro-benchmark
+Lines/sec of TradingSignalParser._parse_trading_line on a synthetic chat,
+compared with the previous regex-first, per-line strptime implementation
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import generate_chat_lines  # noqa: E402
+from trading_parser import TradingSignalParser  # noqa: E402
+
+
+class LegacyLineParser(TradingSignalParser):
+    """The line parser as it was before the prefilter, combined grammar and date detection"""
+
+    def __init__(self):
+        super().__init__()
+        self.trading_patterns = [
+            re.compile(
+                r'(BUY|SELL|HOLD)\s+([A-Z]+)\s*@\s*([\d,]+\.?\d*)\s+SL\s+([\d,]+\.?\d*)\s+TGT\s+([\d,]+\.?\d*(?:,[\d,]+\.?\d*)*)',
+                re.IGNORECASE
+            ),
+            re.compile(
+                r'(BUY|SELL|HOLD)\s+([A-Z]+)\s*@\s*([\d,]+\.?\d*)\s+SL\s+([\d,]+\.?\d*)\s+TARGET\s+([\d,]+\.?\d*(?:,[\d,]+\.?\d*)*)',
+                re.IGNORECASE
+            )
+        ]
+
+    def _may_contain_signal(self, line: str) -> bool:
+        return True
+
+    def _parse_date(self, date_str: str):
+        return self._parse_date_with_formats(date_str.strip())
+
+    def _extract_trading_signal(self, message: str):
+        for pattern in self.trading_patterns:
+            match = pattern.search(message)
+            if match:
+                return match.groups()
+        return None
+
+    def _extract_time_frame(self, message: str):
+        match = re.search(r'Time Frame\s*:?\s*([^;\n]+)', message, re.IGNORECASE)
+        if match:
+            time_frame_text = match.group(1).strip()
+            days_match = re.search(r'(\d+(?:-\d+)?\s*Days?)', time_frame_text, re.IGNORECASE)
+            if days_match:
+                return days_match.group(1).strip()
+            return time_frame_text
+        return None
+
+
+def time_parser(parser: TradingSignalParser, lines: List[str]):
+    """Parse every line once, returning (seconds, signals)"""
+    parse_line = parser._parse_trading_line
+    start = time.perf_counter()
+    signals = [signal for signal in map(parse_line, lines) if signal]
+    return time.perf_counter() - start, signals
+
+
+def main():
+    """Run the benchmark and print lines/sec before and after"""
+    parser_arg = argparse.ArgumentParser(description='Benchmark the chat line parser')
+    parser_arg.add_argument('--lines', type=int, default=1_000_000,
+                            help='Number of synthetic chat lines (default: 1000000)')
+    parser_arg.add_argument('--signal-ratio', type=float, default=0.02,
+                            help='Share of lines that are trading signals (default: 0.02)')
+    args = parser_arg.parse_args()
+
+    lines = generate_chat_lines(args.lines, args.signal_ratio)
+
+    legacy_seconds, legacy_signals = time_parser(LegacyLineParser(), lines)
+    current_parser = TradingSignalParser()
+    current_parser.date_order = current_parser.detect_date_order(lines[:1000])
+    current_seconds, current_signals = time_parser(current_parser, lines)
+
+    print(f"Lines:   {len(lines):,} ({len(current_signals):,} signals)")
+    print(f"Before:  {len(lines) / legacy_seconds:,.0f} lines/sec ({legacy_seconds:.2f}s)")
+    print(f"After:   {len(lines) / current_seconds:,.0f} lines/sec ({current_seconds:.2f}s)")
+    print(f"Speedup: {legacy_seconds / current_seconds:.1f}x")
+    print(f"Identical output: {legacy_signals == current_signals}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Synthetic Benchmark Data
+Deterministic WhatsApp exports, daily bar series and a fake price provider
+"""
+
+import os
+import random
+import sys
+import time
+import zlib
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_series import PriceSeries  # noqa: E402
+from simple_price_analyzer import SimplePriceAnalyzer  # noqa: E402
+
+SENDERS = ['JMFS Research Official', 'Aaryan Shah', 'Priya Mehta', 'Ravi Sharma', '+91 98765 43210']
+STOCKS = ['HAL', 'TECHM', 'BANKBARODA', 'INDUSTOWER', 'CANBK', 'BDL', 'DLF', 'GNFC',
+          'MARUTI', 'MAHABANK', 'RAINBOW', 'TATAPOWER', 'SBIN', 'INFY', 'ITC']
+NOISE = [
+    'Good morning everyone',
+    'Market looks weak today, stay cautious',
+    'Thanks for the update!',
+    '<Media omitted>',
+    'This message was deleted',
+    'You deleted this message',
+    '@Priya did you buy anything today?',
+    'Booked profit in HAL, sold at 5200',
+    'What is the SL for yesterday\'s call?',
+    'https://bit.ly/30xYwCE',
+]
+SYSTEM_LINE = ('Messages and calls are end-to-end encrypted. Only people in this chat can read, '
+               'listen to, or share them. Learn more.')
+
+# Bars are generated on a fixed calendar so any two requests agree on shared dates
+BAR_EPOCH = date(2020, 1, 1)
+BAR_HORIZON = date(2030, 12, 31)
+
+
+def _format_price(rng: random.Random, price: float) -> str:
+    """Render a price the way analysts type them (integers or up to two decimals)"""
+    if price < 200 and rng.random() < 0.5:
+        return f"{price:.2f}".rstrip('0').rstrip('.')
+    return str(int(round(price)))
+
+
+def generate_signal_message(rng: random.Random) -> List[str]:
+    """
+    Build one JMFS-style signal message
+
+    Returns:
+        Message lines; a few messages wrap the time frame onto a second line
+    """
+    stock = rng.choice(STOCKS)
+    price = rng.uniform(40, 6000)
+    buy = _format_price(rng, price)
+    if rng.random() < 0.5:
+        buy += ',' + _format_price(rng, price * 1.005)
+    stop_loss = _format_price(rng, price * rng.uniform(0.92, 0.97))
+    target_count = rng.choice([1, 2, 2, 3])
+    targets = ','.join(_format_price(rng, price * (1 + 0.04 * (i + 1))) for i in range(target_count))
+    keyword = 'TGT' if rng.random() < 0.85 else 'TARGET'
+
+    if rng.random() < 0.6:
+        header, time_frame = 'JMFS Technical Short Term:  BUY', '5-10 Days;'
+        disclaimer = 'Refer Research disclaimers on https://bit.ly/30xYwCE'
+    else:
+        header, time_frame = 'JMFS Technical Cash Pick: BUY', '30 Days'
+        disclaimer = 'Refer disclaimer at https://bit.ly/3SRp64P'
+
+    signal = f"{header} {stock} @ {buy} SL {stop_loss} {keyword} {targets}"
+    if rng.random() < 0.05:
+        return [signal + ' ', '', f"Time Frame: {time_frame.rstrip(';')} {disclaimer}"]
+    return [f"{signal} Time Frame: {time_frame} {disclaimer}"]
+
+
+def generate_chat_lines(count: int, signal_ratio: float = 0.05, seed: int = 42,
+                        start: date = date(2024, 1, 1), days: int = 365,
+                        date_order: str = 'MDY') -> List[str]:
+    """
+    Generate a WhatsApp export in the JMFS group's format
+
+    Messages are in chronological order over the given span, mixing signals
+    (single and double buy prices, one to three targets, TGT and TARGET
+    keywords, wrapped time frames) with chatter, media and deleted messages.
+
+    Args:
+        count: Number of messages (wrapped signals add continuation lines)
+        signal_ratio: Share of messages that are trading signals
+        seed: Random seed; the same arguments always give the same export
+        start: Date of the first message
+        days: Number of days the export spans
+        date_order: 'MDY' (6/29/25) or 'DMY' (29/06/2025) timestamps
+
+    Returns:
+        List of lines without newlines
+    """
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        day = start + timedelta(days=i * days // max(count, 1))
+        minute = (i * 7) % (24 * 60)
+        if date_order == 'DMY':
+            stamp = f"{day.day:02d}/{day.month:02d}/{day.year}, {minute // 60:02d}:{minute % 60:02d}"
+        else:
+            stamp = f"{day.month}/{day.day}/{day.year % 100:02d}, {minute // 60}:{minute % 60:02d}"
+
+        if i == 0:
+            lines.append(f"{stamp} - {SYSTEM_LINE}")
+            continue
+
+        sender = rng.choice(SENDERS)
+        if rng.random() < signal_ratio:
+            message = generate_signal_message(rng)
+        else:
+            message = [rng.choice(NOISE)]
+        lines.append(f"{stamp} - {sender}: {message[0]}")
+        lines.extend(message[1:])
+    return lines
+
+
+def write_chat(file_path: str, lines: List[str]):
+    """Write generated chat lines to a TXT export"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+        f.write('\n')
+
+
+@lru_cache(maxsize=None)
+def _symbol_history(symbol: str, seed: int) -> PriceSeries:
+    """Weekday bars for a symbol over the whole generator calendar"""
+    rng = np.random.default_rng(zlib.crc32(symbol.encode('utf-8')) ^ seed)
+    first = BAR_EPOCH.toordinal()
+    ordinals = np.arange(first, BAR_HORIZON.toordinal() + 1, dtype=np.int32)
+    # date.weekday() of an ordinal is (ordinal - 1) % 7, Monday = 0
+    ordinals = ordinals[(ordinals - 1) % 7 < 5]
+
+    start_price = rng.uniform(40, 6000)
+    returns = rng.normal(0.0003, 0.018, len(ordinals))
+    close = start_price * np.exp(np.cumsum(returns))
+    open_ = close * np.exp(rng.normal(0, 0.005, len(ordinals)))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, len(ordinals))))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, len(ordinals))))
+    volume = rng.integers(10_000, 5_000_000, len(ordinals))
+    return PriceSeries(ordinals, open_.round(2), high.round(2), low.round(2), close.round(2), volume)
+
+
+def generate_bars(symbol: str, start_date: str, end_date: str, seed: int = 0) -> PriceSeries:
+    """
+    Generate daily bars for a symbol (geometric random walk on weekdays)
+
+    The same symbol and seed always give the same bar for a given date,
+    whatever range is requested.
+
+    Args:
+        symbol: Stock symbol
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD), inclusive
+        seed: Random seed shared by all symbols
+
+    Returns:
+        PriceSeries of the requested range
+    """
+    return _symbol_history(symbol, seed).slice(start_date, end_date)
+
+
+class FakePriceAnalyzer(SimplePriceAnalyzer):
+    """SimplePriceAnalyzer whose providers are replaced by generated bars"""
+
+    def __init__(self, latency: float = 0.0, seed: int = 0, **kwargs):
+        """
+        Initialize fake analyzer
+
+        Args:
+            latency: Seconds each provider request sleeps, to mimic network time
+            seed: Bar generator seed
+            **kwargs: SimplePriceAnalyzer arguments (cache_path=None keeps the cache in memory)
+        """
+        kwargs.setdefault('cache_path', None)
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.seed = seed
+        self.requests = 0
+
+    def _fetch_from_providers(self, symbol: str, start_date: str, end_date: str) -> Optional[PriceSeries]:
+        """Serve a provider request from the bar generator"""
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return generate_bars(symbol, start_date, end_date, self.seed)
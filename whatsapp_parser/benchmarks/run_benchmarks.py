@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Times parsing, expiry analysis, price scoring and every exporter on
+generated data, and stores the results as JSON for comparison between commits
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import FakePriceAnalyzer, generate_bars, generate_chat_lines, write_chat  # noqa: E402
+from signal_analyzer import TradingSignalAnalyzer  # noqa: E402
+from simple_price_analyzer import SimplePriceAnalyzer  # noqa: E402
+from stub_price_server import StubPriceServer  # noqa: E402
+from trading_parser import TradingSignalParser  # noqa: E402
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Slower than this ratio against the baseline is reported as a regression
+REGRESSION_THRESHOLD = 1.10
+
+
+def git_commit() -> str:
+    """Get the short hash of the checked-out commit, or 'unknown' outside git"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def time_case(func: Callable, repeat: int) -> List[float]:
+    """Run a benchmark case several times, returning the seconds of each run"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def analyze_and_close(price_analyzer: SimplePriceAnalyzer, signals: List[Dict]) -> List[Dict]:
+    """Score signals on a throwaway analyzer, closing its session and price cache afterwards"""
+    try:
+        return price_analyzer.analyze_multiple_signals(signals)
+    finally:
+        price_analyzer.close()
+
+
+class BenchmarkSuite:
+    """Generated inputs plus the timed cases that run on them"""
+
+    def __init__(self, lines: int, signal_ratio: float, per_signal: int, seed: int, work_dir: str,
+                 server: Optional[StubPriceServer] = None):
+        """
+        Generate the inputs shared by all cases
+
+        Args:
+            lines: Number of chat messages to generate
+            signal_ratio: Share of messages that are trading signals
+            per_signal: Number of signals timed one at a time with analyze_signal_performance
+            seed: Generator seed
+            work_dir: Directory for the chat export and exporter outputs
+            server: Stand-in price server for the HTTP fetch case (optional)
+        """
+        self.work_dir = work_dir
+        self.chat_path = os.path.join(work_dir, 'chat.txt')
+        self.chat_lines = generate_chat_lines(lines, signal_ratio, seed)
+        write_chat(self.chat_path, self.chat_lines)
+
+        self.parser = TradingSignalParser()
+        self.signals = self.parser.parse_file(self.chat_path)
+
+        self.signal_analyzer = TradingSignalAnalyzer()
+        self.signal_analyzer.signals = self.signals
+        self.analyzed = self.signal_analyzer.analyze_signals()
+        self.expired = [signal for signal in self.analyzed if signal['is_expired']]
+
+        self.per_signal = self.expired[:per_signal]
+        self.per_signal_bars = [
+            generate_bars(signal['stock'], signal['listing_date'], signal['cutoff_date'], seed)
+            for signal in self.per_signal
+        ]
+        self.seed = seed
+        self.server = server
+        self.performance = analyze_and_close(FakePriceAnalyzer(seed=seed), self.expired)
+        # Shared by the per-signal scoring and report export cases
+        self.price_analyzer = FakePriceAnalyzer(seed=seed)
+
+    def close(self):
+        """Release the shared price analyzer's session and price cache"""
+        self.price_analyzer.close()
+
+    def output(self, name: str) -> str:
+        """Path of an exporter output file"""
+        return os.path.join(self.work_dir, name)
+
+    def cases(self) -> Dict[str, tuple]:
+        """Map each case name to (function, number of items it processes)"""
+        parser, analyzer = self.parser, self.signal_analyzer
+        price_analyzer = self.price_analyzer
+        signals, performance = self.signals, self.performance
+
+        cases = {
+            'parse_file': (lambda: parser.parse_file(self.chat_path), len(self.chat_lines)),
+            'analyze_signals': (analyzer.analyze_signals, len(signals)),
+            'analyze_signal_performance': (
+                lambda: [price_analyzer.analyze_signal_performance(signal, bars)
+                         for signal, bars in zip(self.per_signal, self.per_signal_bars)],
+                len(self.per_signal)
+            ),
+            # A fresh analyzer per run so every run fetches from the fake provider
+            'analyze_multiple_signals': (
+                lambda: analyze_and_close(FakePriceAnalyzer(seed=self.seed), self.expired),
+                len(self.expired)
+            ),
+            'export_csv': (lambda: parser.export_csv(signals, self.output('signals.csv')), len(signals)),
+            'export_json': (lambda: parser.export_json(signals, self.output('signals.json')), len(signals)),
+            'export_ndjson': (lambda: parser.export_json(signals, self.output('signals.ndjson')), len(signals)),
+            'export_columnar_npz': (
+                lambda: parser.export_columnar(signals, self.output('signals.npz')), len(signals)
+            ),
+            'export_analysis_to_csv': (
+                lambda: analyzer.export_analysis_to_csv(self.output('analysis.csv')), len(signals)
+            ),
+            'export_analysis_to_columnar': (
+                lambda: analyzer.export_analysis_to_columnar(self.output('analysis.npz')), len(signals)
+            ),
+            'export_performance_report_csv': (
+                lambda: price_analyzer.export_performance_report(performance, self.output('report.csv')),
+                len(performance)
+            ),
+            'export_performance_report_npz': (
+                lambda: price_analyzer.export_performance_report(performance, self.output('report.npz')),
+                len(performance)
+            ),
+        }
+
+        if self.server is not None:
+            # Real HTTP round trips to the local stand-in server, cache kept in memory
+            cases['analyze_multiple_signals_http'] = (
+                lambda: analyze_and_close(SimplePriceAnalyzer(
+                    cache_path=None, base_urls=self.server.base_urls(),
+                    rate_limits={'yahoo': (1000.0, 50)}
+                ), self.per_signal),
+                len(self.per_signal)
+            )
+
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            cases['export_columnar_parquet'] = (
+                lambda: parser.export_columnar(signals, self.output('signals.parquet')), len(signals)
+            )
+        return cases
+
+
+def compare_results(baseline: Dict, current: Dict) -> List[str]:
+    """
+    Compare two result files case by case
+
+    Args:
+        baseline: Earlier benchmark results
+        current: Newer benchmark results
+
+    Returns:
+        Names of the cases that regressed beyond REGRESSION_THRESHOLD
+    """
+    regressions = []
+    print(f"\n{'Case':34} {baseline['commit']:>10} {current['commit']:>10} {'Ratio':>7}")
+    print("-" * 64)
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"{name:34} {'-':>10} {result['seconds']:>9.3f}s {'new':>7}")
+            continue
+        ratio = result['seconds'] / before['seconds'] if before['seconds'] else float('inf')
+        flag = '  <-- slower' if ratio > REGRESSION_THRESHOLD else ''
+        print(f"{name:34} {before['seconds']:>9.3f}s {result['seconds']:>9.3f}s {ratio:>6.2f}x{flag}")
+        if ratio > REGRESSION_THRESHOLD:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    """Run the suite and write its results"""
+    parser_arg = argparse.ArgumentParser(description='Run the parser/analyzer benchmark suite')
+    parser_arg.add_argument('--lines', type=int, default=200_000,
+                            help='Number of generated chat messages (default: 200000)')
+    parser_arg.add_argument('--signal-ratio', type=float, default=0.05,
+                            help='Share of messages that are trading signals (default: 0.05)')
+    parser_arg.add_argument('--per-signal', type=int, default=500,
+                            help='Signals timed one at a time with analyze_signal_performance (default: 500)')
+    parser_arg.add_argument('--repeat', type=int, default=3,
+                            help='Runs per case; the fastest is reported (default: 3)')
+    parser_arg.add_argument('--seed', type=int, default=42, help='Generator seed (default: 42)')
+    parser_arg.add_argument('--server-latency', type=float, default=0.005,
+                            help='Response delay of the stand-in price server in seconds (default: 0.005)')
+    parser_arg.add_argument('--no-server', action='store_true',
+                            help='Skip the case fetching through the stand-in price server')
+    parser_arg.add_argument('--cases', nargs='*', help='Only run these cases')
+    parser_arg.add_argument('--output',
+                            help='Results JSON path (default: benchmarks/results/<commit>.json)')
+    parser_arg.add_argument('--compare', help='Earlier results JSON to compare against')
+    args = parser_arg.parse_args()
+
+    # Exporters log every call; keep the timing output readable
+    logging.disable(logging.WARNING)
+
+    commit = git_commit()
+    results = {}
+    server = None if args.no_server else StubPriceServer(latency=args.server_latency, seed=args.seed).start()
+    with tempfile.TemporaryDirectory() as work_dir:
+        print(f"Generating {args.lines:,} chat messages...")
+        suite = BenchmarkSuite(args.lines, args.signal_ratio, args.per_signal, args.seed, work_dir, server)
+        print(f"{len(suite.signals):,} signals, {len(suite.expired):,} expired\n")
+
+        try:
+            for name, (func, items) in suite.cases().items():
+                if args.cases and name not in args.cases:
+                    continue
+                runs = time_case(func, args.repeat)
+                best = min(runs)
+                results[name] = {
+                    'seconds': best,
+                    'runs': runs,
+                    'items': items,
+                    'items_per_sec': items / best if best else None,
+                }
+                print(f"{name:34} {best:9.3f}s  {items / best if best else 0:>14,.0f} items/sec")
+        finally:
+            suite.close()
+
+    if server is not None:
+        server.stop()
+
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'params': {
+            'lines': args.lines,
+            'signal_ratio': args.signal_ratio,
+            'per_signal': args.per_signal,
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'server_latency': None if args.no_server else args.server_latency,
+        },
+        'results': results,
+    }
+
+    output_path = args.output or os.path.join(BENCHMARK_DIR, 'results', f'{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output_path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('params') != report['params']:
+            print("Warning: baseline was run with different parameters")
+        if compare_results(baseline, report):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
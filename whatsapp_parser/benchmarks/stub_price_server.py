@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Stand-in Price Server
+Local HTTP server answering Yahoo chart/quote and Alpha Vantage requests with
+recorded or generated bars, with configurable latency and 429 injection
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, time as day_time, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import generate_bars  # noqa: E402
+from http_replay import recording_key  # noqa: E402
+
+# Yahoo stamps NSE daily bars at the market open
+MARKET_OPEN = day_time(9, 15)
+
+
+def _bar_timestamp(ordinal: int) -> int:
+    """Epoch seconds of a bar, in local time like the analyzer reads it back"""
+    return int(datetime.combine(date.fromordinal(ordinal), MARKET_OPEN).timestamp())
+
+
+class StubPriceServer:
+    """Threaded stand-in for the price providers, usable in-process or from the command line"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, throttle_rate: float = 0.0, throttle_every: int = 0,
+                 retry_after: Optional[int] = None, recordings: Optional[str] = None, seed: int = 0):
+        """
+        Initialize stand-in server
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds each response is delayed
+            jitter: Extra random delay of up to this many seconds
+            throttle_rate: Share of requests answered with 429
+            throttle_every: Answer every Nth request with 429 (0 disables)
+            retry_after: Retry-After seconds sent with 429 responses (optional)
+            recordings: Directory of RecordReplayClient recordings served before generated bars
+            seed: Seed of the bar generator and the 429 draw
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.recordings = recordings
+        self.seed = seed
+
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'connections': 0, 'requests': 0, 'throttled': 0, 'recorded': 0, 'generated': 0,
+                      'not_found': 0}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to SimplePriceAnalyzer for both providers"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_urls(self) -> Dict[str, str]:
+        """Per-provider base URLs pointing at this server"""
+        return {'yahoo': self.base_url, 'alpha_vantage': self.base_url}
+
+    def start(self) -> 'StubPriceServer':
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'StubPriceServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _should_throttle(self) -> bool:
+        """Count a request and decide whether it gets a 429"""
+        with self.lock:
+            self.stats['requests'] += 1
+            throttle = bool(self.throttle_every) and self.stats['requests'] % self.throttle_every == 0
+            throttle = throttle or (self.throttle_rate > 0 and self.rng.random() < self.throttle_rate)
+            if throttle:
+                self.stats['throttled'] += 1
+            return throttle
+
+    def _count(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def _recorded(self, path: str, params: Dict) -> Optional[Tuple[int, str]]:
+        """Look up a RecordReplayClient recording of the request"""
+        if not self.recordings:
+            return None
+        file_path = os.path.join(self.recordings, f"{recording_key(path, params)}.json")
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, 'r', encoding='utf-8') as f:
+            recording = json.load(f)
+        return recording['status_code'], recording['body']
+
+    def yahoo_chart(self, symbol: str, params: Dict) -> Tuple[int, Dict]:
+        """Build a Yahoo v8 chart response from generated bars"""
+        symbol = symbol[:-3] if symbol.endswith('.NS') else symbol
+        if params.get('range', '').endswith('d'):
+            # Relative window such as range=5d, ending today
+            end = date.today()
+            start = end - timedelta(days=int(params['range'][:-1]))
+        else:
+            period1 = int(params.get('period1', 0))
+            period2 = int(params.get('period2', time.time()))
+            start = datetime.fromtimestamp(period1).date()
+            # period2 is exclusive
+            end = datetime.fromtimestamp(period2 - 1).date()
+        bars = generate_bars(symbol, start.isoformat(), end.isoformat(), self.seed)
+
+        result = {'meta': {'symbol': f"{symbol}.NS", 'currency': 'INR'}}
+        if len(bars):
+            result['timestamp'] = [_bar_timestamp(int(ordinal)) for ordinal in bars.dates]
+        result['indicators'] = {'quote': [{
+            'open': bars.open.tolist(),
+            'high': bars.high.tolist(),
+            'low': bars.low.tolist(),
+            'close': bars.close.tolist(),
+            'volume': bars.volume.tolist(),
+        }]}
+        return 200, {'chart': {'result': [result], 'error': None}}
+
+    def yahoo_quote(self, params: Dict) -> Tuple[int, Dict]:
+        """Build a Yahoo v7 quote response (last generated close) for a list of symbols"""
+        today = date.today()
+        results = []
+        for ticker in filter(None, params.get('symbols', '').split(',')):
+            symbol = ticker[:-3] if ticker.endswith('.NS') else ticker
+            bars = generate_bars(symbol, (today - timedelta(days=7)).isoformat(), today.isoformat(), self.seed)
+            if len(bars):
+                results.append({'symbol': ticker, 'regularMarketPrice': float(bars.close[-1]),
+                                'currency': 'INR'})
+        return 200, {'quoteResponse': {'result': results, 'error': None}}
+
+    def alpha_vantage(self, params: Dict) -> Tuple[int, Dict]:
+        """Build an Alpha Vantage TIME_SERIES_DAILY or GLOBAL_QUOTE response"""
+        symbol = params.get('symbol', '')
+        today = date.today()
+        if params.get('function') == 'GLOBAL_QUOTE':
+            bars = generate_bars(symbol, (today - timedelta(days=7)).isoformat(), today.isoformat(), self.seed)
+            if not len(bars):
+                return 200, {'Global Quote': {}}
+            return 200, {'Global Quote': {'01. symbol': symbol, '05. price': f"{bars.close[-1]:.4f}"}}
+
+        if params.get('function') == 'TIME_SERIES_DAILY':
+            start = today - timedelta(days=365 * 5 if params.get('outputsize') == 'full' else 140)
+            bars = generate_bars(symbol, start.isoformat(), today.isoformat(), self.seed)
+            daily = {
+                date.fromordinal(int(bars.dates[i])).isoformat(): {
+                    '1. open': f"{bars.open[i]:.4f}",
+                    '2. high': f"{bars.high[i]:.4f}",
+                    '3. low': f"{bars.low[i]:.4f}",
+                    '4. close': f"{bars.close[i]:.4f}",
+                    '5. volume': str(int(bars.volume[i])),
+                }
+                for i in range(len(bars) - 1, -1, -1)
+            }
+            return 200, {'Meta Data': {'2. Symbol': symbol}, 'Time Series (Daily)': daily}
+
+        return 400, {'Error Message': f"Unsupported function {params.get('function')}"}
+
+    def _handler_class(self):
+        """Build the request handler bound to this server"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps connections open between requests, like the real providers
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; without this, Nagle's
+            # algorithm stalls every kept-alive response on a delayed ACK
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                server._count('connections')
+
+            def do_GET(self):
+                delay = server.latency + (server.rng.uniform(0, server.jitter) if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+
+                if server._should_throttle():
+                    headers = {'Retry-After': str(server.retry_after)} if server.retry_after is not None else {}
+                    self._reply(429, {'error': 'Too Many Requests'}, headers)
+                    return
+
+                url = urlsplit(self.path)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+                recorded = server._recorded(url.path, params)
+                if recorded is not None:
+                    server._count('recorded')
+                    self._reply(recorded[0], recorded[1])
+                    return
+
+                if url.path.startswith('/v8/finance/chart/'):
+                    status, body = server.yahoo_chart(url.path.rsplit('/', 1)[-1], params)
+                elif url.path == '/v7/finance/quote':
+                    status, body = server.yahoo_quote(params)
+                elif url.path == '/query':
+                    status, body = server.alpha_vantage(params)
+                else:
+                    server._count('not_found')
+                    self._reply(404, {'error': 'Not Found'})
+                    return
+                server._count('generated')
+                self._reply(status, body)
+
+            def _reply(self, status: int, body, headers: Optional[Dict] = None):
+                payload = (body if isinstance(body, str) else json.dumps(body)).encode('utf-8')
+                compress = 'gzip' in self.headers.get('Accept-Encoding', '')
+                if compress:
+                    payload = gzip.compress(payload, compresslevel=5)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                if compress:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                # One line per request would swamp benchmark output
+                pass
+
+        return Handler
+
+
+def main():
+    """Run the stand-in server until interrupted"""
+    parser = argparse.ArgumentParser(description='Serve recorded or generated price data locally')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind (default: 8765)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds each response is delayed')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random delay of up to this many seconds')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of requests answered with 429')
+    parser.add_argument('--throttle-every', type=int, default=0, help='Answer every Nth request with 429')
+    parser.add_argument('--retry-after', type=int, help='Retry-After seconds sent with 429 responses')
+    parser.add_argument('--recordings', help='Directory of recorded responses served before generated bars')
+    parser.add_argument('--seed', type=int, default=0, help='Bar generator seed (default: 0)')
+    args = parser.parse_args()
+
+    server = StubPriceServer(args.host, args.port, args.latency, args.jitter, args.throttle_rate,
+                             args.throttle_every, args.retry_after, args.recordings, args.seed)
+    print(f"Serving price data on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Columnar Record Storage
+Typed binary files (NPZ, Parquet, Arrow) for signals and reports, so pipeline
+stages exchange data without CSV/JSON text round-trips
+"""
+
+import numbers
+import os
+from typing import Dict, Iterable, List, Optional
+import logging
+
+import numpy as np
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# File extensions handled by this module, by storage format
+COLUMNAR_FORMATS = {
+    '.npz': 'npz',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+
+# Key holding the "name:kind" column list inside NPZ files
+SCHEMA_KEY = '__schema__'
+
+
+def columnar_format(path: str) -> Optional[str]:
+    """Get the columnar format implied by a file extension, or None for text formats"""
+    return COLUMNAR_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def is_columnar_path(path: str) -> bool:
+    """Check whether a path has a columnar file extension"""
+    return columnar_format(path) is not None
+
+
+def _infer_kind(values: List) -> str:
+    """Pick the column type (bool, int, float or str) that holds every non-null value"""
+    # Checking the distinct value types keeps this at C speed for large columns
+    types = set(map(type, values))
+    types.discard(type(None))
+    if not types:
+        # Columns without any values are stored as all-NaN floats
+        return 'float'
+    if all(issubclass(t, (bool, np.bool_)) for t in types):
+        return 'bool'
+    if any(issubclass(t, (bool, np.bool_)) for t in types):
+        return 'str'
+    if all(issubclass(t, numbers.Integral) for t in types):
+        return 'int'
+    if all(issubclass(t, numbers.Real) for t in types):
+        return 'float'
+    return 'str'
+
+
+def _to_columns(records: Iterable[Dict], columns: Optional[List[str]]) -> Dict[str, List]:
+    """Transpose records into per-column value lists"""
+    records = list(records)
+    if columns is None:
+        columns = list(dict.fromkeys(key for record in records[:1] for key in record))
+    return {name: [record.get(name) for record in records] for name in columns}
+
+
+def _encode_npz_column(name: str, kind: str, values: List) -> Dict[str, np.ndarray]:
+    """Encode one column as the NPZ arrays that represent it"""
+    if kind == 'float':
+        return {f'{name}.values': np.array([np.nan if v is None else v for v in values], dtype=np.float64)}
+
+    if kind in ('int', 'bool'):
+        mask = np.array([v is None for v in values], dtype=bool)
+        dtype = np.int64 if kind == 'int' else bool
+        arrays = {f'{name}.values': np.array([0 if v is None else v for v in values], dtype=dtype)}
+        if mask.any():
+            arrays[f'{name}.mask'] = mask
+        return arrays
+
+    # Strings are dictionary encoded: int32 codes (-1 for null) into a blob
+    # of the distinct values, NUL separated, so no pickled object arrays are needed
+    if any(v is not None and type(v) is not str for v in values):
+        values = [None if v is None else str(v) for v in values]
+    categories = [v for v in dict.fromkeys(values) if v is not None]
+    index = {category: i for i, category in enumerate(categories)}
+    index[None] = -1
+    codes = np.fromiter(map(index.__getitem__, values), dtype=np.int32, count=len(values))
+
+    text = '\x00'.join(categories)
+    if text.isascii():
+        lengths = [len(category) + 1 for category in categories]
+    else:
+        lengths = [len(category.encode('utf-8')) + 1 for category in categories]
+    # Byte offsets of each value, used when a value itself contains NUL
+    offsets = np.zeros(len(categories) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return {
+        f'{name}.codes': codes,
+        f'{name}.offsets': offsets,
+        f'{name}.blob': np.frombuffer(text.encode('utf-8'), dtype=np.uint8),
+    }
+
+
+def _decode_npz_column(data, name: str, kind: str) -> np.ndarray:
+    """Rebuild one column from its NPZ arrays"""
+    if kind == 'float':
+        return data[f'{name}.values']
+
+    if kind in ('int', 'bool'):
+        values = data[f'{name}.values']
+        if f'{name}.mask' in data.files:
+            values = values.astype(object)
+            values[data[f'{name}.mask']] = None
+        return values
+
+    blob = data[f'{name}.blob'].tobytes()
+    offsets = data[f'{name}.offsets']
+    categories = blob.decode('utf-8').split('\x00') if len(offsets) > 1 else []
+    if len(categories) != len(offsets) - 1:
+        offsets = offsets.tolist()
+        categories = [blob[offsets[i]:offsets[i + 1] - 1].decode('utf-8') for i in range(len(offsets) - 1)]
+    # The trailing None is what code -1 picks
+    lookup = np.array(categories + [None], dtype=object)
+    return lookup[data[f'{name}.codes']]
+
+
+def _require_pyarrow():
+    """Import pyarrow, which Parquet and Arrow files need"""
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet/Arrow output requires pyarrow (pip install pyarrow); use .npz otherwise")
+    return pyarrow
+
+
+def _to_arrow_table(columns: Dict[str, List], kinds: Dict[str, str]):
+    """Build a pyarrow table with explicit column types"""
+    pa = _require_pyarrow()
+    types = {'float': pa.float64(), 'int': pa.int64(), 'bool': pa.bool_(), 'str': pa.string()}
+    arrays = []
+    for name, values in columns.items():
+        if kinds[name] == 'str':
+            values = [None if v is None else str(v) for v in values]
+        elif kinds[name] == 'float':
+            values = [None if v is None else float(v) for v in values]
+        arrays.append(pa.array(values, type=types[kinds[name]]))
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def write_columnar(records: Iterable[Dict], output_path: str, columns: Optional[List[str]] = None,
+                   compress: bool = True) -> int:
+    """
+    Write records to a typed columnar file, chosen by extension
+
+    .npz files are written with NumPy only; .parquet, .arrow and .feather
+    need pyarrow. Column types are inferred from the values, with None
+    stored as a null.
+
+    Args:
+        records: Record dictionaries (list or iterator, consumed once)
+        output_path: Output file path (.npz, .parquet, .arrow or .feather)
+        columns: Columns to write, in order (defaults to the first record's keys)
+        compress: Whether to compress the file
+
+    Returns:
+        Number of records written
+    """
+    file_format = columnar_format(output_path)
+    if file_format is None:
+        raise ValueError(f"Unsupported columnar file extension: {output_path}")
+
+    column_values = _to_columns(records, columns)
+    kinds = {name: _infer_kind(values) for name, values in column_values.items()}
+    count = len(next(iter(column_values.values()), []))
+
+    if file_format == 'npz':
+        arrays = {SCHEMA_KEY: np.array([f'{name}:{kind}' for name, kind in kinds.items()])}
+        for name, values in column_values.items():
+            arrays.update(_encode_npz_column(name, kinds[name], values))
+        save = np.savez_compressed if compress else np.savez
+        with open(output_path, 'wb') as f:
+            save(f, **arrays)
+    else:
+        pa = _require_pyarrow()
+        table = _to_arrow_table(column_values, kinds)
+        if file_format == 'parquet':
+            pa.parquet.write_table(table, output_path, compression='zstd' if compress else 'none')
+        else:
+            pa.feather.write_feather(table, output_path, compression='zstd' if compress else 'uncompressed')
+
+    logger.info(f"Wrote {count} records to {output_path}")
+    return count
+
+
+def read_columns(input_path: str, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Load columns from a columnar file without building per-record dictionaries
+
+    Float columns come back as float64 arrays with NaN for nulls, other
+    columns as typed arrays, or object arrays when they hold strings or nulls.
+    Only the requested columns are read from disk.
+
+    Args:
+        input_path: Path to a .npz, .parquet, .arrow or .feather file
+        columns: Columns to load (defaults to all, in file order)
+
+    Returns:
+        Dictionary of column name to array
+    """
+    file_format = columnar_format(input_path)
+    if file_format is None:
+        raise ValueError(f"Unsupported columnar file extension: {input_path}")
+
+    if file_format == 'npz':
+        with np.load(input_path, allow_pickle=False) as data:
+            kinds = dict(entry.split(':', 1) for entry in data[SCHEMA_KEY].tolist())
+            names = list(kinds) if columns is None else columns
+            return {name: _decode_npz_column(data, name, kinds[name]) for name in names}
+
+    pa = _require_pyarrow()
+    if file_format == 'parquet':
+        table = pa.parquet.read_table(input_path, columns=columns)
+    else:
+        table = pa.feather.read_table(input_path, columns=columns)
+
+    result = {}
+    for name, column in zip(table.column_names, table.columns):
+        if pa.types.is_floating(column.type):
+            result[name] = column.to_numpy()
+        elif column.null_count or pa.types.is_string(column.type):
+            result[name] = np.array(column.to_pylist(), dtype=object)
+        else:
+            result[name] = column.to_numpy()
+    return result
+
+
+def read_records(input_path: str, columns: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Load a columnar file as a list of record dictionaries
+
+    Args:
+        input_path: Path to a .npz, .parquet, .arrow or .feather file
+        columns: Columns to load (defaults to all)
+
+    Returns:
+        List of dictionaries with plain Python values (None for nulls)
+    """
+    column_arrays = read_columns(input_path, columns)
+    lists = []
+    for values in column_arrays.values():
+        if values.dtype.kind == 'f':
+            lists.append([None if v != v else v for v in values.tolist()])
+        else:
+            lists.append(values.tolist())
+
+    names = list(column_arrays)
+    return [dict(zip(names, row)) for row in zip(*lists)]
+
+
+class ColumnarWriter:
+    """Record-at-a-time writer for columnar files, buffering until close"""
+
+    def __init__(self, output_path: str, columns: Optional[List[str]] = None):
+        """
+        Initialize writer
+
+        Args:
+            output_path: Output file path (.npz, .parquet, .arrow or .feather)
+            columns: Columns to write, in order (defaults to the first record's keys)
+        """
+        if not is_columnar_path(output_path):
+            raise ValueError(f"Unsupported columnar file extension: {output_path}")
+        self.output_path = output_path
+        self.columns = columns
+        self.records = []
+        self.count = 0
+
+    def write(self, record: Dict):
+        """Buffer one record"""
+        self.records.append(record)
+        self.count += 1
+
+    def close(self):
+        """Write the buffered records to the output file (columnar files are written in one piece)"""
+        write_columnar(self.records, self.output_path, columns=self.columns)
+        self.records = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -8,25 +8,44 @@ import argparse
 import json
 import sys
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import os
 
+from columnar_io import is_columnar_path
+from http_replay import build_http_client, price_base_urls
+from leaderboard import update_leaderboard
+from metrics import METRICS
+from ndjson_io import is_ndjson_path
 from signal_analyzer import TradingSignalAnalyzer
+from signal_store import SignalStore
 from simple_price_analyzer import SimplePriceAnalyzer
+from trading_calendar import HOLIDAYS_HELP, TradingCalendar
 
 
 class CompleteAnalyzer:
     """Complete trading signal analysis system"""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache_path: str = 'price_cache.db', workers: int = 4,
+                 trading_days: bool = False, holidays_path: str = None, output_format: str = 'csv',
+                 base_urls: Dict[str, str] = None, http_client=None):
         """
         Initialize complete analyzer
         
         Args:
             api_key: API key for stock data provider (optional)
+            cache_path: Path to the on-disk price cache (optional)
+            workers: Number of concurrent price fetch workers
+            trading_days: Count signal time frames in NSE trading days
+            holidays_path: File of extra exchange holidays, one YYYY-MM-DD per line (optional)
+            output_format: Extension of the analysis outputs: csv, npz, parquet or arrow
+            base_urls: Per-provider base URL overrides (optional)
+            http_client: Client used for provider requests, e.g. a RecordReplayClient (optional)
         """
-        self.signal_analyzer = TradingSignalAnalyzer()
-        self.price_analyzer = SimplePriceAnalyzer(api_key)
+        calendar = TradingCalendar.from_file(holidays_path) if holidays_path else None
+        self.signal_analyzer = TradingSignalAnalyzer(trading_days=trading_days, calendar=calendar)
+        self.price_analyzer = SimplePriceAnalyzer(api_key, cache_path=cache_path, max_workers=workers,
+                                                  base_urls=base_urls, http_client=http_client)
+        self.output_format = output_format
         
     def analyze_from_json(self, json_file: str, analyze_prices: bool = True) -> Dict:
         """
@@ -40,48 +59,10 @@ class CompleteAnalyzer:
             Analysis results dictionary
         """
         print(f"Loading signals from {json_file}...")
-        self.signal_analyzer.load_signals_from_json(json_file)
-        
-        print("Analyzing signal timeframes and cutoff dates...")
-        analyzed_signals = self.signal_analyzer.analyze_signals()
-        
-        # Print signal analysis summary
-        self.signal_analyzer.print_summary()
-        
-        # Output file naming
-        base = os.path.splitext(os.path.basename(json_file))[0]
-        analyzed_csv = f"analyzed_signals_{base}.csv"
-        perf_csv = f"performance_report_{base}.csv"
-        # Export signal analysis
-        self.signal_analyzer.export_analysis_to_csv(analyzed_csv)
-        
-        results = {
-            'total_signals': len(analyzed_signals),
-            'expired_signals': len(self.signal_analyzer.get_expired_signals()),
-            'active_signals': len(self.signal_analyzer.get_active_signals()),
-            'signals': analyzed_signals
-        }
-        
-        # Perform price analysis if requested and there are expired signals
-        expired_signals = self.signal_analyzer.get_expired_signals()
-        if analyze_prices and expired_signals:
-            print(f"\nPerforming price analysis for {len(expired_signals)} expired signals...")
-            
-            performance_results = self.price_analyzer.analyze_multiple_signals(expired_signals)
-            
-            # Print performance summary
-            self.price_analyzer.print_performance_summary(performance_results)
-            
-            # Export performance report
-            self.price_analyzer.export_performance_report(performance_results, perf_csv)
-            
-            results['performance_analysis'] = performance_results
-        elif expired_signals:
-            print(f"\nSkipping price analysis for {len(expired_signals)} expired signals (--no-price-analysis flag used)")
-        else:
-            print("\nNo expired signals found for price analysis")
-        
-        return results
+        with METRICS.timed('load') as items:
+            self.signal_analyzer.load_signals_from_json(json_file)
+            items['signals'] = len(self.signal_analyzer.signals)
+        return self._analyze_loaded_signals(json_file, analyze_prices)
     
     def analyze_from_csv(self, csv_file: str, analyze_prices: bool = True) -> Dict:
         """
@@ -95,20 +76,117 @@ class CompleteAnalyzer:
             Analysis results dictionary
         """
         print(f"Loading signals from {csv_file}...")
-        self.signal_analyzer.load_signals_from_csv(csv_file)
+        with METRICS.timed('load') as items:
+            self.signal_analyzer.load_signals_from_csv(csv_file)
+            items['signals'] = len(self.signal_analyzer.signals)
+        return self._analyze_loaded_signals(csv_file, analyze_prices)
+    
+    def analyze_from_columnar(self, columnar_file: str, analyze_prices: bool = True) -> Dict:
+        """
+        Analyze trading signals from a columnar file (.npz, .parquet, .arrow)
+        
+        Args:
+            columnar_file: Path to columnar file with trading signals
+            analyze_prices: Whether to perform price analysis for expired signals
+            
+        Returns:
+            Analysis results dictionary
+        """
+        print(f"Loading signals from {columnar_file}...")
+        with METRICS.timed('load') as items:
+            self.signal_analyzer.load_signals_from_columnar(columnar_file)
+            items['signals'] = len(self.signal_analyzer.signals)
+        return self._analyze_loaded_signals(columnar_file, analyze_prices)
+    
+    def analyze_from_store(self, db_path: str, analyze_prices: bool = True, **filters) -> Dict:
+        """
+        Analyze the trading signals in a SignalStore that match a query
+        
+        Args:
+            db_path: Path to the SQLite signal store
+            analyze_prices: Whether to perform price analysis for expired signals
+            **filters: SignalStore.query filters (stock, sender, action, start_date, end_date, ...)
+            
+        Returns:
+            Analysis results dictionary
+        """
+        print(f"Loading signals from {db_path}...")
+        store = SignalStore(db_path, analyzer=self.signal_analyzer)
+        try:
+            with METRICS.timed('load') as items:
+                self.signal_analyzer.load_signals_from_store(store, **filters)
+                items['signals'] = len(self.signal_analyzer.signals)
+        finally:
+            store.close()
+        return self._analyze_loaded_signals(db_path, analyze_prices)
+    
+    def save_to_store(self, db_path: str) -> int:
+        """
+        Add the currently loaded signals to a SignalStore, skipping duplicates
+        
+        Args:
+            db_path: Path to the SQLite signal store
+            
+        Returns:
+            Number of new signals stored
+        """
+        store = SignalStore(db_path, analyzer=self.signal_analyzer)
+        try:
+            return store.add_signals(self.signal_analyzer.signals)
+        finally:
+            store.close()
+    
+    def update_leaderboard(self, snapshot_path: str, results: Dict) -> bool:
+        """
+        Fold analysis results into the broker leaderboard snapshot
+        
+        Only signals not counted in earlier runs change the counters.
+        
+        Args:
+            snapshot_path: Leaderboard snapshot JSON path (state is kept next to it)
+            results: Results dictionary from one of the analyze_from_* methods
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            update_leaderboard(snapshot_path, signals=results.get('signals', []),
+                               results=results.get('performance_analysis', []))
+            return True
+        except Exception as e:
+            print(f"Failed to update leaderboard: {e}")
+            return False
+    
+    def output_paths(self, input_file: str) -> Tuple[str, str]:
+        """
+        Get the signal analysis and performance report paths for an input file
         
+        Args:
+            input_file: Path of the analyzed signals file
+            
+        Returns:
+            Tuple of (analyzed signals path, performance report path)
+        """
+        base = os.path.splitext(os.path.basename(input_file))[0]
+        return (f"analyzed_signals_{base}.{self.output_format}",
+                f"performance_report_{base}.{self.output_format}")
+    
+    def _analyze_loaded_signals(self, input_file: str, analyze_prices: bool) -> Dict:
+        """Run timeframe and price analysis on the loaded signals and export the results"""
         print("Analyzing signal timeframes and cutoff dates...")
         analyzed_signals = self.signal_analyzer.analyze_signals()
         
         # Print signal analysis summary
         self.signal_analyzer.print_summary()
         
-        # Output file naming
-        base = os.path.splitext(os.path.basename(csv_file))[0]
-        analyzed_csv = f"analyzed_signals_{base}.csv"
-        perf_csv = f"performance_report_{base}.csv"
         # Export signal analysis
-        self.signal_analyzer.export_analysis_to_csv(analyzed_csv)
+        analyzed_path, perf_path = self.output_paths(input_file)
+        with METRICS.timed('export') as items:
+            if self.output_format == 'csv':
+                self.signal_analyzer.export_analysis_to_csv(analyzed_path)
+            else:
+                self.signal_analyzer.export_analysis_to_columnar(analyzed_path)
+            items['rows'] = len(analyzed_signals)
         
         results = {
             'total_signals': len(analyzed_signals),
@@ -128,7 +206,9 @@ class CompleteAnalyzer:
             self.price_analyzer.print_performance_summary(performance_results)
             
             # Export performance report
-            self.price_analyzer.export_performance_report(performance_results, perf_csv)
+            with METRICS.timed('export') as items:
+                self.price_analyzer.export_performance_report(performance_results, perf_path)
+                items['rows'] = len(performance_results)
             
             results['performance_analysis'] = performance_results
         elif expired_signals:
@@ -138,6 +218,22 @@ class CompleteAnalyzer:
         
         return results
     
+    def write_metrics(self, base_path: str) -> bool:
+        """
+        Write the stage timings, provider latencies and cache counters of this run
+        
+        Args:
+            base_path: Output path without extension (writes <base>.json and <base>.prom)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return METRICS.write(base_path)
+    
+    def close(self):
+        """Release the price analyzer's HTTP session and price cache"""
+        self.price_analyzer.close()
+    
     def get_signal_statistics(self) -> Dict:
         """Get comprehensive statistics about analyzed signals"""
         if not self.signal_analyzer.analyzed_signals:
@@ -201,6 +297,12 @@ Examples:
   # Analyze signals from CSV file without price analysis
   python complete_analyzer.py signals.csv --no-price-analysis
   
+  # Load signals from a columnar file and write NPZ reports
+  python complete_analyzer.py trading_signals.npz --output-format npz
+  
+  # Analyze BUY signals for one stock from a signal store
+  python complete_analyzer.py signals.db --stock TECHM --action BUY --since 2025-04-01 --until 2025-06-30
+  
   # Analyze with API key for real price data
   python complete_analyzer.py trading_signals.json --api-key YOUR_API_KEY
         """
@@ -208,7 +310,7 @@ Examples:
     
     parser.add_argument(
         'input_file',
-        help='Input file (JSON or CSV) containing trading signals'
+        help='Input file (JSON, NDJSON, CSV, NPZ, Parquet, Arrow or a .db signal store) containing trading signals'
     )
     
     parser.add_argument(
@@ -222,6 +324,76 @@ Examples:
         help='API key for stock data provider (Alpha Vantage)'
     )
     
+    parser.add_argument(
+        '--cache-db',
+        default='price_cache.db',
+        help='SQLite file used to cache daily price bars (default: price_cache.db)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of concurrent price fetch workers (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--trading-days',
+        action='store_true',
+        help='Count time frames in NSE trading days (weekends and holidays skipped)'
+    )
+    
+    parser.add_argument(
+        '--holidays',
+        help=HOLIDAYS_HELP
+    )
+    
+    parser.add_argument(
+        '--output-format',
+        choices=['csv', 'npz', 'parquet', 'arrow'],
+        default='csv',
+        help='Format of the analysis and performance report files (default: csv)'
+    )
+    
+    parser.add_argument(
+        '--store',
+        help='Also add the loaded signals to this SQLite signal store (duplicates skipped)'
+    )
+    
+    parser.add_argument(
+        '--leaderboard',
+        help='Update this broker leaderboard snapshot (JSON) with the results'
+    )
+    
+    parser.add_argument(
+        '--price-url',
+        help='Base URL serving both price provider APIs, e.g. a local stand-in server'
+    )
+    
+    parser.add_argument(
+        '--record',
+        metavar='DIR',
+        help='Save every price provider response to this directory'
+    )
+    
+    parser.add_argument(
+        '--replay',
+        metavar='DIR',
+        help='Answer price provider requests from responses saved with --record (no network)'
+    )
+    
+    parser.add_argument('--stock', help='With a .db input: only signals for this stock')
+    parser.add_argument('--sender', help='With a .db input: only signals from this sender')
+    parser.add_argument('--action', help='With a .db input: only BUY, SELL or HOLD signals')
+    parser.add_argument('--since', help='With a .db input: earliest listing date (YYYY-MM-DD)')
+    parser.add_argument('--until', help='With a .db input: latest listing date (YYYY-MM-DD)')
+    
+    parser.add_argument(
+        '--metrics',
+        default='run_metrics',
+        help='Base path of the run metrics, written as <base>.json and <base>.prom (default: run_metrics)'
+    )
+    
     parser.add_argument(
         '--statistics-only',
         action='store_true',
@@ -231,20 +403,36 @@ Examples:
     args = parser.parse_args()
     
     # Initialize analyzer
-    analyzer = CompleteAnalyzer(api_key=args.api_key)
+    analyzer = CompleteAnalyzer(api_key=args.api_key, cache_path=args.cache_db, workers=args.workers,
+                                trading_days=args.trading_days or bool(args.holidays),
+                                holidays_path=args.holidays, output_format=args.output_format,
+                                base_urls=price_base_urls(args.price_url),
+                                http_client=build_http_client(args.record, args.replay))
     
     try:
         # Determine file type and analyze
-        if args.input_file.endswith('.json'):
+        if args.input_file.endswith('.json') or is_ndjson_path(args.input_file):
             results = analyzer.analyze_from_json(args.input_file, not args.no_price_analysis)
-            base = os.path.splitext(os.path.basename(args.input_file))[0]
         elif args.input_file.endswith('.csv'):
             results = analyzer.analyze_from_csv(args.input_file, not args.no_price_analysis)
-            base = os.path.splitext(os.path.basename(args.input_file))[0]
+        elif is_columnar_path(args.input_file):
+            results = analyzer.analyze_from_columnar(args.input_file, not args.no_price_analysis)
+        elif args.input_file.endswith(('.db', '.sqlite')):
+            results = analyzer.analyze_from_store(
+                args.input_file, not args.no_price_analysis, stock=args.stock, sender=args.sender,
+                action=args.action, start_date=args.since, end_date=args.until
+            )
         else:
-            print("Error: Input file must be JSON or CSV")
+            print("Error: Input file must be JSON, NDJSON, CSV, NPZ, Parquet, Arrow or a .db signal store")
             sys.exit(1)
         
+        if args.store:
+            stored = analyzer.save_to_store(args.store)
+            print(f"Stored {stored} new signals in {args.store}")
+        
+        if args.leaderboard:
+            analyzer.update_leaderboard(args.leaderboard, results)
+        
         # Show statistics if requested
         if args.statistics_only:
             print("\n" + "="*60)
@@ -261,13 +449,18 @@ Examples:
         
         print(f"\nAnalysis completed successfully!")
         print(f"Files generated:")
-        print(f"  - analyzed_signals_{base}.csv (signal analysis)")
+        analyzed_path, perf_path = analyzer.output_paths(args.input_file)
+        print(f"  - {analyzed_path} (signal analysis)")
         if results.get('performance_analysis'):
-            print(f"  - performance_report_{base}.csv (price analysis)")
+            print(f"  - {perf_path} (price analysis)")
         
     except Exception as e:
         print(f"Error during analysis: {e}")
         sys.exit(1)
+    finally:
+        # Written on failures too, to show where a slow or broken run spent its time
+        analyzer.write_metrics(args.metrics)
+        analyzer.close()
 
 
 if __name__ == "__main__":
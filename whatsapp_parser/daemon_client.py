@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Analyzer Daemon Client
+Thin command line client for analyzer_daemon.py; imports only the standard
+library so it starts in milliseconds
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import sys
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Default daemon address (matches analyzer_daemon.DEFAULT_SOCKET_PATH)
+DEFAULT_ADDRESS = 'unix:analyzer.sock'
+
+# Default file holding the daemon's HTTP API token (matches analyzer_daemon.DEFAULT_TOKEN_PATH)
+DEFAULT_TOKEN_PATH = 'analyzer.token'
+
+# Seconds to wait for a job before giving up (score jobs may fetch prices)
+DEFAULT_TIMEOUT = 600.0
+
+
+class DaemonClient:
+    """Send jobs to a running analyzer daemon over HTTP or a Unix socket"""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = DEFAULT_TIMEOUT,
+                 token: Optional[str] = None, token_path: str = DEFAULT_TOKEN_PATH):
+        """
+        Initialize client
+
+        Args:
+            address: http://host:port, unix:/path/to/socket, or a socket path
+            timeout: Seconds to wait for each response
+            token: HTTP API token (read from token_path when not given)
+            token_path: File the daemon wrote its HTTP API token to
+        """
+        self.address = address
+        self.timeout = timeout
+        self.token = token
+        self.token_path = token_path
+
+    def _token(self) -> str:
+        """Get the HTTP API token, reading the daemon's token file on first use"""
+        if self.token is None:
+            with open(self.token_path, encoding='utf-8') as f:
+                self.token = f.read().strip()
+        return self.token
+
+    def call(self, job: str, **params) -> Dict:
+        """
+        Run one job on the daemon
+
+        Args:
+            job: Job name (ping, parse, analyze, score, query, quotes, leaderboard, metrics, shutdown)
+            **params: Job parameters
+
+        Returns:
+            Response dictionary: {'ok': True, 'result': ...} or {'ok': False, 'error': ...}
+        """
+        if self.address.startswith('http://'):
+            return self._call_http(job, params)
+        return self._call_unix(job, params)
+
+    def _call_http(self, job: str, params: Dict) -> Dict:
+        """Send a job as POST /jobs/<name>"""
+        url = urlparse(self.address)
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=self.timeout)
+        try:
+            body = json.dumps(params).encode('utf-8')
+            headers = {'Content-Type': 'application/json', 'Authorization': f'Bearer {self._token()}'}
+            conn.request('POST', f'/jobs/{job}', body=body, headers=headers)
+            return json.loads(conn.getresponse().read())
+        finally:
+            conn.close()
+
+    def _call_unix(self, job: str, params: Dict) -> Dict:
+        """Send a job as one JSON line over the Unix socket"""
+        path = self.address[len('unix:'):] if self.address.startswith('unix:') else self.address
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps({'job': job, 'params': params}).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as reader:
+                return json.loads(reader.readline())
+
+
+def parse_params(pairs) -> Dict:
+    """Turn key=value arguments into job parameters (values parsed as JSON where possible)"""
+    params = {}
+    for pair in pairs:
+        key, sep, value = pair.partition('=')
+        if not sep:
+            raise ValueError(f"Expected key=value, got '{pair}'")
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(
+        description='Send a job to a running analyzer daemon',
+        epilog='Example: daemon_client.py score path=trading_signals.json limit=20'
+    )
+    parser.add_argument('job', help='Job name (ping, parse, analyze, score, query, quotes, leaderboard, '
+                                    'metrics, shutdown)')
+    parser.add_argument('params', nargs='*', help='Job parameters as key=value (values parsed as JSON)')
+    parser.add_argument('--address', default=DEFAULT_ADDRESS,
+                        help=f'Daemon address: http://host:port or unix:PATH (default: {DEFAULT_ADDRESS})')
+    parser.add_argument('--token-file', default=DEFAULT_TOKEN_PATH,
+                        help=f'File holding the daemon HTTP API token (default: {DEFAULT_TOKEN_PATH})')
+    parser.add_argument('--json', dest='json_params', help='Job parameters as one JSON object')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Seconds to wait for the response (default: {DEFAULT_TIMEOUT:.0f})')
+    args = parser.parse_args()
+
+    try:
+        params = json.loads(args.json_params) if args.json_params else {}
+        params.update(parse_params(args.params))
+        response = DaemonClient(args.address, args.timeout, token_path=args.token_file).call(args.job, **params)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not response.get('ok'):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+        return 1
+    print(json.dumps(response.get('result'), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
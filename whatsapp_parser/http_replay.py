@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+HTTP Record/Replay
+Saves price provider responses to disk and serves them back without a network
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import logging
+
+import requests
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Query parameters left out of recording keys (credentials must not end up in file names)
+IGNORED_PARAMS = {'apikey'}
+
+
+class RecordedResponse:
+    """Saved response with the parts of requests.Response the analyzers use"""
+
+    def __init__(self, status_code: int, text: str, headers: Optional[Dict] = None, url: str = ''):
+        self.status_code = status_code
+        self.text = text
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+        self.url = url
+
+    def json(self):
+        """Decode the body as JSON"""
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        """Raise requests.HTTPError for 4xx and 5xx responses, like requests does"""
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def recording_key(url: str, params: Optional[Dict] = None) -> str:
+    """
+    Build the file key of a request
+
+    Only the URL path and query parameters count, so recordings made against
+    the live providers replay against any base URL.
+    """
+    params = {k: v for k, v in (params or {}).items() if k not in IGNORED_PARAMS}
+    content = json.dumps([urlsplit(url).path, sorted((str(k), str(v)) for k, v in params.items())])
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+class RecordReplayClient:
+    """HTTP client that records responses to a directory or replays them from it"""
+
+    def __init__(self, directory: str, mode: str = 'replay', client=None):
+        """
+        Initialize record/replay client
+
+        Args:
+            directory: Directory holding one JSON file per recorded response
+            mode: 'record' to fetch through client and save, 'replay' to serve saved responses
+            client: Client used for real requests in record mode (defaults to a keep-alive session)
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown record/replay mode: {mode}")
+
+        self.directory = directory
+        self.mode = mode
+        self.client = client or requests.Session()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _file_path(self, url: str, params: Optional[Dict]) -> str:
+        """Get the recording file of a request"""
+        return os.path.join(self.directory, f"{recording_key(url, params)}.json")
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None):
+        """
+        Send or replay a GET request
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Request headers (not recorded)
+            timeout: Request timeout in seconds (record mode only)
+
+        Returns:
+            requests.Response in record mode, RecordedResponse in replay mode
+            (status 404 when nothing was recorded for exactly this request)
+        """
+        file_path = self._file_path(url, params)
+
+        if self.mode == 'record':
+            response = self.client.get(url, params=params, headers=headers, timeout=timeout)
+            recording = {
+                'url': url,
+                'params': {k: v for k, v in (params or {}).items() if k not in IGNORED_PARAMS},
+                'status_code': response.status_code,
+                'headers': {k: v for k, v in response.headers.items() if k.lower() == 'retry-after'},
+                'body': response.text,
+            }
+            temp_path = f"{file_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(recording, f, ensure_ascii=False)
+            os.replace(temp_path, file_path)
+            return response
+
+        # Only an exact match may answer: replaying another symbol's or window's
+        # response would be cached as this request's data
+        recorded = os.path.exists(file_path)
+        with self.lock:
+            if recorded:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if not recorded:
+            logger.debug(f"No recorded response for {url} {params}")
+            return RecordedResponse(404, '{}', url=url)
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            recording = json.load(f)
+        return RecordedResponse(recording['status_code'], recording['body'], recording.get('headers'), url)
+
+
+def build_http_client(record_dir: Optional[str] = None, replay_dir: Optional[str] = None):
+    """
+    Build the HTTP client selected by the --record/--replay command line options
+
+    Returns:
+        RecordReplayClient, or None to use the analyzer's default client
+    """
+    if record_dir and replay_dir:
+        raise ValueError("Use either a record or a replay directory, not both")
+    if record_dir:
+        return RecordReplayClient(record_dir, 'record')
+    if replay_dir:
+        return RecordReplayClient(replay_dir, 'replay')
+    return None
+
+
+def price_base_urls(base_url: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    Point both price providers at one base URL (the --price-url option)
+
+    Returns:
+        Base URL overrides for SimplePriceAnalyzer, or None to keep the live endpoints
+    """
+    if not base_url:
+        return None
+    return {'yahoo': base_url, 'alpha_vantage': base_url}
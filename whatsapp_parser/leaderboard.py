@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Broker Leaderboard Aggregates
+Incremental per-sender and per-stock performance counters, kept in SQLite and
+saved as JSON snapshots the site can serve directly
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from signal_store import signal_hash
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Outcomes that count as a profitable tip (same as the performance summary)
+PROFITABLE_OUTCOMES = {"PROFIT", "TARGET_1_HIT", "TARGET_2_HIT", "TARGET_3_HIT"}
+
+# Group dimensions kept by the aggregator, keyed by the signal field they group on
+GROUP_FIELDS = {'brokers': 'sender', 'stocks': 'stock'}
+
+
+# Counter fields of one sender or stock, with their SQLite column types
+COUNTER_TYPES = {
+    'tips': 'INTEGER',
+    'scored': 'INTEGER',
+    'target_hits': 'INTEGER',
+    'stop_losses': 'INTEGER',
+    'profitable': 'INTEGER',
+    'returns': 'INTEGER',
+    'return_sum': 'REAL',
+    'first_date': 'TEXT',
+    'last_date': 'TEXT',
+}
+COUNTER_FIELDS = list(COUNTER_TYPES)
+
+
+def _new_counters() -> Dict:
+    """Create the running counters of one sender or stock"""
+    return {
+        'tips': 0,
+        'scored': 0,
+        'target_hits': 0,
+        'stop_losses': 0,
+        'profitable': 0,
+        'returns': 0,
+        'return_sum': 0.0,
+        'first_date': None,
+        'last_date': None,
+    }
+
+
+def slugify(name: str) -> str:
+    """Build a URL-safe id from a sender or stock name"""
+    slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+    return slug or 'unknown'
+
+
+class PerformanceAggregator:
+    """Running leaderboard counters, updated in time proportional to the new signals"""
+
+    def __init__(self, state_path: Optional[str] = None):
+        """
+        Initialize aggregator
+
+        Args:
+            state_path: SQLite file holding the counters and seen signal hashes
+                between runs (None keeps them in memory)
+        """
+        self.state_path = state_path
+        self.groups = {group: {} for group in GROUP_FIELDS}
+        # Counters changed since the last save, the only rows save_state writes
+        self.dirty = set()
+        self.lock = threading.Lock()
+
+        # Content hashes already counted live in indexed tables, so re-running over
+        # the same signals is a no-op and only new hashes are ever written
+        self.conn = sqlite3.connect(state_path or ':memory:', check_same_thread=False)
+        self._create_tables()
+        self._load_counters()
+
+    def _create_tables(self):
+        """Create the counter and seen-hash tables if they do not exist"""
+        with self.conn:
+            self.conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS counters (
+                    grp TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    {', '.join(f'{field} {COUNTER_TYPES[field]}' for field in COUNTER_FIELDS)},
+                    PRIMARY KEY (grp, name)
+                )
+                """
+            )
+            for table in ('seen_tips', 'seen_scored'):
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (content_hash TEXT PRIMARY KEY) WITHOUT ROWID"
+                )
+
+    def _load_counters(self):
+        """Load the saved counter rows (one per sender and stock, not per signal)"""
+        rows = self.conn.execute(f"SELECT grp, name, {', '.join(COUNTER_FIELDS)} FROM counters").fetchall()
+        for group, name, *values in rows:
+            if group in self.groups:
+                self.groups[group][name] = dict(zip(COUNTER_FIELDS, values))
+        if rows:
+            logger.info(f"Loaded leaderboard counters for {len(rows)} entries from {self.state_path}")
+
+    def _mark_new(self, table: str, signal: Dict) -> bool:
+        """Record a signal's content hash in a seen table; True if it was not there yet"""
+        before = self.conn.total_changes
+        self.conn.execute(f"INSERT OR IGNORE INTO {table} VALUES (?)", (signal_hash(signal),))
+        return self.conn.total_changes != before
+
+    def _counters(self, signal: Dict) -> List[Dict]:
+        """Get the counters of every group a signal belongs to"""
+        counters = []
+        for group, field in GROUP_FIELDS.items():
+            key = signal.get(field) or 'Unknown'
+            counters.append(self.groups[group].setdefault(key, _new_counters()))
+            self.dirty.add((group, key))
+        return counters
+
+    def add_signals(self, signals: Iterable[Dict]) -> int:
+        """
+        Count posted tips, whether or not they have been scored yet
+
+        Args:
+            signals: Raw or analyzed signal dictionaries
+
+        Returns:
+            Number of tips not counted before
+        """
+        added = 0
+        with self.lock:
+            for signal in signals:
+                if not self._mark_new('seen_tips', signal):
+                    continue
+                listing_date = signal.get('listing_date') or signal.get('date')
+                for counters in self._counters(signal):
+                    counters['tips'] += 1
+                    if listing_date:
+                        if counters['first_date'] is None or listing_date < counters['first_date']:
+                            counters['first_date'] = listing_date
+                        if counters['last_date'] is None or listing_date > counters['last_date']:
+                            counters['last_date'] = listing_date
+                added += 1
+        return added
+
+    def add_results(self, results: Iterable[Dict]) -> int:
+        """
+        Count scored outcomes; their tips are counted too if they were not yet
+
+        Args:
+            results: Analyzed signals with a price_analysis dictionary
+
+        Returns:
+            Number of outcomes not counted before
+        """
+        results = list(results)
+        self.add_signals(results)
+
+        added = 0
+        with self.lock:
+            for result in results:
+                analysis = result.get('price_analysis') or {}
+                if analysis.get('outcome', 'NO_DATA') == 'NO_DATA':
+                    continue
+                if not self._mark_new('seen_scored', result):
+                    continue
+
+                buy_price = result.get('buy_price_1')
+                current_price = analysis.get('current_price')
+                has_return = bool(buy_price) and current_price is not None
+                target_hit = any(analysis.get(f'target_{i}_hit') for i in (1, 2, 3))
+
+                for counters in self._counters(result):
+                    counters['scored'] += 1
+                    counters['target_hits'] += target_hit
+                    counters['stop_losses'] += bool(analysis.get('stop_loss_hit'))
+                    counters['profitable'] += analysis['outcome'] in PROFITABLE_OUTCOMES
+                    if has_return:
+                        counters['returns'] += 1
+                        counters['return_sum'] += (current_price - buy_price) / buy_price * 100
+                added += 1
+        return added
+
+    def _entry(self, name: str, counters: Dict) -> Dict:
+        """Build one leaderboard row from its counters"""
+        scored = counters['scored']
+        avg_return = counters['return_sum'] / counters['returns'] if counters['returns'] else None
+        return {
+            'id': slugify(name),
+            'name': name,
+            'tips': counters['tips'],
+            'scored': scored,
+            'hit_rate': round(counters['target_hits'] / scored * 100, 2) if scored else None,
+            'sl_rate': round(counters['stop_losses'] / scored * 100, 2) if scored else None,
+            'win_rate': round(counters['profitable'] / scored * 100, 2) if scored else None,
+            'avg_return': round(avg_return, 2) if avg_return is not None else None,
+            'performance': f"{avg_return:+.1f}%" if avg_return is not None else 'N/A',
+            'first_tip': counters['first_date'],
+            'last_tip': counters['last_date'],
+        }
+
+    def leaderboard(self, group: str = 'brokers') -> List[Dict]:
+        """
+        Get the ranked rows of one group
+
+        Args:
+            group: 'brokers' (per sender) or 'stocks' (per stock)
+
+        Returns:
+            Rows sorted by average return, best first (unscored entries last)
+        """
+        with self.lock:
+            rows = [self._entry(name, counters) for name, counters in self.groups[group].items()]
+        rows.sort(key=lambda row: (row['avg_return'] is None, -(row['avg_return'] or 0), -row['tips']))
+        return rows
+
+    def snapshot(self) -> Dict:
+        """Build the leaderboard snapshot served to the site"""
+        snapshot = {'generated_at': datetime.now().isoformat(timespec='seconds')}
+        for group in GROUP_FIELDS:
+            snapshot[group] = self.leaderboard(group)
+        return snapshot
+
+    def _write_json(self, output_path: str, data: Dict):
+        """Write JSON atomically so readers never see a partial file"""
+        temp_path = f"{output_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, output_path)
+
+    def save_snapshot(self, output_path: str) -> bool:
+        """
+        Write the leaderboard snapshot for the site
+
+        Args:
+            output_path: Output JSON path
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self._write_json(output_path, self.snapshot())
+            logger.info(f"Saved leaderboard snapshot to {output_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save leaderboard snapshot: {e}")
+            return False
+
+    def save_state(self) -> bool:
+        """
+        Commit the new seen hashes and the changed counters for the next incremental run
+
+        Only rows touched since the last save are written, so the cost follows
+        the new signals rather than the whole history.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.lock, self.conn:
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO counters (grp, name, {', '.join(COUNTER_FIELDS)}) "
+                    f"VALUES ({', '.join('?' * (len(COUNTER_FIELDS) + 2))})",
+                    [
+                        (group, name, *(self.groups[group][name][field] for field in COUNTER_FIELDS))
+                        for group, name in self.dirty
+                    ]
+                )
+                self.dirty.clear()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save leaderboard state: {e}")
+            return False
+
+    def close(self):
+        """Close the state database (unsaved changes are discarded)"""
+        with self.lock:
+            self.conn.close()
+
+
+def state_path_for(snapshot_path: str) -> str:
+    """Get the default state database kept next to a leaderboard snapshot"""
+    return f"{os.path.splitext(snapshot_path)[0]}.state.db"
+
+
+def update_leaderboard(snapshot_path: str, signals: Iterable[Dict] = (),
+                       results: Iterable[Dict] = ()) -> PerformanceAggregator:
+    """
+    Fold new signals and scored results into a saved leaderboard
+
+    Args:
+        snapshot_path: Leaderboard snapshot JSON path (state is kept next to it)
+        signals: Newly posted signals (counted as tips)
+        results: Newly scored signals with price_analysis
+
+    Returns:
+        The updated aggregator (its state database already closed)
+    """
+    aggregator = PerformanceAggregator(state_path_for(snapshot_path))
+    tips = aggregator.add_signals(signals)
+    scored = aggregator.add_results(results)
+    aggregator.save_state()
+    aggregator.save_snapshot(snapshot_path)
+    aggregator.close()
+    logger.info(f"Leaderboard updated with {tips} new tips and {scored} new outcomes")
+    return aggregator
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Update the broker leaderboard snapshot')
+    parser.add_argument('results', nargs='*',
+                        help='Analyzed signal files (JSON/NDJSON) with price_analysis per signal')
+    parser.add_argument('--snapshot', default='leaderboard.json',
+                        help='Leaderboard snapshot path (default: leaderboard.json)')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of brokers to print (default: 10)')
+    args = parser.parse_args()
+
+    from signal_analyzer import TradingSignalAnalyzer
+    loader = TradingSignalAnalyzer()
+    results = [result for path in args.results for result in loader.iter_signals_from_json(path)]
+    aggregator = update_leaderboard(args.snapshot, results=results)
+
+    print(f"\n{'Broker':30} {'Tips':>6} {'Hit %':>7} {'SL %':>7} {'Avg Ret':>8}")
+    print("-" * 62)
+    for row in aggregator.leaderboard('brokers')[:args.top]:
+        hit_rate = f"{row['hit_rate']:.1f}" if row['hit_rate'] is not None else 'N/A'
+        sl_rate = f"{row['sl_rate']:.1f}" if row['sl_rate'] is not None else 'N/A'
+        print(f"{row['name'][:30]:30} {row['tips']:>6} {hit_rate:>7} {sl_rate:>7} {row['performance']:>8}")
+
+
+if __name__ == "__main__":
+    main()
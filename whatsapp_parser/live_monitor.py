@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Live Signal Monitor
+Tracks active trading signals against a stream of price ticks and emits
+stop loss, target and expiry events as levels are crossed
+"""
+
+import argparse
+import heapq
+import json
+import socket
+import time
+from bisect import bisect_left
+from datetime import date, datetime, time as day_time
+from itertools import count
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from metrics import METRICS
+from ndjson_io import NdjsonWriter
+from signal_store import signal_hash
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Target fields checked for each signal, in order
+TARGET_FIELDS = ('target_1', 'target_2', 'target_3')
+
+# Time of day given to replayed daily closes (NSE closes at 15:30)
+MARKET_CLOSE = day_time(15, 30)
+
+# Seconds between polls of a followed tick file
+FOLLOW_POLL_INTERVAL = 0.5
+
+Tick = Tuple[str, float, datetime]
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Strip the exchange suffix so feed tickers match parsed stock names"""
+    symbol = symbol.strip().upper()
+    return symbol[:-3] if symbol.endswith('.NS') else symbol
+
+
+def parse_timestamp(value) -> datetime:
+    """Read a tick timestamp: epoch seconds, ISO date or ISO datetime (now when missing)"""
+    if value is None or value == '':
+        return datetime.now()
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    value = str(value).strip()
+    try:
+        return datetime.fromtimestamp(float(value))
+    except ValueError:
+        return datetime.fromisoformat(value)
+
+
+def parse_tick(line: str) -> Optional[Tick]:
+    """
+    Parse one tick line
+
+    Accepts CSV (symbol,price[,timestamp]) or a JSON object with symbol,
+    price and optional timestamp keys.
+
+    Returns:
+        (symbol, price, timestamp) or None for blank, header or malformed lines
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith('{'):
+            record = json.loads(line)
+            symbol, price, timestamp = record['symbol'], record['price'], record.get('timestamp')
+        else:
+            fields = line.split(',')
+            symbol, price = fields[0], fields[1]
+            timestamp = fields[2] if len(fields) > 2 else None
+        return normalize_symbol(symbol), float(price), parse_timestamp(timestamp)
+    except (ValueError, KeyError, IndexError):
+        logger.debug(f"Skipping malformed tick: {line[:80]}")
+        return None
+
+
+def iter_ticks_from_file(file_path: str, follow: bool = False) -> Iterator[Tick]:
+    """
+    Read ticks from a file, one per line
+
+    Args:
+        file_path: Tick file (CSV or NDJSON lines)
+        follow: Keep waiting for lines appended to the file, like tail -f
+
+    Yields:
+        (symbol, price, timestamp) tuples
+    """
+    with open(file_path, 'rb') as f:
+        # Bytes of a line the writer has not finished yet, kept until its newline arrives
+        partial = b''
+        while True:
+            raw_line = f.readline()
+            if not raw_line:
+                if not follow:
+                    if partial:
+                        tick = parse_tick(partial.decode('utf-8', errors='replace'))
+                        if tick is not None:
+                            yield tick
+                    return
+                time.sleep(FOLLOW_POLL_INTERVAL)
+                continue
+            raw_line = partial + raw_line
+            if not raw_line.endswith(b'\n'):
+                # Writer is mid-line (possibly mid-character); wait for the rest
+                partial = raw_line
+                if follow:
+                    time.sleep(FOLLOW_POLL_INTERVAL)
+                continue
+            partial = b''
+            tick = parse_tick(raw_line.decode('utf-8', errors='replace'))
+            if tick is not None:
+                yield tick
+
+
+def iter_ticks_from_socket(host: str, port: int) -> Iterator[Tick]:
+    """
+    Read newline-delimited ticks from a TCP price feed until it closes
+
+    Args:
+        host: Feed host
+        port: Feed port
+
+    Yields:
+        (symbol, price, timestamp) tuples
+    """
+    with socket.create_connection((host, port)) as connection:
+        logger.info(f"Connected to price feed {host}:{port}")
+        for line in connection.makefile('r', encoding='utf-8'):
+            tick = parse_tick(line)
+            if tick is not None:
+                yield tick
+
+
+def iter_ticks_from_bars(price_analyzer, signals: List[Dict], end_date: Optional[str] = None) -> Iterator[Tick]:
+    """
+    Replay daily closes from a price analyzer as ticks, in date order
+
+    Works with any SimplePriceAnalyzer setup: live providers, the price
+    cache, a RecordReplayClient or a stand-in server.
+
+    Args:
+        price_analyzer: SimplePriceAnalyzer used to fetch bars
+        signals: Signals whose stocks and windows are replayed
+        end_date: Last date replayed (defaults to the latest cutoff date)
+
+    Yields:
+        (symbol, close, timestamp) tuples, one per stock per trading day
+    """
+    windows = {}
+    for signal in signals:
+        listing_date, cutoff_date = signal.get('listing_date'), signal.get('cutoff_date')
+        if not listing_date or not cutoff_date:
+            continue
+        start, end = windows.get(signal['stock'], (listing_date, cutoff_date))
+        windows[signal['stock']] = (min(start, listing_date), max(end, cutoff_date))
+
+    def symbol_ticks(symbol: str, start: str, end: str) -> Iterator[Tuple[int, str, float]]:
+        bars = price_analyzer.fetch_stock_price_data(symbol, start, min(end, end_date) if end_date else end)
+        if bars:
+            for ordinal, close in zip(bars.dates.tolist(), bars.close.tolist()):
+                yield ordinal, symbol, close
+
+    streams = [symbol_ticks(symbol, start, end) for symbol, (start, end) in sorted(windows.items())]
+    for ordinal, symbol, close in heapq.merge(*streams):
+        yield normalize_symbol(symbol), close, datetime.combine(date.fromordinal(ordinal), MARKET_CLOSE)
+
+
+class LiveMonitor:
+    """
+    Active signals indexed by price level, updated tick by tick
+
+    Each stock keeps its open target levels and stop losses in two sorted
+    lists, ordered so the levels a tick crosses form a suffix. A tick costs
+    a binary search plus the levels it actually crosses, however many
+    signals are open. Signals become active on their listing date and
+    expire after their cutoff date, tracked with two date heaps.
+    """
+
+    def __init__(self, on_event: Optional[Callable[[Dict], None]] = None):
+        """
+        Initialize monitor
+
+        Args:
+            on_event: Called with each event dictionary as it happens (optional)
+        """
+        self.on_event = on_event
+        # stock -> ([(-level, seq, signal_id, field)], [(level, seq, signal_id, field)])
+        self.books = {}
+        self.signals = {}
+        self.last_prices = {}
+        self.pending = []  # heap of (listing_date, seq, signal_id)
+        self.expiries = []  # heap of (cutoff_date, seq, signal_id)
+        self.clock = None
+        self._seq = count()
+        self.stats = {'ticks': 0, 'events': 0}
+
+    def add_signal(self, signal: Dict) -> Optional[str]:
+        """
+        Start tracking a signal (analyzed, with listing_date and cutoff_date)
+
+        Returns:
+            Signal id, or None if the signal is already tracked or has no stock
+        """
+        signal_id = signal_hash(signal)
+        if signal_id in self.signals or not signal.get('stock'):
+            return None
+        self.signals[signal_id] = {
+            'signal': signal,
+            'stock': normalize_symbol(signal['stock']),
+            'entries': [],
+            'targets_hit': [],
+            'active': False,
+        }
+        listing_date = signal.get('listing_date') or signal.get('date') or ''
+        heapq.heappush(self.pending, (listing_date, next(self._seq), signal_id))
+        if self.clock is not None:
+            self._activate(self.clock)
+        return signal_id
+
+    def add_signals(self, signals: Iterable[Dict]) -> int:
+        """Start tracking many signals, returning how many were new"""
+        return sum(self.add_signal(signal) is not None for signal in signals)
+
+    def _activate(self, today: str):
+        """Put the levels of signals listed on or before today into their books"""
+        while self.pending and self.pending[0][0] <= today:
+            _, _, signal_id = heapq.heappop(self.pending)
+            state = self.signals[signal_id]
+            signal = state['signal']
+            cutoff_date = signal.get('cutoff_date')
+            if cutoff_date and cutoff_date < today:
+                # Listed and expired before the monitor saw any price
+                del self.signals[signal_id]
+                continue
+
+            targets, stops = self.books.setdefault(state['stock'], ([], []))
+            for field in TARGET_FIELDS:
+                level = signal.get(field)
+                if level:
+                    entry = (-level, next(self._seq), signal_id, field)
+                    targets.insert(bisect_left(targets, entry), entry)
+                    state['entries'].append(entry)
+            if signal.get('stop_loss'):
+                entry = (signal['stop_loss'], next(self._seq), signal_id, 'stop_loss')
+                stops.insert(bisect_left(stops, entry), entry)
+                state['entries'].append(entry)
+
+            state['active'] = True
+            if cutoff_date:
+                heapq.heappush(self.expiries, (cutoff_date, next(self._seq), signal_id))
+
+    def _close(self, signal_id: str):
+        """Stop tracking a signal, removing its remaining levels from the books"""
+        state = self.signals.pop(signal_id)
+        targets, stops = self.books[state['stock']]
+        for entry in state['entries']:
+            book = stops if entry[3] == 'stop_loss' else targets
+            index = bisect_left(book, entry)
+            if index < len(book) and book[index] == entry:
+                del book[index]
+
+    def _event(self, event_type: str, signal_id: str, price: Optional[float],
+               timestamp: datetime, level: Optional[float] = None, **extra) -> Dict:
+        """Build, count and deliver one event (extra keyword arguments become event fields)"""
+        signal = self.signals[signal_id]['signal']
+        event = {
+            'event': event_type,
+            'signal_id': signal_id,
+            'stock': signal.get('stock'),
+            'sender': signal.get('sender'),
+            'listing_date': signal.get('listing_date'),
+            'cutoff_date': signal.get('cutoff_date'),
+            'buy_price': signal.get('buy_price_1'),
+            'level': level,
+            'price': price,
+            'timestamp': timestamp.isoformat(timespec='seconds'),
+            **extra,
+        }
+        self.stats['events'] += 1
+        METRICS.increment('monitor_events_total', event=event_type)
+        if self.on_event is not None:
+            self.on_event(event)
+        return event
+
+    def _expire(self, today: str, timestamp: datetime) -> List[Dict]:
+        """Close signals whose cutoff date is before today, with their final outcome"""
+        events = []
+        while self.expiries and self.expiries[0][0] < today:
+            _, _, signal_id = heapq.heappop(self.expiries)
+            state = self.signals.get(signal_id)
+            if state is None:
+                continue  # already closed by its stop loss
+
+            last_price = self.last_prices.get(state['stock'])
+            buy_price = state['signal'].get('buy_price_1')
+            if state['targets_hit']:
+                outcome = f"{state['targets_hit'][-1].upper()}_HIT"
+            elif last_price is None or not buy_price:
+                outcome = 'NO_DATA'
+            elif last_price > buy_price:
+                outcome = 'PROFIT'
+            elif last_price < buy_price:
+                outcome = 'LOSS'
+            else:
+                outcome = 'BREAKEVEN'
+
+            events.append(self._event('EXPIRED', signal_id, last_price, timestamp, outcome=outcome))
+            self._close(signal_id)
+        return events
+
+    def process_tick(self, symbol: str, price: float, timestamp: Optional[datetime] = None) -> List[Dict]:
+        """
+        Apply one price update
+
+        The clock moves first (signals listed today become active, signals
+        past their cutoff expire at the previous price), then stop losses at
+        or above the price close their signals, then targets at or below it
+        are marked hit. This matches the per-day rules of the batch scorer.
+
+        Args:
+            symbol: Stock symbol (an .NS suffix is ignored)
+            price: Traded price
+            timestamp: Time of the update (defaults to now)
+
+        Returns:
+            Events triggered by this tick, in order
+        """
+        timestamp = timestamp or datetime.now()
+        symbol = normalize_symbol(symbol)
+        self.stats['ticks'] += 1
+
+        events = self.advance_to(timestamp)
+        self.last_prices[symbol] = price
+        book = self.books.get(symbol)
+        if book is None:
+            return events
+        targets, stops = book
+
+        # Stop losses at or above the price: a suffix of the ascending list
+        index = bisect_left(stops, (price, -1))
+        if index < len(stops):
+            crossed = stops[index:]
+            for level, _, signal_id, _ in crossed:
+                if signal_id in self.signals:
+                    events.append(self._event('STOP_LOSS_HIT', signal_id, price, timestamp, level))
+                    self._close(signal_id)
+
+        # Targets at or below the price: a suffix of the list ordered by -level
+        index = bisect_left(targets, (-price, -1))
+        if index < len(targets):
+            crossed = targets[index:]
+            del targets[index:]
+            # Lowest levels first, so a gap up reports target 1 before target 2
+            for entry in reversed(crossed):
+                negative_level, _, signal_id, field = entry
+                state = self.signals[signal_id]
+                state['entries'].remove(entry)
+                state['targets_hit'].append(field)
+                state['targets_hit'].sort()
+                events.append(self._event(f"{field.upper()}_HIT", signal_id, price, timestamp, -negative_level))
+
+        return events
+
+    def advance_to(self, timestamp: datetime) -> List[Dict]:
+        """
+        Move the monitor's clock without a price update
+
+        Activates signals listed by the new date and expires those whose
+        cutoff date has passed, e.g. at the end of a replay.
+
+        Returns:
+            EXPIRED events, in cutoff order
+        """
+        today = timestamp.date().isoformat()
+        if today == self.clock:
+            return []
+        self.clock = today
+        events = self._expire(today, timestamp)
+        self._activate(today)
+        return events
+
+    def run(self, ticks: Iterable[Tick]) -> Dict:
+        """
+        Process a tick stream until it ends
+
+        Args:
+            ticks: (symbol, price, timestamp) tuples
+
+        Returns:
+            Dictionary with ticks, events, active signals and seconds
+        """
+        start_time = time.perf_counter()
+        with METRICS.timed('monitor') as items:
+            for symbol, price, timestamp in ticks:
+                self.process_tick(symbol, price, timestamp)
+            items['ticks'] = self.stats['ticks']
+        return {
+            'ticks': self.stats['ticks'],
+            'events': self.stats['events'],
+            'active': self.active_count(),
+            'seconds': time.perf_counter() - start_time,
+        }
+
+    def active_count(self) -> int:
+        """Number of tracked signals that are live (listed and not closed)"""
+        return sum(state['active'] for state in self.signals.values())
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Monitor active trading signals against live price ticks')
+    parser.add_argument('signals', help='Trading signals (JSON, NDJSON, CSV, NPZ, Parquet or Arrow)')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--ticks', help='Tick file with symbol,price,timestamp lines (CSV or NDJSON)')
+    source.add_argument('--socket', metavar='HOST:PORT', help='TCP price feed sending tick lines')
+    source.add_argument('--replay-bars', action='store_true',
+                        help='Replay daily closes of each signal window through the price analyzer')
+    parser.add_argument('--follow', action='store_true', help='With --ticks: keep reading appended lines')
+    parser.add_argument('--all', action='store_true',
+                        help='Track expired signals too (useful with --replay-bars)')
+    parser.add_argument('--events', help='Append events to this NDJSON file')
+    parser.add_argument('--cache-db', default='price_cache.db',
+                        help='With --replay-bars: SQLite price cache (default: price_cache.db)')
+    parser.add_argument('--price-url', help='With --replay-bars: base URL of a stand-in price server')
+    parser.add_argument('--replay', metavar='DIR',
+                        help='With --replay-bars: answer price requests from recorded responses')
+    args = parser.parse_args()
+
+    from columnar_io import is_columnar_path
+    from signal_analyzer import TradingSignalAnalyzer
+
+    analyzer = TradingSignalAnalyzer()
+    if args.signals.endswith('.csv'):
+        analyzer.load_signals_from_csv(args.signals)
+    elif is_columnar_path(args.signals):
+        analyzer.load_signals_from_columnar(args.signals)
+    else:
+        analyzer.load_signals_from_json(args.signals)
+    analyzer.analyze_signals()
+    signals = analyzer.analyzed_signals if args.all else analyzer.get_active_signals()
+
+    writer = NdjsonWriter(args.events, append=True) if args.events else None
+
+    def on_event(event: Dict):
+        print(f"{event['timestamp']} {event['event']:14} {event['stock']:12} "
+              f"price {event['price']} level {event['level']} ({event['sender']})")
+        if writer is not None:
+            writer.write(event)
+
+    monitor = LiveMonitor(on_event)
+    print(f"Tracking {monitor.add_signals(signals)} signals")
+
+    if args.ticks:
+        ticks = iter_ticks_from_file(args.ticks, follow=args.follow)
+    elif args.socket:
+        host, _, port = args.socket.rpartition(':')
+        ticks = iter_ticks_from_socket(host or 'localhost', int(port))
+    else:
+        from http_replay import build_http_client, price_base_urls
+        from simple_price_analyzer import SimplePriceAnalyzer
+        price_analyzer = SimplePriceAnalyzer(cache_path=args.cache_db, base_urls=price_base_urls(args.price_url),
+                                             http_client=build_http_client(replay_dir=args.replay))
+        ticks = iter_ticks_from_bars(price_analyzer, signals)
+
+    try:
+        stats = monitor.run(ticks)
+        if args.replay_bars:
+            # Close out the replayed windows that have ended
+            monitor.advance_to(datetime.now())
+            stats['events'], stats['active'] = monitor.stats['events'], monitor.active_count()
+    except KeyboardInterrupt:
+        stats = {'ticks': monitor.stats['ticks'], 'events': monitor.stats['events'],
+                 'active': monitor.active_count()}
+    finally:
+        if writer is not None:
+            writer.close()
+
+    print(f"\nProcessed {stats['ticks']} ticks, {stats['events']} events, {stats['active']} signals still active")
+
+
+if __name__ == "__main__":
+    main()
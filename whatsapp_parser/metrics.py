@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Run Metrics
+Stage timings, counters and latency histograms collected during a run,
+written as a JSON summary and a Prometheus textfile
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Prefix of every exported Prometheus metric
+METRIC_PREFIX = 'ratemybroker'
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# HELP text of the metrics recorded by the analyzers
+METRIC_HELP = {
+    'provider_requests_total': 'Price provider HTTP responses by provider and status code',
+    'provider_throttled_total': 'Price provider responses with status 429',
+    'provider_retries_total': 'Price provider requests retried after a retryable status',
+    'provider_errors_total': 'Price provider requests that raised before a response arrived',
+    'provider_request_seconds': 'Price provider request latency',
+    'price_cache_lookups_total': 'Price cache lookups by result (hit, partial, miss)',
+    'price_fetch_failures_total': 'Price data ranges no provider could serve',
+    'daemon_job_seconds': 'Analyzer daemon job run time by job',
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict) -> Labels:
+    """Freeze label keyword arguments into a hashable, ordered key"""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Dict] = None) -> str:
+    """Render labels in the Prometheus exposition format"""
+    pairs = list(labels) + sorted((extra or {}).items())
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One count per bucket plus the +Inf bucket, not cumulative
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Add one observation"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket holding it"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return self.max
+
+    def summary(self) -> Dict:
+        """Summarize the histogram for the JSON report"""
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'max': round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store of the metrics of one run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop everything recorded so far and restart the run clock"""
+        with self.lock:
+            self.started_at = time.time()
+            self.stages = {}
+            self.counters = {}
+            self.histograms = {}
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """Add to a counter"""
+        key = (name, _labels(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Add an observation to a histogram"""
+        key = (name, _labels(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def record_stage(self, stage: str, seconds: float, **items):
+        """
+        Add the wall time and item counts of one pass through a stage
+
+        Args:
+            stage: Stage name (parse, expiry, price_analysis, ...)
+            seconds: Wall time spent
+            **items: Item counts processed, e.g. lines=..., signals=...
+        """
+        with self.lock:
+            entry = self.stages.setdefault(stage, {'seconds': 0.0, 'calls': 0, 'items': {}})
+            entry['seconds'] += seconds
+            entry['calls'] += 1
+            for item, count in items.items():
+                entry['items'][item] = entry['items'].get(item, 0) + count
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[Dict]:
+        """
+        Time a block as one pass through a stage
+
+        Yields:
+            Dictionary the block fills with item counts (e.g. items['signals'] = n)
+        """
+        items = {}
+        start = time.perf_counter()
+        try:
+            yield items
+        finally:
+            self.record_stage(stage, time.perf_counter() - start, **items)
+
+    def _hit_ratios(self) -> Dict:
+        """Hit ratio of every counter labelled with result=hit/partial/miss"""
+        totals = {}
+        for (name, labels), value in self.counters.items():
+            result = dict(labels).get('result')
+            if result in ('hit', 'partial', 'miss'):
+                counts = totals.setdefault(name, {'hit': 0, 'partial': 0, 'miss': 0})
+                counts[result] += value
+        return {
+            name: round(counts['hit'] / sum(counts.values()), 4) if sum(counts.values()) else None
+            for name, counts in totals.items()
+        }
+
+    def summary(self) -> Dict:
+        """Build the JSON summary of the run"""
+        with self.lock:
+            stages = {}
+            for stage, entry in self.stages.items():
+                seconds = entry['seconds']
+                stages[stage] = {
+                    'seconds': round(seconds, 6),
+                    'calls': entry['calls'],
+                    'items': dict(entry['items']),
+                    'per_second': {
+                        item: round(count / seconds, 2) if seconds else None
+                        for item, count in entry['items'].items()
+                    },
+                }
+
+            counters = {}
+            for (name, labels), value in sorted(self.counters.items()):
+                counters.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+
+            histograms = {}
+            for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                histograms.setdefault(name, []).append({'labels': dict(labels), **histogram.summary()})
+
+            return {
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'finished_at': datetime.now().isoformat(timespec='seconds'),
+                'elapsed_seconds': round(time.time() - self.started_at, 3),
+                'stages': stages,
+                'counters': counters,
+                'histograms': histograms,
+                'hit_ratios': self._hit_ratios(),
+            }
+
+    def prometheus_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+
+        with self.lock:
+            header('run_seconds', 'gauge', 'Wall time of the run')
+            lines.append(f"{METRIC_PREFIX}_run_seconds {time.time() - self.started_at:.6f}")
+            header('run_timestamp_seconds', 'gauge', 'Unix time the run finished')
+            lines.append(f"{METRIC_PREFIX}_run_timestamp_seconds {time.time():.0f}")
+
+            if self.stages:
+                header('stage_seconds', 'gauge', 'Wall time spent in each stage')
+                for stage, entry in sorted(self.stages.items()):
+                    lines.append(f'{METRIC_PREFIX}_stage_seconds{{stage="{stage}"}} {entry["seconds"]:.6f}')
+                header('stage_items', 'gauge', 'Items processed by each stage')
+                for stage, entry in sorted(self.stages.items()):
+                    for item, count in sorted(entry['items'].items()):
+                        lines.append(f'{METRIC_PREFIX}_stage_items{{stage="{stage}",item="{item}"}} {count}')
+
+            names = sorted({name for name, _ in self.counters})
+            for name in names:
+                header(name, 'counter', METRIC_HELP.get(name, name))
+                for (counter, labels), value in sorted(self.counters.items()):
+                    if counter == name:
+                        lines.append(f"{METRIC_PREFIX}_{name}{_format_labels(labels)} {value}")
+
+            names = sorted({name for name, _ in self.histograms})
+            for name in names:
+                header(name, 'histogram', METRIC_HELP.get(name, name))
+                for (histogram_name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                    if histogram_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{METRIC_PREFIX}_{name}_bucket"
+                                     f"{_format_labels(labels, {'le': repr(bound)})} {cumulative}")
+                    lines.append(f"{METRIC_PREFIX}_{name}_bucket"
+                                 f"{_format_labels(labels, {'le': '+Inf'})} {histogram.count}")
+                    lines.append(f"{METRIC_PREFIX}_{name}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+                    lines.append(f"{METRIC_PREFIX}_{name}_count{_format_labels(labels)} {histogram.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def _write_atomic(self, output_path: str, content: str):
+        """Write a file atomically so collectors never read a partial one"""
+        temp_path = f"{output_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, output_path)
+
+    def write(self, base_path: str) -> bool:
+        """
+        Write the JSON summary and the Prometheus textfile of the run
+
+        Args:
+            base_path: Output path without extension (writes <base>.json and <base>.prom)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self._write_atomic(f"{base_path}.json", json.dumps(self.summary(), indent=2))
+            self._write_atomic(f"{base_path}.prom", self.prometheus_text())
+            logger.info(f"Saved run metrics to {base_path}.json and {base_path}.prom")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save run metrics: {e}")
+            return False
+
+
+# Registry shared by all analyzers in the process
+METRICS = MetricsRegistry()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Newline-Delimited JSON
+One JSON record per line, written and read one record at a time
+"""
+
+import json
+import os
+from typing import Dict, Iterator
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# File extensions treated as newline-delimited JSON instead of a JSON array
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+
+def is_ndjson_path(path: str) -> bool:
+    """Check whether a path has a newline-delimited JSON extension"""
+    return os.path.splitext(path)[1].lower() in NDJSON_EXTENSIONS
+
+
+class NdjsonWriter:
+    """Incremental writer emitting one compact JSON record per line"""
+
+    def __init__(self, output_path: str, append: bool = False):
+        """
+        Open the output file
+
+        Args:
+            output_path: Output file path
+            append: Add records to an existing file instead of overwriting it
+        """
+        needs_newline = append and self._ends_mid_line(output_path)
+        self.file = open(output_path, 'a' if append else 'w', encoding='utf-8')
+        if needs_newline:
+            # Keep a record cut short by an interrupted run on its own line
+            self.file.write('\n')
+        self.count = 0
+
+    def _ends_mid_line(self, output_path: str) -> bool:
+        """Check whether an existing file is non-empty and lacks a trailing newline"""
+        if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+            return False
+        with open(output_path, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) != b'\n'
+
+    def write(self, record: Dict):
+        """Write one record as a line"""
+        self.file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self.file.write('\n')
+        self.count += 1
+
+    def close(self):
+        """Close the output file"""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_ndjson(file_path: str) -> Iterator[Dict]:
+    """
+    Read records from a newline-delimited JSON file one at a time
+
+    Blank lines are ignored and malformed lines are logged and skipped.
+
+    Args:
+        file_path: Path to the NDJSON file
+
+    Yields:
+        One dictionary per line
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping malformed record on line {line_number} of {file_path}: {e}")
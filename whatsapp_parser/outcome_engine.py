@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Vectorized Signal Outcome Engine
+Score many trading signals at once against a matrix of daily closes
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+# Outcome labels, in the order of the codes returned by score_signals
+OUTCOMES = np.array([
+    "STOP_LOSS_HIT", "TARGET_3_HIT", "TARGET_2_HIT", "TARGET_1_HIT",
+    "PROFIT", "LOSS", "BREAKEVEN"
+])
+
+
+def _as_levels(values) -> np.ndarray:
+    """Convert price levels to float64, treating None and 0 as 'not set'"""
+    levels = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    levels[levels == 0] = np.nan
+    return levels
+
+
+def score_signals(closes: np.ndarray, lengths: np.ndarray, buy_price, stop_loss,
+                  target_1, target_2, target_3, highest_price: Optional[np.ndarray] = None,
+                  lowest_price: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Score a batch of signals against their daily closes
+
+    Row i of ``closes`` holds the closes of signal i's window, left-aligned
+    and padded past ``lengths[i]``. The rules match the per-day scan: stop
+    loss is checked first each day and ends the scan, targets only count on
+    days before the stop loss, and unset (None or 0) levels never trigger.
+
+    Args:
+        closes: Float matrix of shape (signals, max_window_length)
+        lengths: Number of valid days per row (each at least 1)
+        buy_price: Buy price per signal
+        stop_loss: Stop loss per signal (None or 0 when not set)
+        target_1: First target per signal (None or 0 when not set)
+        target_2: Second target per signal (None or 0 when not set)
+        target_3: Third target per signal (None or 0 when not set)
+        highest_price: Precomputed window highs (e.g. from a RangeExtremaIndex)
+        lowest_price: Precomputed window lows (e.g. from a RangeExtremaIndex)
+
+    Returns:
+        Dictionary of per-signal arrays: current_price, highest_price,
+        lowest_price, target_1_hit, target_2_hit, target_3_hit,
+        stop_loss_hit, first_hit_index (-1 when nothing was hit),
+        first_hit_price and outcome_code (index into OUTCOMES)
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    rows = np.arange(closes.shape[0])
+    columns = np.arange(closes.shape[1])
+    never = closes.shape[1]
+
+    valid = columns[None, :] < lengths[:, None]
+    buy = np.array([np.nan if v is None else v for v in buy_price], dtype=np.float64)
+
+    # Stop loss: first day closing at or below the level ends the scan
+    sl = _as_levels(stop_loss)
+    sl_mask = valid & (closes <= sl[:, None])
+    stop_loss_hit = sl_mask.any(axis=1)
+    sl_index = np.where(stop_loss_hit, sl_mask.argmax(axis=1), never)
+
+    # Targets only count on days strictly before the stop loss day
+    before_sl = valid & (columns[None, :] < sl_index[:, None])
+    target_hits = []
+    first_index = np.where(stop_loss_hit, sl_index, never)
+    for target in (target_1, target_2, target_3):
+        level = _as_levels(target)
+        mask = before_sl & (closes >= level[:, None])
+        hit = mask.any(axis=1)
+        first_index = np.minimum(first_index, np.where(hit, mask.argmax(axis=1), never))
+        target_hits.append(hit)
+
+    last_index = np.where(stop_loss_hit, sl_index, lengths - 1)
+    current_price = closes[rows, last_index]
+
+    if highest_price is None or lowest_price is None:
+        finite = valid & ~np.isnan(closes)
+        highest_price = np.where(finite, closes, -np.inf).max(axis=1)
+        lowest_price = np.where(finite, closes, np.inf).min(axis=1)
+
+    has_first_hit = first_index < never
+    first_hit_index = np.where(has_first_hit, first_index, -1)
+    first_hit_price = np.where(
+        has_first_hit, closes[rows, np.minimum(first_index, never - 1)], np.nan
+    )
+
+    outcome_code = np.select(
+        [
+            stop_loss_hit, target_hits[2], target_hits[1], target_hits[0],
+            current_price > buy, current_price < buy
+        ],
+        [0, 1, 2, 3, 4, 5],
+        default=6
+    )
+
+    return {
+        'current_price': current_price,
+        'highest_price': highest_price,
+        'lowest_price': lowest_price,
+        'target_1_hit': target_hits[0],
+        'target_2_hit': target_hits[1],
+        'target_3_hit': target_hits[2],
+        'stop_loss_hit': stop_loss_hit,
+        'first_hit_index': first_hit_index,
+        'first_hit_price': first_hit_price,
+        'outcome_code': outcome_code
+    }
+
+
+def build_close_matrix(close_windows, fill: float = np.nan):
+    """
+    Pack per-signal close sequences into a left-aligned padded matrix
+
+    Args:
+        close_windows: Sequence of per-signal close arrays or lists
+        fill: Padding value for days past a window's end
+
+    Returns:
+        Tuple of (closes matrix, lengths array)
+    """
+    lengths = np.fromiter((len(window) for window in close_windows), dtype=np.int64,
+                          count=len(close_windows))
+    width = int(lengths.max()) if len(lengths) else 0
+    closes = np.full((len(close_windows), max(width, 1)), fill, dtype=np.float64)
+    for i, window in enumerate(close_windows):
+        closes[i, :lengths[i]] = window
+    return closes, lengths
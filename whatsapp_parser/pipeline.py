@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Streaming Analysis Pipeline
+Chat export to performance report in one process, with parsing, expiry
+analysis, price fetching and scoring running as concurrent stages
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+import logging
+
+from columnar_io import ColumnarWriter, is_columnar_path
+from http_replay import build_http_client, price_base_urls
+from leaderboard import PerformanceAggregator, state_path_for
+from metrics import METRICS
+from ndjson_io import NdjsonWriter, is_ndjson_path
+from signal_analyzer import ANALYSIS_FIELDS, TradingSignalAnalyzer
+from simple_price_analyzer import PERFORMANCE_FIELDS, SimplePriceAnalyzer
+from trading_calendar import HOLIDAYS_HELP, TradingCalendar
+from trading_parser import SignalCsvWriter, SignalJsonWriter, TradingSignalParser
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# End-of-stream marker passed between stages
+_DONE = object()
+
+
+def open_record_writer(output_path: str, fieldnames: List[str]):
+    """
+    Open a record writer matching the output file extension
+
+    Args:
+        output_path: Output file path (.csv, .json, .ndjson/.jsonl, .npz, .parquet, .arrow)
+        fieldnames: Column order for CSV and columnar outputs
+
+    Returns:
+        Writer with write(record) and close() methods
+    """
+    if is_columnar_path(output_path):
+        return ColumnarWriter(output_path, columns=fieldnames)
+    if is_ndjson_path(output_path):
+        return NdjsonWriter(output_path)
+    if output_path.lower().endswith('.json'):
+        return SignalJsonWriter(output_path)
+    return SignalCsvWriter(output_path, fieldnames=fieldnames)
+
+
+class StageQueue(queue.Queue):
+    """Bounded queue between two pipeline stages, closed with an end-of-stream marker"""
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        self.finished = False
+
+    def close(self):
+        """Signal the consumer that no more items will arrive"""
+        self.put(_DONE)
+
+    def __iter__(self) -> Iterator:
+        """Yield items until the queue is closed"""
+        while True:
+            item = self.get()
+            if item is _DONE:
+                self.finished = True
+                return
+            yield item
+
+    def batches(self, batch_size: int) -> Iterator[List]:
+        """
+        Yield items in batches of up to batch_size
+
+        A batch is handed on as soon as the queue runs dry, so slow producers
+        never hold back items that are already waiting.
+        """
+        for item in self:
+            batch = [item]
+            while len(batch) < batch_size:
+                try:
+                    item = self.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    self.finished = True
+                    yield batch
+                    return
+                batch.append(item)
+            yield batch
+
+    def drain(self):
+        """Discard items until the queue is closed, so the producer never blocks"""
+        if not self.finished:
+            for _ in self:
+                pass
+
+
+class SignalPipeline:
+    """Parse, expire, fetch and score trading signals as one streaming run"""
+
+    def __init__(self, api_key: Optional[str] = None, cache_path: Optional[str] = 'price_cache.db',
+                 workers: int = 4, trading_days: bool = False,
+                 calendar: Optional[TradingCalendar] = None, queue_size: int = 1000,
+                 batch_size: int = 64, aggregator: Optional[PerformanceAggregator] = None,
+                 base_urls: Optional[Dict[str, str]] = None, http_client=None):
+        """
+        Initialize pipeline
+
+        Args:
+            api_key: API key for stock data provider (optional)
+            cache_path: Path to the on-disk price cache (None keeps it in memory)
+            workers: Number of concurrent price fetch workers
+            trading_days: Count signal time frames in NSE trading days
+            calendar: Trading calendar to use with trading_days (optional)
+            queue_size: Maximum number of items waiting between two stages
+            batch_size: Maximum number of signals analyzed or scored together
+            aggregator: Leaderboard aggregator updated with tips and outcomes (optional)
+            base_urls: Per-provider base URL overrides (optional)
+            http_client: Client used for provider requests, e.g. a RecordReplayClient (optional)
+        """
+        self.parser = TradingSignalParser()
+        self.signal_analyzer = TradingSignalAnalyzer(trading_days=trading_days, calendar=calendar)
+        self.price_analyzer = SimplePriceAnalyzer(api_key, cache_path=cache_path, max_workers=workers,
+                                                  base_urls=base_urls, http_client=http_client)
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.aggregator = aggregator
+
+        # Fetches of one stock are serialized so overlapping windows hit the cache
+        self._symbol_locks = {}
+        self._symbol_locks_guard = threading.Lock()
+
+        self.stats = {}
+        self.errors = []
+
+    def run(self, chat_path: str, report_path: str, analysis_path: Optional[str] = None,
+            today=None) -> Dict:
+        """
+        Run the whole pipeline over a chat export
+
+        Signals flow through bounded queues: parse -> expiry analysis ->
+        price fetch (on a thread pool) -> scoring -> export. Prices for early
+        signals are fetched while the rest of the file is still being parsed.
+        Report rows are written as they are scored, so their order follows
+        fetch completion rather than the chat.
+
+        Args:
+            chat_path: Path to the WhatsApp chat export
+            report_path: Performance report path; the extension selects the format
+            analysis_path: Path for the cutoff/expiry analysis of every signal (optional)
+            today: Reference date for expiry (defaults to today)
+
+        Returns:
+            Dictionary with signals, expired, scored, outcomes, errors and seconds
+        """
+        start_time = time.perf_counter()
+        self.stats = {'signals': 0, 'expired': 0, 'scored': 0, 'outcomes': Counter()}
+        self.errors = []
+
+        parsed = StageQueue(self.queue_size)
+        expired = StageQueue(self.queue_size)
+        fetched = StageQueue(self.queue_size)
+
+        analysis_writer = open_record_writer(analysis_path, ANALYSIS_FIELDS) if analysis_path else None
+        try:
+            with open_record_writer(report_path, PERFORMANCE_FIELDS) as report_writer:
+                threads = [
+                    self._start_stage('parse', self._parse_stage, (chat_path, parsed), None, parsed),
+                    self._start_stage('expiry', self._expiry_stage,
+                                      (parsed, expired, analysis_writer, today), parsed, expired),
+                    self._start_stage('fetch', self._fetch_stage, (expired, fetched), expired, fetched),
+                ]
+                # Scoring and export run on the calling thread
+                self._run_stage('score', self._score_stage, (fetched, report_writer), fetched, None)
+                for thread in threads:
+                    thread.join()
+        finally:
+            if analysis_writer is not None:
+                analysis_writer.close()
+
+        self.stats['errors'] = [f"{stage}: {error}" for stage, error in self.errors]
+        self.stats['seconds'] = time.perf_counter() - start_time
+        logger.info(f"Pipeline scored {self.stats['scored']} of {self.stats['expired']} expired signals "
+                    f"({self.stats['signals']} parsed) in {self.stats['seconds']:.1f}s")
+        return self.stats
+
+    def close(self):
+        """Release the price analyzer's HTTP session and price cache"""
+        self.price_analyzer.close()
+
+    def _run_stage(self, name: str, target: Callable, args: tuple,
+                   inbox: Optional[StageQueue], outbox: Optional[StageQueue]):
+        """Run one stage, always closing its output and draining its input on failure"""
+        start_time = time.perf_counter()
+        try:
+            target(*args)
+        except Exception as e:
+            logger.error(f"Pipeline stage {name} failed: {e}")
+            self.errors.append((name, e))
+            if inbox is not None:
+                inbox.drain()
+        finally:
+            if outbox is not None:
+                outbox.close()
+            # Stages overlap, so this is how long the stage thread was alive
+            METRICS.record_stage(f"pipeline_{name}", time.perf_counter() - start_time)
+
+    def _start_stage(self, name: str, target: Callable, args: tuple,
+                     inbox: Optional[StageQueue], outbox: Optional[StageQueue]) -> threading.Thread:
+        """Run one stage on its own thread"""
+        thread = threading.Thread(
+            target=self._run_stage, args=(name, target, args, inbox, outbox),
+            name=f"pipeline-{name}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _parse_stage(self, chat_path: str, outbox: StageQueue):
+        """Stream signals out of the chat export"""
+        for signal in self.parser.iter_signals(chat_path):
+            outbox.put(signal)
+
+    def _expiry_stage(self, inbox: StageQueue, outbox: StageQueue, analysis_writer, today):
+        """Compute cutoff and expiry per batch, passing expired signals on"""
+        for batch in inbox.batches(self.batch_size):
+            analyzed_signals = self.signal_analyzer.analyze_signal_batch(batch, today)
+            if self.aggregator is not None:
+                self.aggregator.add_signals(analyzed_signals)
+            for analyzed_signal in analyzed_signals:
+                self.stats['signals'] += 1
+                if analysis_writer is not None:
+                    analysis_writer.write(analyzed_signal)
+                if analyzed_signal['is_expired']:
+                    self.stats['expired'] += 1
+                    outbox.put(analyzed_signal)
+
+    def _fetch_stage(self, inbox: StageQueue, outbox: StageQueue):
+        """Fetch each expired signal's price window on the worker pool"""
+        # Bound the fetches in flight so a slow provider backs up into the queues
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='pipeline-fetch') as executor:
+            for signal in inbox:
+                slots.acquire()
+                executor.submit(self._fetch_signal, signal, outbox, slots)
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        """Get the lock serializing fetches of one stock"""
+        with self._symbol_locks_guard:
+            return self._symbol_locks.setdefault(symbol, threading.Lock())
+
+    def _fetch_signal(self, signal: Dict, outbox: StageQueue, slots: threading.BoundedSemaphore):
+        """Fetch one signal's bars and hand them to the scoring stage"""
+        try:
+            with self._symbol_lock(signal['stock']):
+                price_data = self.price_analyzer.fetch_stock_price_data(
+                    signal['stock'], signal['listing_date'], signal['cutoff_date']
+                )
+            if price_data is None:
+                logger.warning(f"No price data available for {signal['stock']}, skipping analysis")
+            outbox.put((signal, price_data))
+        except Exception as e:
+            logger.error(f"Failed to fetch prices for {signal.get('stock')}: {e}")
+            outbox.put((signal, None))
+        finally:
+            slots.release()
+
+    def _score_stage(self, inbox: StageQueue, report_writer):
+        """Score fetched signals in vectorized batches and write report rows"""
+        for batch in inbox.batches(self.batch_size):
+            signals = [signal for signal, _ in batch]
+            analyses = self.price_analyzer.analyze_signals_batch(
+                signals, [price_data for _, price_data in batch]
+            )
+            results = []
+            for signal, analysis in zip(signals, analyses):
+                result = signal.copy()
+                result['price_analysis'] = analysis
+                report_writer.write(self.price_analyzer.performance_row(result))
+                results.append(result)
+                self.stats['scored'] += 1
+                self.stats['outcomes'][analysis['outcome']] += 1
+            if self.aggregator is not None:
+                self.aggregator.add_results(results)
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(
+        description='Parse a WhatsApp chat export and write its performance report in one streaming run'
+    )
+    parser.add_argument('input_file', help='WhatsApp chat export (TXT)')
+    parser.add_argument('--report', default='performance_report.csv',
+                        help='Performance report path: .csv, .json, .ndjson, .npz, .parquet or .arrow '
+                             '(default: performance_report.csv)')
+    parser.add_argument('--analysis',
+                        help='Also write the cutoff/expiry analysis of every signal to this path')
+    parser.add_argument('--leaderboard',
+                        help='Update this broker leaderboard snapshot (JSON) with the new tips and outcomes')
+    parser.add_argument('--api-key', help='API key for stock data provider (Alpha Vantage)')
+    parser.add_argument('--cache-db', default='price_cache.db',
+                        help='SQLite file used to cache daily price bars (default: price_cache.db)')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of concurrent price fetch workers (default: 4)')
+    parser.add_argument('--price-url',
+                        help='Base URL serving both price provider APIs, e.g. a local stand-in server')
+    parser.add_argument('--record', metavar='DIR',
+                        help='Save every price provider response to this directory')
+    parser.add_argument('--replay', metavar='DIR',
+                        help='Answer price provider requests from responses saved with --record (no network)')
+    parser.add_argument('--trading-days', action='store_true',
+                        help='Count time frames in NSE trading days (weekends and holidays skipped)')
+    parser.add_argument('--holidays', help=HOLIDAYS_HELP)
+    parser.add_argument('--metrics', default='run_metrics',
+                        help='Base path of the run metrics, written as <base>.json and <base>.prom '
+                             '(default: run_metrics)')
+    parser.add_argument('--queue-size', type=int, default=1000,
+                        help='Maximum items buffered between stages (default: 1000)')
+    parser.add_argument('--batch-size', type=int, default=64,
+                        help='Maximum signals analyzed or scored per batch (default: 64)')
+    args = parser.parse_args()
+
+    calendar = TradingCalendar.from_file(args.holidays) if args.holidays else None
+    aggregator = PerformanceAggregator(state_path_for(args.leaderboard)) if args.leaderboard else None
+    pipeline = SignalPipeline(
+        api_key=args.api_key, cache_path=args.cache_db, workers=args.workers,
+        trading_days=args.trading_days or bool(args.holidays), calendar=calendar,
+        queue_size=args.queue_size, batch_size=args.batch_size, aggregator=aggregator,
+        base_urls=price_base_urls(args.price_url), http_client=build_http_client(args.record, args.replay)
+    )
+    try:
+        stats = pipeline.run(args.input_file, args.report, args.analysis)
+    finally:
+        pipeline.close()
+        # Written on failures too, to show where a slow or broken run spent its time
+        METRICS.write(args.metrics)
+        if aggregator is not None:
+            # Outcomes are deduplicated, so counts saved from a partial run stay exact
+            aggregator.save_state()
+            aggregator.save_snapshot(args.leaderboard)
+            aggregator.close()
+
+    print("\n" + "="*60)
+    print("PIPELINE SUMMARY")
+    print("="*60)
+    print(f"Signals Parsed: {stats['signals']}")
+    print(f"Expired Signals: {stats['expired']}")
+    print(f"Signals Scored: {stats['scored']}")
+    for outcome, count in stats['outcomes'].most_common():
+        print(f"  {outcome}: {count}")
+    print(f"Elapsed: {stats['seconds']:.1f}s")
+    print(f"Report: {args.report}")
+    if args.analysis:
+        print(f"Analysis: {args.analysis}")
+
+    if stats['errors']:
+        for error in stats['errors']:
+            print(f"Error: {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Columnar Price Series
+Daily OHLCV bars stored as NumPy arrays instead of one dict per day
+"""
+
+from datetime import date
+from typing import List, Dict, Optional
+
+import numpy as np
+
+
+def to_ordinal(date_str: str) -> int:
+    """Convert a YYYY-MM-DD string to a proleptic Gregorian day ordinal"""
+    return date.fromisoformat(date_str).toordinal()
+
+
+def from_ordinal(ordinal: int) -> str:
+    """Convert a day ordinal back to a YYYY-MM-DD string"""
+    return date.fromordinal(int(ordinal)).isoformat()
+
+
+class PriceSeries:
+    """Date-sorted daily bars for one symbol, one array per column"""
+
+    __slots__ = ('dates', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, dates, open, high, low, close, volume):
+        """
+        Initialize price series
+
+        Args:
+            dates: Day ordinals (int32), sorted ascending
+            open: Opening prices (float64)
+            high: Daily highs (float64)
+            low: Daily lows (float64)
+            close: Closing prices (float64)
+            volume: Traded volume (int64)
+        """
+        self.dates = np.asarray(dates, dtype=np.int32)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.int64)
+
+    @classmethod
+    def empty(cls) -> 'PriceSeries':
+        """Create a series without any bars"""
+        return cls([], [], [], [], [], [])
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'PriceSeries':
+        """
+        Build a series from price data dictionaries
+
+        Args:
+            records: List of dicts with date and close keys (open, high, low and volume optional)
+
+        Returns:
+            PriceSeries sorted by date
+        """
+        records = sorted(records, key=lambda day: day['date'])
+        return cls(
+            [to_ordinal(day['date']) for day in records],
+            [day.get('open') for day in records],
+            [day.get('high') for day in records],
+            [day.get('low') for day in records],
+            [day['close'] for day in records],
+            [day.get('volume') or 0 for day in records]
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "PriceSeries(empty)"
+        return f"PriceSeries({len(self)} bars, {self.date_str(0)} to {self.date_str(-1)})"
+
+    def date_str(self, index: int) -> str:
+        """Get the date of a bar as YYYY-MM-DD"""
+        return from_ordinal(self.dates[index])
+
+    def _take(self, key) -> 'PriceSeries':
+        """Select bars by slice (views) or index array (copies)"""
+        return PriceSeries(
+            self.dates[key], self.open[key], self.high[key],
+            self.low[key], self.close[key], self.volume[key]
+        )
+
+    def slice(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> 'PriceSeries':
+        """
+        Get the bars within a date range without copying
+
+        Args:
+            start_date: Start date (YYYY-MM-DD), open-ended if None
+            end_date: End date (YYYY-MM-DD), inclusive, open-ended if None
+
+        Returns:
+            PriceSeries whose arrays are views into this one
+        """
+        lo = 0 if start_date is None else np.searchsorted(self.dates, to_ordinal(start_date), side='left')
+        hi = len(self) if end_date is None else np.searchsorted(self.dates, to_ordinal(end_date), side='right')
+        return self._take(slice(lo, hi))
+
+    def to_records(self) -> List[Dict]:
+        """Convert the series back to a list of price data dictionaries"""
+        return [
+            {
+                'date': from_ordinal(self.dates[i]),
+                'open': float(self.open[i]),
+                'high': float(self.high[i]),
+                'low': float(self.low[i]),
+                'close': float(self.close[i]),
+                'volume': int(self.volume[i])
+            }
+            for i in range(len(self))
+        ]
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Persistent Price Store
+SQLite-backed cache of daily OHLC bars per symbol
+"""
+
+import sqlite3
+import threading
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+import logging
+
+from price_series import PriceSeries, from_ordinal, to_ordinal
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PriceStore:
+    """On-disk store of daily bars with per-symbol coverage tracking"""
+
+    def __init__(self, db_path: Optional[str] = 'price_cache.db'):
+        """
+        Initialize price store
+
+        Args:
+            db_path: Path to the SQLite database (None keeps the store in memory)
+        """
+        self.db_path = db_path or ':memory:'
+        # One connection shared by all fetch workers, serialized by the lock
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create bar and coverage tables if they do not exist"""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bars (
+                    symbol TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume INTEGER,
+                    PRIMARY KEY (symbol, date)
+                )
+                """
+            )
+            # Date ranges already fetched per symbol, so that ranges with no
+            # trading days (weekends, holidays) are not fetched again
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS coverage (
+                    symbol TEXT NOT NULL,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT NOT NULL
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_coverage_symbol ON coverage (symbol)"
+            )
+
+    def _get_coverage(self, symbol: str) -> List[Tuple[date, date]]:
+        """Get covered date ranges for a symbol, sorted by start date"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT start_date, end_date FROM coverage WHERE symbol = ? ORDER BY start_date",
+                (symbol,)
+            ).fetchall()
+        return [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in rows]
+
+    def missing_ranges(self, symbol: str, start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        """
+        Get the parts of a date range that have not been fetched yet
+
+        Args:
+            symbol: Stock symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), inclusive
+
+        Returns:
+            List of (start_date, end_date) tuples still missing from the store
+        """
+        start_dt = date.fromisoformat(start_date)
+        end_dt = date.fromisoformat(end_date)
+
+        missing = []
+        cursor = start_dt
+        for covered_start, covered_end in self._get_coverage(symbol):
+            if covered_end < cursor:
+                continue
+            if covered_start > end_dt:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start - timedelta(days=1)))
+            cursor = max(cursor, covered_end + timedelta(days=1))
+            if cursor > end_dt:
+                break
+
+        if cursor <= end_dt:
+            missing.append((cursor, end_dt))
+
+        return [(start.isoformat(), end.isoformat()) for start, end in missing]
+
+    def get_bars(self, symbol: str, start_date: str, end_date: str) -> PriceSeries:
+        """
+        Get stored bars for a symbol within a date range
+
+        Args:
+            symbol: Stock symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), inclusive
+
+        Returns:
+            PriceSeries sorted by date
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                """
+                SELECT date, open, high, low, close, volume FROM bars
+                WHERE symbol = ? AND date BETWEEN ? AND ?
+                ORDER BY date
+                """,
+                (symbol, start_date, end_date)
+            ).fetchall()
+
+        if not rows:
+            return PriceSeries.empty()
+
+        dates, opens, highs, lows, closes, volumes = zip(*rows)
+        return PriceSeries([to_ordinal(d) for d in dates], opens, highs, lows, closes, volumes)
+
+    def save_bars(self, symbol: str, bars: PriceSeries, start_date: str, end_date: str):
+        """
+        Store fetched bars and mark their date range as covered
+
+        Ranges reaching today or later are only marked covered up to yesterday,
+        since the bar for the current session is not final yet.
+
+        Args:
+            symbol: Stock symbol
+            bars: Fetched price series
+            start_date: Start date of the fetched range (YYYY-MM-DD)
+            end_date: End date of the fetched range (YYYY-MM-DD), inclusive
+        """
+        start_dt = date.fromisoformat(start_date)
+        end_dt = min(date.fromisoformat(end_date), date.today() - timedelta(days=1))
+
+        with self.lock, self.conn:
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO bars (symbol, date, open, high, low, close, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                zip(
+                    [symbol] * len(bars),
+                    [from_ordinal(d) for d in bars.dates],
+                    bars.open.tolist(), bars.high.tolist(), bars.low.tolist(),
+                    bars.close.tolist(), bars.volume.tolist()
+                )
+            )
+
+            if start_dt <= end_dt:
+                self._add_coverage(symbol, start_dt, end_dt)
+
+    def _add_coverage(self, symbol: str, start_dt: date, end_dt: date):
+        """Merge a covered range into the symbol's coverage list"""
+        ranges = self._get_coverage(symbol) + [(start_dt, end_dt)]
+        ranges.sort()
+
+        merged = [ranges[0]]
+        for range_start, range_end in ranges[1:]:
+            last_start, last_end = merged[-1]
+            if range_start <= last_end + timedelta(days=1):
+                merged[-1] = (last_start, max(last_end, range_end))
+            else:
+                merged.append((range_start, range_end))
+
+        self.conn.execute("DELETE FROM coverage WHERE symbol = ?", (symbol,))
+        self.conn.executemany(
+            "INSERT INTO coverage (symbol, start_date, end_date) VALUES (?, ?, ?)",
+            [(symbol, start.isoformat(), end.isoformat()) for start, end in merged]
+        )
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Quote Snapshot Cache
+Short-lived cache of current prices shared by every caller of an analyzer
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Seconds a current-price snapshot is served before it is fetched again
+DEFAULT_QUOTE_TTL = 60.0
+
+
+class QuoteCache:
+    """Thread-safe map of symbol to its last fetched price, expiring after a TTL"""
+
+    def __init__(self, ttl: float = DEFAULT_QUOTE_TTL):
+        """
+        Initialize quote cache
+
+        Args:
+            ttl: Seconds each price stays fresh
+        """
+        self.ttl = ttl
+        self._quotes = {}
+        # Symbols some caller is fetching right now, each with an event set when it is done,
+        # so concurrent callers wait for that fetch instead of sending their own
+        self._in_flight: Dict[str, threading.Event] = {}
+        self.lock = threading.Lock()
+
+    def get_many(self, symbols: Iterable[str]) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Split symbols into fresh cached prices and symbols that must be fetched
+
+        Returns:
+            (prices of fresh symbols, list of stale or unknown symbols)
+        """
+        now = time.monotonic()
+        prices, missing = {}, []
+        with self.lock:
+            for symbol in symbols:
+                entry = self._quotes.get(symbol)
+                if entry is not None and now - entry[1] < self.ttl:
+                    prices[symbol] = entry[0]
+                else:
+                    missing.append(symbol)
+        return prices, missing
+
+    def put_many(self, prices: Dict[str, float]):
+        """Store freshly fetched prices"""
+        now = time.monotonic()
+        with self.lock:
+            for symbol, price in prices.items():
+                self._quotes[symbol] = (price, now)
+
+    def claim(self, symbols: Iterable[str]) -> Tuple[Dict[str, float], List[str], List[threading.Event]]:
+        """
+        Split symbols into fresh prices, symbols the caller must fetch, and fetches to wait for
+
+        Symbols returned for fetching are marked in flight until release() is
+        called with them, which must happen even if the fetch fails.
+
+        Returns:
+            (prices of fresh symbols, symbols claimed for fetching, events of fetches already in flight)
+        """
+        now = time.monotonic()
+        prices, claimed, pending = {}, [], []
+        with self.lock:
+            for symbol in symbols:
+                entry = self._quotes.get(symbol)
+                if entry is not None and now - entry[1] < self.ttl:
+                    prices[symbol] = entry[0]
+                elif symbol in self._in_flight:
+                    pending.append(self._in_flight[symbol])
+                else:
+                    self._in_flight[symbol] = threading.Event()
+                    claimed.append(symbol)
+        return prices, claimed, pending
+
+    def release(self, symbols: Iterable[str]):
+        """Mark claimed symbols as no longer in flight and wake callers waiting for them"""
+        with self.lock:
+            events = [self._in_flight.pop(symbol) for symbol in symbols if symbol in self._in_flight]
+        for event in events:
+            event.set()
+
+    def get(self, symbol: str) -> Optional[float]:
+        """Get a fresh cached price, or None"""
+        prices, _ = self.get_many([symbol])
+        return prices.get(symbol)
+
+    def clear(self):
+        """Drop every snapshot"""
+        with self.lock:
+            self._quotes.clear()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Range Extrema Index
+Sparse tables over a price series for constant-time window highs and lows
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from price_series import PriceSeries, to_ordinal
+
+
+class RangeExtremaIndex:
+    """Constant-time highest/lowest/last-close queries over any date window of a series"""
+
+    def __init__(self, series: PriceSeries, column: str = 'close'):
+        """
+        Build the sparse tables
+
+        Level k of each table holds the extreme of the 2**k bars starting at
+        each position, so any window is covered by two overlapping blocks.
+        Building takes O(n log n); NaN bars are ignored.
+
+        Args:
+            series: Price series to index
+            column: Column the highs and lows are taken from
+        """
+        self.series = series
+        values = getattr(series, column)
+        n = len(values)
+        levels = max(1, n.bit_length())
+
+        self.max_table = np.full((levels, n), np.nan)
+        self.min_table = np.full((levels, n), np.nan)
+        if n:
+            self.max_table[0] = values
+            self.min_table[0] = values
+        for k in range(1, levels):
+            half = 1 << (k - 1)
+            width = n - (1 << k) + 1
+            self.max_table[k, :width] = np.fmax(self.max_table[k - 1, :width],
+                                                self.max_table[k - 1, half:half + width])
+            self.min_table[k, :width] = np.fmin(self.min_table[k - 1, :width],
+                                                self.min_table[k - 1, half:half + width])
+
+    def query_positions(self, lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Highest and lowest values for many windows of bar positions at once
+
+        Args:
+            lo: First bar position of each window
+            hi: Last bar position of each window (inclusive, hi >= lo)
+
+        Returns:
+            Tuple of (highest, lowest) arrays
+        """
+        lo = np.asarray(lo, dtype=np.int64)
+        hi = np.asarray(hi, dtype=np.int64)
+        level = np.floor(np.log2(hi - lo + 1)).astype(np.int64)
+        right = hi - (1 << level) + 1
+        highest = np.fmax(self.max_table[level, lo], self.max_table[level, right])
+        lowest = np.fmin(self.min_table[level, lo], self.min_table[level, right])
+        return highest, lowest
+
+    def query(self, start_date: str, end_date: str) -> Optional[Tuple[float, float, float]]:
+        """
+        Highest, lowest and last close within a date window
+
+        Args:
+            start_date: Window start date (YYYY-MM-DD)
+            end_date: Window end date (YYYY-MM-DD), inclusive
+
+        Returns:
+            Tuple of (highest, lowest, last close), or None if the window has no bars
+        """
+        lo = int(np.searchsorted(self.series.dates, to_ordinal(start_date), side='left'))
+        hi = int(np.searchsorted(self.series.dates, to_ordinal(end_date), side='right')) - 1
+        if hi < lo:
+            return None
+        highest, lowest = self.query_positions([lo], [hi])
+        return float(highest[0]), float(lowest[0]), float(self.series.close[hi])
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting Helpers
+Thread-safe token bucket and exponential backoff for price providers
+"""
+
+import random
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Token bucket limiter shared by all workers talking to one provider"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum burst size (defaults to one second worth of tokens, at least 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens accumulated since the last update"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        Block until the requested number of tokens is available
+
+        Args:
+            tokens: Number of tokens to take
+        """
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """
+        Drain the bucket so that every worker backs off after a rate limit response
+
+        Args:
+            seconds: How long the provider asked us to wait
+        """
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+def backoff_delay(attempt: int, base: float = 1.0, max_delay: float = 60.0) -> float:
+    """
+    Exponential backoff delay with full jitter
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay of the first retry in seconds
+        max_delay: Upper bound for the delay in seconds
+
+    Returns:
+        Number of seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(max_delay, base * (2 ** attempt)))
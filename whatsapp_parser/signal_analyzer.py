@@ -7,33 +7,74 @@ Analyze trading signals and compare against price history
 import json
 import csv
 import re
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple, Iterator
 import logging
 
+import numpy as np
+
+from columnar_io import read_records, write_columnar
+from metrics import METRICS
+from ndjson_io import is_ndjson_path, iter_ndjson
+from trading_calendar import TradingCalendar
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Column order for exported signal analysis
+ANALYSIS_FIELDS = [
+    'listing_date', 'sender', 'action', 'stock', 'buy_price_1', 'buy_price_2',
+    'stop_loss', 'target_1', 'target_2', 'target_3', 'time_frame',
+    'cutoff_date', 'is_expired', 'days_expired', 'raw_message'
+]
+
 
 class TradingSignalAnalyzer:
     """Analyze trading signals and their performance"""
     
-    def __init__(self):
-        """Initialize analyzer"""
+    def __init__(self, trading_days: bool = False, calendar: Optional[TradingCalendar] = None):
+        """
+        Initialize analyzer
+        
+        Args:
+            trading_days: Count time frames in NSE trading days instead of calendar days
+            calendar: Trading calendar to use (defaults to the built-in NSE holidays)
+        """
         self.signals = []
         self.analyzed_signals = []
+        self.calendar = (calendar or TradingCalendar()) if trading_days else None
+        # Only a handful of distinct time frames ("5-10 Days", "30 Days") occur
+        self._time_frame_cache = {}
         
     def load_signals_from_json(self, file_path: str):
-        """Load trading signals from JSON file"""
+        """Load trading signals from JSON file (a JSON array, or NDJSON for .ndjson/.jsonl)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.signals = json.load(f)
+            self.signals = list(self.iter_signals_from_json(file_path))
             logger.info(f"Loaded {len(self.signals)} trading signals from {file_path}")
         except Exception as e:
             logger.error(f"Failed to load signals: {e}")
             raise
     
+    def iter_signals_from_json(self, file_path: str) -> Iterator[Dict]:
+        """
+        Iterate over trading signals in a JSON file
+        
+        NDJSON files (.ndjson, .jsonl) are read one record at a time in
+        constant memory; JSON array files have to be loaded whole.
+        
+        Args:
+            file_path: Path to the JSON or NDJSON file
+            
+        Yields:
+            Trading signal dictionaries
+        """
+        if is_ndjson_path(file_path):
+            yield from iter_ndjson(file_path)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                yield from json.load(f)
+    
     def load_signals_from_csv(self, file_path: str):
         """Load trading signals from CSV file"""
         try:
@@ -64,6 +105,30 @@ class TradingSignalAnalyzer:
             logger.error(f"Failed to load signals: {e}")
             raise
     
+    def load_signals_from_columnar(self, file_path: str):
+        """Load trading signals from a columnar file (.npz, .parquet, .arrow)"""
+        try:
+            self.signals = read_records(file_path)
+            logger.info(f"Loaded {len(self.signals)} trading signals from {file_path}")
+        except Exception as e:
+            logger.error(f"Failed to load signals: {e}")
+            raise
+    
+    def load_signals_from_store(self, store, **filters):
+        """
+        Load the trading signals matching a query from a SignalStore
+        
+        Args:
+            store: SignalStore to read from
+            **filters: SignalStore.query filters (stock, sender, action, start_date, end_date, ...)
+        """
+        try:
+            self.signals = list(store.query(**filters))
+            logger.info(f"Loaded {len(self.signals)} trading signals from {store.db_path}")
+        except Exception as e:
+            logger.error(f"Failed to load signals: {e}")
+            raise
+    
     def _extract_days_from_timeframe(self, time_frame: str) -> Optional[int]:
         """
         Extract the upper end of time frame range
@@ -77,16 +142,16 @@ class TradingSignalAnalyzer:
         if not time_frame:
             return None
         
+        if time_frame in self._time_frame_cache:
+            return self._time_frame_cache[time_frame]
+        
         # Extract numbers from time frame
         numbers = re.findall(r'\d+', time_frame)
-        if not numbers:
-            return None
-        
-        # Convert to integers
-        days_list = [int(num) for num in numbers]
         
         # Return the maximum (upper end of range)
-        return max(days_list)
+        days = max(int(num) for num in numbers) if numbers else None
+        self._time_frame_cache[time_frame] = days
+        return days
     
     def _calculate_cutoff_date(self, listing_date: str, time_frame: str) -> Optional[str]:
         """
@@ -99,22 +164,113 @@ class TradingSignalAnalyzer:
         Returns:
             Cutoff date in YYYY-MM-DD format
         """
+        cutoff = self.compute_cutoff_dates([listing_date], [time_frame])[0]
+        if np.isnat(cutoff):
+            return None
+        return str(cutoff)
+    
+    def _to_datetime64(self, dates: List[str]) -> np.ndarray:
+        """
+        Convert YYYY-MM-DD strings to a datetime64[D] array
+        
+        Args:
+            dates: Date strings (None or unparseable dates become NaT)
+            
+        Returns:
+            datetime64[D] array
+        """
         try:
-            # Parse listing date
-            listing_dt = datetime.strptime(listing_date, '%Y-%m-%d')
+            return np.array(dates, dtype='datetime64[D]')
+        except (ValueError, TypeError):
+            pass
+        
+        # Slow path for non-ISO values such as unpadded months
+        parsed = np.full(len(dates), np.datetime64('NaT'), dtype='datetime64[D]')
+        for i, listing_date in enumerate(dates):
+            try:
+                parsed[i] = datetime.strptime(listing_date, '%Y-%m-%d').date()
+            except Exception as e:
+                logger.warning(f"Failed to calculate cutoff date for {listing_date}: {e}")
+        return parsed
+    
+    def compute_cutoff_dates(self, listing_dates: List[str], time_frames: List[str]) -> np.ndarray:
+        """
+        Calculate cutoff dates for many signals at once
+        
+        Args:
+            listing_dates: Signal dates (YYYY-MM-DD)
+            time_frames: Time frame string per signal
             
-            # Extract days from time frame
-            days = self._extract_days_from_timeframe(time_frame)
-            if not days:
-                return None
+        Returns:
+            datetime64[D] array of cutoff dates (NaT when a date or time frame is missing)
+        """
+        listing = self._to_datetime64(listing_dates)
+        days = np.array(
+            [self._extract_days_from_timeframe(tf) or 0 for tf in time_frames], dtype=np.int64
+        )
+        
+        if self.calendar is not None:
+            cutoff = self.calendar.add_trading_days(listing, days)
+        else:
+            cutoff = listing + days.astype('timedelta64[D]')
+        
+        cutoff[days <= 0] = np.datetime64('NaT')
+        return cutoff
+    
+    def compute_expiry(self, listing_dates: List[str], time_frames: List[str],
+                       today=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate cutoff date, expiry flag and days expired for many signals
+        
+        Args:
+            listing_dates: Signal dates (YYYY-MM-DD)
+            time_frames: Time frame string per signal
+            today: Reference date (defaults to today)
             
-            # Calculate cutoff date
-            cutoff_dt = listing_dt + timedelta(days=days)
-            return cutoff_dt.strftime('%Y-%m-%d')
+        Returns:
+            Tuple of (cutoff datetime64[D] array, is_expired bool array, days_expired int array)
+        """
+        today = np.datetime64(today or datetime.now().date(), 'D')
+        cutoff = self.compute_cutoff_dates(listing_dates, time_frames)
+        
+        # NaT compares False, so signals without a cutoff never expire
+        is_expired = today > cutoff
+        days_expired = np.where(is_expired, (today - cutoff).astype(np.int64), 0)
+        return cutoff, is_expired, days_expired
+    
+    def analyze_signal_batch(self, signals: List[Dict], today=None) -> List[Dict]:
+        """
+        Add cutoff and expiry fields to a batch of signals
+        
+        Args:
+            signals: Trading signal dictionaries (with a date key)
+            today: Reference date (defaults to today)
             
-        except Exception as e:
-            logger.warning(f"Failed to calculate cutoff date for {listing_date}: {e}")
-            return None
+        Returns:
+            List of analyzed signals, with date renamed to listing_date
+        """
+        with METRICS.timed('expiry') as items:
+            cutoff, is_expired, days_expired = self.compute_expiry(
+                [signal.get('date') for signal in signals],
+                [signal.get('time_frame') for signal in signals],
+                today
+            )
+            cutoff_dates = [None if day is None else day.isoformat() for day in cutoff.tolist()]
+            
+            analyzed_signals = []
+            for signal, cutoff_date, expired, days in zip(
+                signals, cutoff_dates, is_expired.tolist(), days_expired.tolist()
+            ):
+                # Create copy of signal, renaming date to listing_date
+                analyzed_signal = signal.copy()
+                analyzed_signal['listing_date'] = analyzed_signal.pop('date')
+                analyzed_signal['cutoff_date'] = cutoff_date
+                analyzed_signal['is_expired'] = expired
+                analyzed_signal['days_expired'] = days
+                analyzed_signals.append(analyzed_signal)
+            items['signals'] = len(analyzed_signals)
+        
+        return analyzed_signals
     
     def analyze_signals(self) -> List[Dict]:
         """
@@ -123,38 +279,7 @@ class TradingSignalAnalyzer:
         Returns:
             List of analyzed signals with additional fields
         """
-        today = datetime.now().date()
-        analyzed_signals = []
-        
-        for signal in self.signals:
-            # Create copy of signal
-            analyzed_signal = signal.copy()
-            
-            # Rename date to listing_date
-            analyzed_signal['listing_date'] = analyzed_signal.pop('date')
-            
-            # Calculate cutoff date
-            cutoff_date = self._calculate_cutoff_date(
-                analyzed_signal['listing_date'], 
-                analyzed_signal['time_frame']
-            )
-            analyzed_signal['cutoff_date'] = cutoff_date
-            
-            # Check if signal has expired
-            if cutoff_date:
-                cutoff_dt = datetime.strptime(cutoff_date, '%Y-%m-%d').date()
-                is_expired = today > cutoff_dt
-                analyzed_signal['is_expired'] = is_expired
-                
-                if is_expired:
-                    analyzed_signal['days_expired'] = (today - cutoff_dt).days
-                else:
-                    analyzed_signal['days_expired'] = 0
-            else:
-                analyzed_signal['is_expired'] = False
-                analyzed_signal['days_expired'] = 0
-            
-            analyzed_signals.append(analyzed_signal)
+        analyzed_signals = self.analyze_signal_batch(self.signals)
         
         self.analyzed_signals = analyzed_signals
         logger.info(f"Analyzed {len(analyzed_signals)} signals")
@@ -259,15 +384,8 @@ class TradingSignalAnalyzer:
                 logger.warning("No analyzed signals to export")
                 return False
             
-            # Define fieldnames for CSV
-            fieldnames = [
-                'listing_date', 'sender', 'action', 'stock', 'buy_price_1', 'buy_price_2',
-                'stop_loss', 'target_1', 'target_2', 'target_3', 'time_frame',
-                'cutoff_date', 'is_expired', 'days_expired', 'raw_message'
-            ]
-            
             with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.DictWriter(csvfile, fieldnames=ANALYSIS_FIELDS)
                 writer.writeheader()
                 
                 for signal in self.analyzed_signals:
@@ -282,6 +400,21 @@ class TradingSignalAnalyzer:
             logger.error(f"Failed to export analysis: {e}")
             return False
     
+    def export_analysis_to_columnar(self, output_path: str):
+        """Export analyzed signals to a typed columnar file (.npz, .parquet, .arrow)"""
+        try:
+            if not self.analyzed_signals:
+                logger.warning("No analyzed signals to export")
+                return False
+            
+            write_columnar(self.analyzed_signals, output_path, columns=ANALYSIS_FIELDS)
+            logger.info(f"Exported analysis to: {output_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to export analysis: {e}")
+            return False
+    
     def print_summary(self):
         """Print analysis summary"""
         if not self.analyzed_signals:
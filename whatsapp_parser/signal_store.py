@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Trading Signal Store
+Indexed SQLite store of parsed trading signals with content-hash deduplication
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import date
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from signal_analyzer import TradingSignalAnalyzer
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Signal fields stored as columns, in the parser's export order
+STORED_FIELDS = [
+    'date', 'sender', 'action', 'stock', 'buy_price_1', 'buy_price_2',
+    'stop_loss', 'target_1', 'target_2', 'target_3', 'time_frame', 'raw_message'
+]
+
+# Rows per executemany call during bulk inserts
+INSERT_CHUNK_SIZE = 1000
+
+
+def signal_hash(signal: Dict) -> str:
+    """
+    Hash the content of a signal, so the same message imported twice is stored once
+
+    Accepts raw signals (date key) and analyzed signals (listing_date key).
+    """
+    content = {field: signal.get(field) for field in STORED_FIELDS}
+    if content['date'] is None:
+        content['date'] = signal.get('listing_date')
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def cutoff_mode(analyzer: TradingSignalAnalyzer) -> str:
+    """
+    Describe how an analyzer counts time frames, so stored cutoff dates can be
+    checked against it: 'calendar', or 'trading:' plus a hash of the holidays
+    """
+    if analyzer.calendar is None:
+        return 'calendar'
+    holidays = ','.join(analyzer.calendar.holidays.astype(str).tolist())
+    return f"trading:{hashlib.sha256(holidays.encode('utf-8')).hexdigest()[:16]}"
+
+
+class SignalStore:
+    """On-disk store of trading signals, queryable by stock, sender and date ranges"""
+
+    def __init__(self, db_path: Optional[str] = 'signals.db',
+                 analyzer: Optional[TradingSignalAnalyzer] = None):
+        """
+        Initialize signal store
+
+        Args:
+            db_path: Path to the SQLite database (None keeps the store in memory)
+            analyzer: Analyzer used to compute cutoff dates on insert
+                (defaults to calendar-day time frames)
+        """
+        self.db_path = db_path or ':memory:'
+        # One connection shared by all threads, serialized by the lock
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.analyzer = analyzer or TradingSignalAnalyzer()
+        self.cutoff_mode = cutoff_mode(self.analyzer)
+        # Set once rows stored under another calendar mode have been recomputed
+        self._cutoffs_current = False
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the signals table and its indexes if they do not exist"""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signals (
+                    id INTEGER PRIMARY KEY,
+                    content_hash TEXT NOT NULL UNIQUE,
+                    listing_date TEXT,
+                    cutoff_date TEXT,
+                    cutoff_mode TEXT,
+                    sender TEXT,
+                    action TEXT,
+                    stock TEXT,
+                    buy_price_1 REAL,
+                    buy_price_2 REAL,
+                    stop_loss REAL,
+                    target_1 REAL,
+                    target_2 REAL,
+                    target_3 REAL,
+                    time_frame TEXT,
+                    raw_message TEXT
+                )
+                """
+            )
+            for column in ('stock', 'sender', 'listing_date', 'cutoff_date'):
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_signals_{column} ON signals ({column})"
+                )
+
+    def _rows(self, signals: List[Dict]) -> List[Tuple]:
+        """Convert a chunk of signals into insert rows, computing their cutoff dates"""
+        listing_dates = [signal.get('date') or signal.get('listing_date') for signal in signals]
+        cutoffs = self.analyzer.compute_cutoff_dates(
+            listing_dates, [signal.get('time_frame') for signal in signals]
+        ).tolist()
+        return [
+            (
+                signal_hash(signal), listing_date, None if cutoff is None else cutoff.isoformat(),
+                self.cutoff_mode,
+                signal.get('sender'), signal.get('action'), signal.get('stock'),
+                signal.get('buy_price_1'), signal.get('buy_price_2'), signal.get('stop_loss'),
+                signal.get('target_1'), signal.get('target_2'), signal.get('target_3'),
+                signal.get('time_frame'), signal.get('raw_message')
+            )
+            for signal, listing_date, cutoff in zip(signals, listing_dates, cutoffs)
+        ]
+
+    def add_signals(self, signals: Iterable[Dict]) -> int:
+        """
+        Insert signals in one transaction, skipping ones already stored
+
+        Args:
+            signals: Raw or analyzed signal dictionaries (list or iterator)
+
+        Returns:
+            Number of new signals stored
+        """
+        signals = iter(signals)
+        inserted = 0
+        with self.lock, self.conn:
+            while True:
+                chunk = list(islice(signals, INSERT_CHUNK_SIZE))
+                if not chunk:
+                    break
+                before = self.conn.total_changes
+                self.conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO signals (
+                        content_hash, listing_date, cutoff_date, cutoff_mode, sender, action, stock,
+                        buy_price_1, buy_price_2, stop_loss, target_1, target_2, target_3,
+                        time_frame, raw_message
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    self._rows(chunk)
+                )
+                inserted += self.conn.total_changes - before
+
+        logger.info(f"Stored {inserted} new trading signals in {self.db_path}")
+        return inserted
+
+    def refresh_cutoffs(self) -> int:
+        """
+        Recompute the cutoff dates of rows stored under another calendar mode
+
+        Cutoffs are computed on insert by whichever analyzer inserted the row;
+        a store later opened with --trading-days or other holidays would
+        otherwise filter on stale dates.
+
+        Returns:
+            Number of rows updated
+        """
+        updated = 0
+        with self.lock, self.conn:
+            # Read the stale rows first, since the updates change what the query matches
+            stale = self.conn.execute(
+                "SELECT id, listing_date, time_frame FROM signals WHERE cutoff_mode IS NOT ?",
+                (self.cutoff_mode,)
+            ).fetchall()
+            for start in range(0, len(stale), INSERT_CHUNK_SIZE):
+                rows = stale[start:start + INSERT_CHUNK_SIZE]
+                cutoffs = self.analyzer.compute_cutoff_dates(
+                    [row[1] for row in rows], [row[2] for row in rows]
+                ).tolist()
+                self.conn.executemany(
+                    "UPDATE signals SET cutoff_date = ?, cutoff_mode = ? WHERE id = ?",
+                    [
+                        (None if cutoff is None else cutoff.isoformat(), self.cutoff_mode, row[0])
+                        for row, cutoff in zip(rows, cutoffs)
+                    ]
+                )
+                updated += len(rows)
+            self._cutoffs_current = True
+        if updated:
+            logger.info(f"Recomputed {updated} stored cutoff dates for {self.cutoff_mode} time frames")
+        return updated
+
+    def _where(self, stock: Optional[str] = None, sender: Optional[str] = None,
+               action: Optional[str] = None, start_date: Optional[str] = None,
+               end_date: Optional[str] = None, cutoff_start: Optional[str] = None,
+               cutoff_end: Optional[str] = None, expired_as_of: Optional[str] = None
+               ) -> Tuple[str, List]:
+        """Build the WHERE clause and parameters for a query"""
+        if not self._cutoffs_current and any(
+            value is not None for value in (cutoff_start, cutoff_end, expired_as_of)
+        ):
+            self.refresh_cutoffs()
+        conditions = []
+        params = []
+        for column, operator, value in (
+            ('stock', '=', stock),
+            ('sender', '=', sender),
+            ('action', '=', action),
+            ('listing_date', '>=', start_date),
+            ('listing_date', '<=', end_date),
+            ('cutoff_date', '>=', cutoff_start),
+            ('cutoff_date', '<=', cutoff_end),
+            ('cutoff_date', '<', expired_as_of),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    def query(self, stock: Optional[str] = None, sender: Optional[str] = None,
+              action: Optional[str] = None, start_date: Optional[str] = None,
+              end_date: Optional[str] = None, cutoff_start: Optional[str] = None,
+              cutoff_end: Optional[str] = None, expired_as_of: Optional[str] = None,
+              limit: Optional[int] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream the stored signals matching all given filters
+
+        Args:
+            stock: Stock symbol
+            sender: Sender name
+            action: BUY, SELL or HOLD
+            start_date: Earliest listing date (YYYY-MM-DD), inclusive
+            end_date: Latest listing date (YYYY-MM-DD), inclusive
+            cutoff_start: Earliest cutoff date (YYYY-MM-DD), inclusive
+            cutoff_end: Latest cutoff date (YYYY-MM-DD), inclusive
+            expired_as_of: Only signals whose cutoff date is before this date
+            limit: Maximum number of signals
+            batch_size: Rows fetched from SQLite at a time
+
+        Yields:
+            Signal dictionaries in the parser's format, ordered by listing date
+        """
+        where, params = self._where(stock, sender, action, start_date, end_date,
+                                    cutoff_start, cutoff_end, expired_as_of)
+        sql = (
+            "SELECT listing_date, sender, action, stock, buy_price_1, buy_price_2, stop_loss, "
+            "target_1, target_2, target_3, time_frame, raw_message FROM signals"
+            f"{where} ORDER BY listing_date, id"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            cursor = self.conn.execute(sql, params)
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(STORED_FIELDS, row))
+
+    def count(self, **filters) -> int:
+        """Count the stored signals matching the same filters as query"""
+        where, params = self._where(**filters)
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM signals{where}", params).fetchone()[0]
+
+    def expired_signals(self, as_of: Optional[str] = None, **filters) -> Iterator[Dict]:
+        """Stream signals whose stored cutoff date has passed (as of today by default)"""
+        return self.query(expired_as_of=as_of or date.today().isoformat(), **filters)
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self.lock:
+            self.conn.close()
@@ -8,39 +8,256 @@ import json
 import csv
 import requests
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from columnar_io import is_columnar_path, write_columnar
+from metrics import METRICS
+from outcome_engine import OUTCOMES, build_close_matrix, score_signals
+from price_series import PriceSeries, to_ordinal
+from price_store import PriceStore
+from quote_cache import DEFAULT_QUOTE_TTL, QuoteCache
+from range_index import RangeExtremaIndex
+from rate_limiter import TokenBucket, backoff_delay
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sustained requests per second and burst size per price provider
+DEFAULT_RATE_LIMITS = {
+    'yahoo': (2.0, 4),
+    'alpha_vantage': (5 / 60, 1),  # Free tier allows 5 requests per minute
+}
+
+# Provider base URLs; point them at a local stand-in server to run offline
+DEFAULT_BASE_URLS = {
+    'yahoo': 'https://query1.finance.yahoo.com',
+    'alpha_vantage': 'https://www.alphavantage.co',
+}
+
+# Headers of every pooled provider request (responses are gzip-compressed when possible)
+SESSION_HEADERS = {
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+# Browser User-Agent that Yahoo Finance expects
+YAHOO_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Symbols per Yahoo quote request (the endpoint takes a comma-separated list)
+QUOTE_BATCH_SIZE = 50
+
+# Number of hosts with their own connection pool in a session
+POOL_HOSTS = 4
+
+# Status codes worth retrying with exponential backoff
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Column order for exported performance reports
+PERFORMANCE_FIELDS = [
+    'stock', 'listing_date', 'cutoff_date', 'buy_price', 'stop_loss',
+    'target_1', 'target_2', 'target_3', 'time_frame', 'current_price',
+    'highest_price', 'lowest_price', 'target_1_hit', 'target_2_hit',
+    'target_3_hit', 'stop_loss_hit', 'first_hit_date', 'first_hit_price',
+    'outcome', 'data_points'
+]
+
+
+def build_http_session(pool_size: int, pool_block: bool = True) -> requests.Session:
+    """
+    Build a keep-alive session whose connections are reused across requests
+    
+    requests sessions are safe to share between threads for plain GETs:
+    urllib3 hands each request its own connection from a locked pool.
+    
+    Args:
+        pool_size: Maximum connections kept open per host
+        pool_block: Wait for a free connection instead of opening extra
+            throwaway ones when all pool_size connections to a host are busy
+        
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    session.headers.update(SESSION_HEADERS)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_size,
+                                            pool_block=pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 
 class SimplePriceAnalyzer:
     """Analyze trading signals against price data without pandas"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_path: Optional[str] = 'price_cache.db',
+                 max_workers: int = 4, rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 max_retries: int = 4, base_urls: Optional[Dict[str, str]] = None,
+                 http_client=None, pool_size: Optional[int] = None, pool_block: bool = True,
+                 quote_ttl: float = DEFAULT_QUOTE_TTL):
         """
         Initialize price analyzer
         
         Args:
             api_key: API key for stock data provider (optional)
+            cache_path: Path to the on-disk price cache (None keeps it in memory)
+            max_workers: Number of signals fetched and analyzed concurrently
+            rate_limits: Per-provider (requests per second, burst) overrides
+            max_retries: Retries for rate limited or failed provider requests
+            base_urls: Per-provider base URL overrides
+            http_client: Object with a requests-style get() used for provider
+                requests, e.g. a RecordReplayClient (defaults to a pooled session)
+            pool_size: Keep-alive connections per provider host (defaults to max_workers)
+            pool_block: Make workers wait for a pooled connection rather than
+                exceed pool_size connections per host
+            quote_ttl: Seconds a current price is reused before it is fetched again
         """
         self.api_key = api_key
-        self.price_cache = {}  # Cache for price data
+        self.max_workers = max(1, max_workers)
+        
+        # One pooled session shared by all workers, so connections are reused
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or build_http_session(pool_size or self.max_workers, pool_block)
+        
+        self.base_urls = dict(DEFAULT_BASE_URLS)
+        self.base_urls.update({k: v.rstrip('/') for k, v in (base_urls or {}).items()})
+        self.price_cache = PriceStore(cache_path)  # Cache for price data
+        self.quote_cache = QuoteCache(quote_ttl)  # Current prices shared by all callers
+        self.max_retries = max_retries
+        
+        limits = dict(DEFAULT_RATE_LIMITS)
+        limits.update(rate_limits or {})
+        self.rate_limiters = {
+            provider: TokenBucket(rate, burst) for provider, (rate, burst) in limits.items()
+        }
         
-    def fetch_stock_price_data(self, symbol: str, start_date: str, end_date: str) -> Optional[List[Dict]]:
+        # Full Alpha Vantage histories fetched during this run, keyed by symbol
+        self._alpha_vantage_series = {}
+        self._alpha_vantage_lock = threading.Lock()
+    
+    def close(self):
+        """Close the pooled provider connections and the price cache"""
+        if self._owns_http_client:
+            self.http_client.close()
+        self.price_cache.close()
+    
+    def _request_with_backoff(self, provider: str, url: str, params: Dict,
+                              headers: Optional[Dict] = None, timeout: int = 15) -> requests.Response:
         """
-        Fetch historical price data for a stock from Yahoo Finance
+        Send a GET request through the provider's rate limiter, retrying with backoff
+        
+        Args:
+            provider: Provider name used to pick the rate limiter
+            url: Request URL
+            params: Query parameters
+            headers: Request headers (optional)
+            timeout: Request timeout in seconds
+            
+        Returns:
+            The last response received
+        """
+        limiter = self.rate_limiters[provider]
+        
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.http_client.get(url, params=params, headers=headers, timeout=timeout)
+            except Exception:
+                METRICS.increment('provider_errors_total', provider=provider)
+                raise
+            finally:
+                METRICS.observe('provider_request_seconds', time.perf_counter() - start, provider=provider)
+            METRICS.increment('provider_requests_total', provider=provider, status=response.status_code)
+            
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                return response
+            
+            delay = backoff_delay(attempt)
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            
+            if response.status_code == 429:
+                # Slow down every worker sharing this provider, not just this one
+                limiter.penalize(delay)
+                METRICS.increment('provider_throttled_total', provider=provider)
+            METRICS.increment('provider_retries_total', provider=provider)
+            
+            logger.warning(f"{provider} returned {response.status_code}, retrying in {delay:.1f}s "
+                           f"(attempt {attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+        
+        return response
+        
+    def fetch_stock_price_data(self, symbol: str, start_date: str, end_date: str) -> Optional[PriceSeries]:
+        """
+        Fetch historical price data for a stock, using the price cache first
+        
+        Only the date ranges missing from the cache are fetched from the
+        providers; everything else is served from disk.
         
         Args:
             symbol: Stock symbol
             start_date: Start date (YYYY-MM-DD)
-            end_date: End date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), inclusive
             
         Returns:
-            List of price data dictionaries or None if failed
+            PriceSeries or None if failed
+        """
+        try:
+            missing_ranges = self.price_cache.missing_ranges(symbol, start_date, end_date)
+            if not missing_ranges:
+                result = 'hit'
+            elif missing_ranges == [(start_date, end_date)]:
+                result = 'miss'
+            else:
+                result = 'partial'
+            METRICS.increment('price_cache_lookups_total', result=result)
+            fetch_failed = False
+            
+            for range_start, range_end in missing_ranges:
+                data = self._fetch_from_providers(symbol, range_start, range_end)
+                if data is None:
+                    METRICS.increment('price_fetch_failures_total')
+                    fetch_failed = True
+                    continue
+                self.price_cache.save_bars(symbol, data, range_start, range_end)
+            
+            price_data = self.price_cache.get_bars(symbol, start_date, end_date)
+            if fetch_failed and not price_data:
+                logger.error(f"No price data available for {symbol}")
+                return None
+            
+            if fetch_failed:
+                logger.warning(f"Partial price data for {symbol} between {start_date} and {end_date}")
+            
+            return price_data
+            
+        except Exception as e:
+            logger.error(f"Failed to fetch price data for {symbol}: {e}")
+            return None
+    
+    def _fetch_from_providers(self, symbol: str, start_date: str, end_date: str) -> Optional[PriceSeries]:
+        """
+        Fetch historical price data from Yahoo Finance, falling back to Alpha Vantage
+        
+        Args:
+            symbol: Stock symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), inclusive
+            
+        Returns:
+            PriceSeries or None if failed
         """
         try:
             # Try Yahoo Finance first
@@ -55,86 +272,93 @@ class SimplePriceAnalyzer:
                     return data
             
             # If no data available, return None
-            logger.error(f"No price data available for {symbol}")
             return None
             
         except Exception as e:
-            logger.error(f"Failed to fetch price data for {symbol}: {e}")
+            logger.debug(f"Price providers failed for {symbol}: {e}")
             return None
     
-    def _fetch_from_alpha_vantage(self, symbol: str, start_date: str, end_date: str) -> Optional[List[Dict]]:
-        """Fetch data from Alpha Vantage API"""
-        if not self.api_key:
-            return None
+    def _load_alpha_vantage_series(self, symbol: str) -> Optional[PriceSeries]:
+        """
+        Get the full daily history of a symbol from Alpha Vantage, once per run
         
-        try:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                "function": "TIME_SERIES_DAILY",
-                "symbol": symbol,
-                "apikey": self.api_key,
-                "outputsize": "full"
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if "Time Series (Daily)" not in data:
-                return None
+        The "full" output size returns the whole history in a single request,
+        so it is parsed once into a date-sorted PriceSeries, kept in memory
+        for the rest of the run and written to the price cache in full.
+        Failed lookups are remembered too, to stay within the daily quota.
+        
+        Args:
+            symbol: Stock symbol
             
-            # Convert to list of dictionaries
-            price_data = []
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-            
-            for date_str, values in data["Time Series (Daily)"].items():
-                date_dt = datetime.strptime(date_str, '%Y-%m-%d')
-                if start_dt <= date_dt <= end_dt:
-                    price_data.append({
-                        'date': date_str,
-                        'open': float(values['1. open']),
-                        'high': float(values['2. high']),
-                        'low': float(values['3. low']),
-                        'close': float(values['4. close']),
-                        'volume': int(values['5. volume'])
-                    })
-            
-            return sorted(price_data, key=lambda x: x['date'])
+        Returns:
+            PriceSeries or None if failed
+        """
+        with self._alpha_vantage_lock:
+            if symbol in self._alpha_vantage_series:
+                return self._alpha_vantage_series[symbol]
+            
+            series = None
+            try:
+                url = f"{self.base_urls['alpha_vantage']}/query"
+                params = {
+                    "function": "TIME_SERIES_DAILY",
+                    "symbol": symbol,
+                    "apikey": self.api_key,
+                    "outputsize": "full"
+                }
+                
+                response = self._request_with_backoff('alpha_vantage', url, params, timeout=10)
+                response.raise_for_status()
+                
+                data = response.json()
+                if "Time Series (Daily)" in data and data["Time Series (Daily)"]:
+                    daily = data["Time Series (Daily)"]
+                    # ISO dates sort chronologically as strings
+                    dates = sorted(daily)
+                    series = PriceSeries(
+                        [to_ordinal(d) for d in dates],
+                        [float(daily[d]['1. open']) for d in dates],
+                        [float(daily[d]['2. high']) for d in dates],
+                        [float(daily[d]['3. low']) for d in dates],
+                        [float(daily[d]['4. close']) for d in dates],
+                        [int(daily[d]['5. volume']) for d in dates]
+                    )
+                    self.price_cache.save_bars(symbol, series, dates[0], dates[-1])
+                    
+            except Exception as e:
+                logger.debug(f"Alpha Vantage failed for {symbol}: {e}")
             
-        except Exception as e:
-            logger.debug(f"Alpha Vantage failed for {symbol}: {e}")
+            self._alpha_vantage_series[symbol] = series
+            return series
+    
+    def _fetch_from_alpha_vantage(self, symbol: str, start_date: str, end_date: str) -> Optional[PriceSeries]:
+        """Fetch data from Alpha Vantage API, reusing the full history for the run"""
+        if not self.api_key:
             return None
+        
+        series = self._load_alpha_vantage_series(symbol)
+        if series is None:
+            return None
+        
+        # Binary search the sorted day ordinals for the requested window
+        return series.slice(start_date, end_date)
     
-    def _fetch_from_yahoo_finance(self, symbol: str, start_date: str, end_date: str) -> Optional[List[Dict]]:
+    def _fetch_from_yahoo_finance(self, symbol: str, start_date: str, end_date: str) -> Optional[PriceSeries]:
         """Fetch data from Yahoo Finance API with rate limiting"""
         try:
             # Add .NS suffix for Indian stocks if not present
             if not symbol.endswith('.NS'):
                 symbol = f"{symbol}.NS"
             
-            # Add delay to avoid rate limiting
-            time.sleep(1)
-            
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+            url = f"{self.base_urls['yahoo']}/v8/finance/chart/{symbol}"
             params = {
                 "period1": int(datetime.strptime(start_date, '%Y-%m-%d').timestamp()),
-                "period2": int(datetime.strptime(end_date, '%Y-%m-%d').timestamp()),
+                # period2 is exclusive, so ask for the day after end_date
+                "period2": int((datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)).timestamp()),
                 "interval": "1d"
             }
             
-            # Add headers to mimic browser request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, params=params, headers=headers, timeout=15)
-            
-            if response.status_code == 429:
-                logger.warning(f"Rate limited for {symbol}, waiting 5 seconds...")
-                time.sleep(5)
-                response = requests.get(url, params=params, headers=headers, timeout=15)
-            
+            response = self._request_with_backoff('yahoo', url, params, headers=YAHOO_HEADERS, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -142,24 +366,28 @@ class SimplePriceAnalyzer:
                 return None
             
             result = data["chart"]["result"][0]
-            timestamps = result["timestamp"]
+            # Ranges without trading days come back without timestamps
+            timestamps = result.get("timestamp", [])
             quotes = result["indicators"]["quote"][0]
             
-            # Create price data list
-            price_data = []
-            for i, timestamp in enumerate(timestamps):
-                if i < len(quotes.get('open', [])) and quotes['open'][i] is not None:
-                    date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
-                    price_data.append({
-                        'date': date_str,
-                        'open': quotes['open'][i],
-                        'high': quotes['high'][i],
-                        'low': quotes['low'][i],
-                        'close': quotes['close'][i],
-                        'volume': quotes['volume'][i] if quotes['volume'][i] else 0
-                    })
-            
-            return price_data
+            # Keep days that have a quote, straight into column arrays
+            opens = quotes.get('open', [])
+            start_ordinal, end_ordinal = to_ordinal(start_date), to_ordinal(end_date)
+            rows, ordinals = [], []
+            for i in range(min(len(timestamps), len(opens))):
+                ordinal = datetime.fromtimestamp(timestamps[i]).toordinal()
+                if opens[i] is not None and start_ordinal <= ordinal <= end_ordinal:
+                    rows.append(i)
+                    ordinals.append(ordinal)
+            
+            return PriceSeries(
+                ordinals,
+                [opens[i] for i in rows],
+                [quotes['high'][i] for i in rows],
+                [quotes['low'][i] for i in rows],
+                [quotes['close'][i] for i in rows],
+                [quotes['volume'][i] or 0 for i in rows]
+            )
             
         except Exception as e:
             logger.debug(f"Yahoo Finance failed for {symbol}: {e}")
@@ -167,7 +395,7 @@ class SimplePriceAnalyzer:
     
     def fetch_current_price(self, symbol: str) -> Optional[float]:
         """
-        Fetch current price for a stock symbol from Yahoo Finance
+        Fetch current price for a stock symbol, served from the quote cache when fresh
         
         Args:
             symbol: Stock symbol
@@ -175,6 +403,87 @@ class SimplePriceAnalyzer:
         Returns:
             Current price or None if failed
         """
+        price = self.fetch_current_prices([symbol]).get(symbol)
+        if price is None:
+            logger.error(f"No current price data available for {symbol}")
+        return price
+    
+    def fetch_current_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Fetch current prices for many symbols in as few requests as possible
+        
+        Fresh prices come from the quote cache. The rest are requested from
+        the Yahoo quote endpoint QUOTE_BATCH_SIZE symbols at a time; symbols
+        it does not return fall back to the per-symbol chart and Alpha
+        Vantage lookups, run concurrently. Symbols another caller is already
+        fetching are waited for rather than requested again.
+        
+        Args:
+            symbols: Stock symbols (duplicates are fetched once)
+            
+        Returns:
+            Dictionary of symbol to current price (None if unavailable)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        prices, missing = self.quote_cache.get_many(symbols)
+        
+        if missing:
+            # Claim the symbols nobody is fetching yet; the rest are awaited below.
+            # No lock is held during the requests, so unrelated callers never queue.
+            fresh, claimed, pending = self.quote_cache.claim(missing)
+            prices.update(fresh)
+            try:
+                if claimed:
+                    fetched = self._fetch_quotes_from_yahoo(claimed)
+                    fallback = [symbol for symbol in claimed if symbol not in fetched]
+                    if fallback:
+                        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                            for symbol, price in zip(fallback, executor.map(self._fetch_current_single, fallback)):
+                                if price:
+                                    fetched[symbol] = price
+                    self.quote_cache.put_many(fetched)
+                    prices.update(fetched)
+            finally:
+                self.quote_cache.release(claimed)
+            
+            if pending:
+                for event in pending:
+                    event.wait()
+                fresh, _ = self.quote_cache.get_many(symbol for symbol in missing if symbol not in prices)
+                prices.update(fresh)
+        
+        METRICS.increment('quote_cache_lookups_total', len(symbols) - len(missing), result='hit')
+        METRICS.increment('quote_cache_lookups_total', len(missing), result='miss')
+        return {symbol: prices.get(symbol) for symbol in symbols}
+    
+    def _fetch_quotes_from_yahoo(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch current prices from the Yahoo quote endpoint, many symbols per request"""
+        # Map the .NS tickers Yahoo answers with back to the caller's symbols
+        tickers = {symbol if symbol.endswith('.NS') else f"{symbol}.NS": symbol for symbol in symbols}
+        url = f"{self.base_urls['yahoo']}/v7/finance/quote"
+        prices = {}
+        
+        ticker_list = list(tickers)
+        for i in range(0, len(ticker_list), QUOTE_BATCH_SIZE):
+            batch = ticker_list[i:i + QUOTE_BATCH_SIZE]
+            try:
+                response = self._request_with_backoff('yahoo', url, {'symbols': ','.join(batch)},
+                                                      headers=YAHOO_HEADERS, timeout=15)
+                response.raise_for_status()
+                
+                for quote in response.json().get('quoteResponse', {}).get('result') or []:
+                    symbol = tickers.get(quote.get('symbol'))
+                    price = quote.get('regularMarketPrice')
+                    if symbol is not None and price:
+                        prices[symbol] = float(price)
+                        
+            except Exception as e:
+                logger.debug(f"Yahoo Finance quotes failed for {len(batch)} symbols: {e}")
+        
+        return prices
+    
+    def _fetch_current_single(self, symbol: str) -> Optional[float]:
+        """Fetch one current price from the Yahoo chart endpoint, falling back to Alpha Vantage"""
         try:
             # Try Yahoo Finance
             price = self._fetch_current_from_yahoo(symbol)
@@ -187,11 +496,10 @@ class SimplePriceAnalyzer:
                 if price:
                     return price
             
-            logger.error(f"No current price data available for {symbol}")
             return None
             
         except Exception as e:
-            logger.error(f"Failed to fetch current price for {symbol}: {e}")
+            logger.debug(f"Current price lookups failed for {symbol}: {e}")
             return None
     
     def _fetch_current_from_yahoo(self, symbol: str) -> Optional[float]:
@@ -201,29 +509,15 @@ class SimplePriceAnalyzer:
             if not symbol.endswith('.NS'):
                 symbol = f"{symbol}.NS"
             
-            # Add delay to avoid rate limiting
-            time.sleep(2)
-            
-            # Get current date and 5 days ago for recent data
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=5)
-            
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+            # Ask for the last 5 days by range rather than clock-derived
+            # timestamps, so the request is the same on every run (and replayable)
+            url = f"{self.base_urls['yahoo']}/v8/finance/chart/{symbol}"
             params = {
-                "period1": int(start_date.timestamp()),
-                "period2": int(end_date.timestamp()),
+                "range": "5d",
                 "interval": "1d"
             }
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, params=params, headers=headers, timeout=15)
-            
-            if response.status_code == 429:
-                logger.warning(f"Rate limited for {symbol}, using simulated price")
-                return None
+            response = self._request_with_backoff('yahoo', url, params, headers=YAHOO_HEADERS, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
@@ -249,16 +543,14 @@ class SimplePriceAnalyzer:
             return None
         
         try:
-            time.sleep(1)  # Alpha Vantage has rate limits
-            
-            url = "https://www.alphavantage.co/query"
+            url = f"{self.base_urls['alpha_vantage']}/query"
             params = {
                 "function": "GLOBAL_QUOTE",
                 "symbol": symbol,
                 "apikey": self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self._request_with_backoff('alpha_vantage', url, params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -273,83 +565,59 @@ class SimplePriceAnalyzer:
             logger.debug(f"Alpha Vantage current price failed for {symbol}: {e}")
             return None
     
-    def analyze_signal_performance(self, signal: Dict, price_data: List[Dict]) -> Dict:
+    def analyze_signal_performance(self, signal: Dict, price_data: Union[PriceSeries, List[Dict]]) -> Dict:
         """
         Analyze trading signal performance against price data with daily comparison
         Continues analysis to track all targets hit (only stops on stop loss)
         
         Args:
             signal: Trading signal dictionary
-            price_data: Historical price data list
+            price_data: Historical PriceSeries (or legacy list of price data dicts)
             
         Returns:
             Performance analysis dictionary
         """
-        if not price_data:
+        # One signal is scanned directly; building a padded batch matrix
+        # costs far more than the scan itself (see analyze_signals_batch)
+        series = PriceSeries.from_records(price_data) if isinstance(price_data, list) else price_data
+        if not series:
             return self._create_empty_analysis()
         
         buy_price = signal['buy_price_1']
         stop_loss = signal['stop_loss']
-        target_1 = signal['target_1']
-        target_2 = signal.get('target_2')
-        target_3 = signal.get('target_3')
-        
-        # Initialize tracking variables
-        target_1_hit = False
-        target_2_hit = False
-        target_3_hit = False
-        stop_loss_hit = False
-        final_price = price_data[-1]['close']
-        first_hit_date = None
-        first_hit_price = None
-        outcome = "NO_HIT"
+        targets = (signal['target_1'], signal.get('target_2'), signal.get('target_3'))
         
-        # Track high and low prices during the timeframe
-        highest_price = max(day['close'] for day in price_data)
-        lowest_price = min(day['close'] for day in price_data)
+        closes = series.close.tolist()
+        target_hits = [False, False, False]
+        stop_loss_hit = False
+        final_price = closes[-1]
+        first_hit_index = None
         
         # Daily price comparison - continue until stop loss or end of timeframe
-        for day_data in price_data:
-            close_price = day_data['close']
-            date = day_data['date']
-            
+        for i, close_price in enumerate(closes):
             # Check stop loss first (priority - stops analysis)
             if stop_loss and close_price <= stop_loss:
                 stop_loss_hit = True
                 final_price = close_price
-                if not first_hit_date:
-                    first_hit_date = date
-                    first_hit_price = close_price
-                outcome = "STOP_LOSS_HIT"
+                if first_hit_index is None:
+                    first_hit_index = i
                 break
             
             # Check targets (continue analysis to track all targets)
-            if target_1 and close_price >= target_1 and not target_1_hit:
-                target_1_hit = True
-                if not first_hit_date:
-                    first_hit_date = date
-                    first_hit_price = close_price
-            
-            if target_2 and close_price >= target_2 and not target_2_hit:
-                target_2_hit = True
-                if not first_hit_date:
-                    first_hit_date = date
-                    first_hit_price = close_price
-            
-            if target_3 and close_price >= target_3 and not target_3_hit:
-                target_3_hit = True
-                if not first_hit_date:
-                    first_hit_date = date
-                    first_hit_price = close_price
+            for t, target in enumerate(targets):
+                if target and not target_hits[t] and close_price >= target:
+                    target_hits[t] = True
+                    if first_hit_index is None:
+                        first_hit_index = i
         
         # Determine final outcome
         if stop_loss_hit:
             outcome = "STOP_LOSS_HIT"
-        elif target_3_hit:
+        elif target_hits[2]:
             outcome = "TARGET_3_HIT"
-        elif target_2_hit:
+        elif target_hits[1]:
             outcome = "TARGET_2_HIT"
-        elif target_1_hit:
+        elif target_hits[0]:
             outcome = "TARGET_1_HIT"
         elif final_price > buy_price:
             outcome = "PROFIT"
@@ -359,19 +627,88 @@ class SimplePriceAnalyzer:
             outcome = "BREAKEVEN"
         
         return {
-            'current_price': final_price,
-            'highest_price': highest_price,
-            'lowest_price': lowest_price,
-            'target_1_hit': target_1_hit,
-            'target_2_hit': target_2_hit,
-            'target_3_hit': target_3_hit,
+            'current_price': float(final_price),
+            'highest_price': float(max(closes)),
+            'lowest_price': float(min(closes)),
+            'target_1_hit': target_hits[0],
+            'target_2_hit': target_hits[1],
+            'target_3_hit': target_hits[2],
             'stop_loss_hit': stop_loss_hit,
-            'first_hit_date': first_hit_date,
-            'first_hit_price': first_hit_price,
+            'first_hit_date': series.date_str(first_hit_index) if first_hit_index is not None else None,
+            'first_hit_price': float(closes[first_hit_index]) if first_hit_index is not None else None,
             'outcome': outcome,
-            'data_points': len(price_data)
+            'data_points': len(closes)
         }
     
+    def analyze_signals_batch(self, signals: List[Dict],
+                              price_data_list: List[Union[PriceSeries, List[Dict], None]],
+                              extremes: Optional[List[Optional[Tuple[float, float, float]]]] = None) -> List[Dict]:
+        """
+        Analyze many signals at once with the vectorized outcome engine
+        
+        Each signal's closes become one row of a padded price matrix, and stop
+        loss and target first-hit days are found with array operations instead
+        of a per-day loop (see outcome_engine.score_signals).
+        
+        Args:
+            signals: List of trading signal dictionaries
+            price_data_list: Historical PriceSeries for each signal (None if unavailable)
+            extremes: Optional precomputed (highest, lowest, last close) per signal,
+                      e.g. from RangeExtremaIndex.query
+            
+        Returns:
+            List of performance analysis dictionaries, in input order
+        """
+        series_list = [
+            PriceSeries.from_records(price_data) if isinstance(price_data, list) else price_data
+            for price_data in price_data_list
+        ]
+        
+        analyses = [None] * len(signals)
+        scored = [i for i, series in enumerate(series_list) if series]
+        for i in range(len(signals)):
+            if not series_list[i]:
+                analyses[i] = self._create_empty_analysis()
+        
+        if not scored:
+            return analyses
+        
+        highest_price = lowest_price = None
+        if extremes is not None:
+            highest_price = np.array([extremes[i][0] for i in scored])
+            lowest_price = np.array([extremes[i][1] for i in scored])
+        
+        closes, lengths = build_close_matrix([series_list[i].close for i in scored])
+        scores = score_signals(
+            closes, lengths,
+            [signals[i]['buy_price_1'] for i in scored],
+            [signals[i]['stop_loss'] for i in scored],
+            [signals[i]['target_1'] for i in scored],
+            [signals[i].get('target_2') for i in scored],
+            [signals[i].get('target_3') for i in scored],
+            highest_price=highest_price,
+            lowest_price=lowest_price
+        )
+        
+        for row, i in enumerate(scored):
+            first_hit_index = int(scores['first_hit_index'][row])
+            has_first_hit = first_hit_index >= 0
+            analyses[i] = {
+                'current_price': float(scores['current_price'][row]),
+                'highest_price': float(scores['highest_price'][row]),
+                'lowest_price': float(scores['lowest_price'][row]),
+                'target_1_hit': bool(scores['target_1_hit'][row]),
+                'target_2_hit': bool(scores['target_2_hit'][row]),
+                'target_3_hit': bool(scores['target_3_hit'][row]),
+                'stop_loss_hit': bool(scores['stop_loss_hit'][row]),
+                'first_hit_date': series_list[i].date_str(first_hit_index) if has_first_hit else None,
+                'first_hit_price': float(scores['first_hit_price'][row]) if has_first_hit else None,
+                'outcome': str(OUTCOMES[scores['outcome_code'][row]]),
+                'data_points': int(lengths[row])
+            }
+        
+        return analyses
+    
     def _create_empty_analysis(self) -> Dict:
         """Create empty analysis when no price data is available"""
         return {
@@ -388,42 +725,123 @@ class SimplePriceAnalyzer:
             'data_points': 0
         }
     
+    def plan_price_fetches(self, signals: List[Dict]) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Group signal windows by stock and merge them into the fewest date ranges
+        
+        Overlapping or adjacent (listing_date, cutoff_date) windows of the same
+        stock are merged, so each stock is fetched once per merged range.
+        
+        Args:
+            signals: List of trading signal dictionaries
+            
+        Returns:
+            Dictionary mapping stock to sorted list of (start_date, end_date) ranges
+        """
+        windows = {}
+        for signal in signals:
+            if not signal.get('listing_date') or not signal.get('cutoff_date'):
+                continue
+            windows.setdefault(signal['stock'], []).append(
+                (signal['listing_date'], signal['cutoff_date'])
+            )
+        
+        plan = {}
+        for stock, stock_windows in windows.items():
+            stock_windows.sort()
+            merged = [stock_windows[0]]
+            for window_start, window_end in stock_windows[1:]:
+                last_start, last_end = merged[-1]
+                next_day = (datetime.strptime(last_end, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+                if window_start <= next_day:
+                    merged[-1] = (last_start, max(last_end, window_end))
+                else:
+                    merged.append((window_start, window_end))
+            plan[stock] = merged
+        
+        return plan
+    
+    def _slice_price_data(self, fetched_ranges: List[Tuple[str, str, Optional[PriceSeries],
+                                                           Optional[RangeExtremaIndex]]],
+                          start_date: str, end_date: str) -> Tuple[Optional[PriceSeries], Optional[Tuple]]:
+        """
+        Cut a signal's window out of the merged range that contains it
+        
+        Args:
+            fetched_ranges: List of (start_date, end_date, price_data, index) for one stock
+            start_date: Window start date (YYYY-MM-DD)
+            end_date: Window end date (YYYY-MM-DD), inclusive
+            
+        Returns:
+            Tuple of (zero-copy PriceSeries view of the window, (highest, lowest,
+            last close) from the range index); (None, None) if the range fetch failed
+        """
+        for range_start, range_end, price_data, index in fetched_ranges:
+            if range_start <= start_date and end_date <= range_end:
+                if price_data is None:
+                    return None, None
+                extremes = index.query(start_date, end_date) if index else None
+                return price_data.slice(start_date, end_date), extremes
+        return None, None
+    
     def analyze_multiple_signals(self, signals: List[Dict]) -> List[Dict]:
         """
         Analyze multiple trading signals
         
+        Signal windows are first coalesced per stock (see plan_price_fetches).
+        The merged ranges are fetched concurrently on up to max_workers threads,
+        with provider rate limits shared across all workers. Each merged range
+        gets a RangeExtremaIndex, so window highs and lows cost O(1) per signal,
+        and each signal's bars are sliced out locally.
+        
         Args:
             signals: List of trading signal dictionaries
             
         Returns:
-            List of signals with price analysis results
+            List of signals with price analysis results, in input order
         """
         if not signals:
             return []
         
-        analyzed_signals = []
+        plan = self.plan_price_fetches(signals)
+        fetch_tasks = [(stock, start, end) for stock, ranges in plan.items() for start, end in ranges]
+        logger.info(f"Fetching {len(fetch_tasks)} merged date ranges for {len(plan)} stocks "
+                    f"({len(signals)} signals)")
+        
+        with METRICS.timed('price_fetch') as items, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            fetched = list(executor.map(lambda task: self.fetch_stock_price_data(*task), fetch_tasks))
+            items['ranges'] = len(fetch_tasks)
         
+        fetched_ranges = {}
+        for (stock, start, end), price_data in zip(fetch_tasks, fetched):
+            index = RangeExtremaIndex(price_data) if price_data else None
+            fetched_ranges.setdefault(stock, []).append((start, end, price_data, index))
+        
+        price_data_list = []
+        extremes = []
         for i, signal in enumerate(signals, 1):
-            logger.info(f"Analyzing signal {i}/{len(signals)}: {signal['stock']}")
+            logger.debug(f"Slicing price data for signal {i}/{len(signals)}: {signal['stock']}")
             
-            # Fetch price data
-            price_data = self.fetch_stock_price_data(
-                signal['stock'], 
-                signal['listing_date'], 
-                signal['cutoff_date']
-            )
+            price_data, window_extremes = None, None
+            if signal.get('listing_date') and signal.get('cutoff_date'):
+                price_data, window_extremes = self._slice_price_data(
+                    fetched_ranges.get(signal['stock'], []),
+                    signal['listing_date'],
+                    signal['cutoff_date']
+                )
             
             if price_data is None:
                 logger.warning(f"No price data available for {signal['stock']}, skipping analysis")
-                # Add signal with empty analysis
-                result = signal.copy()
-                result['price_analysis'] = self._create_empty_analysis()
-                analyzed_signals.append(result)
-                continue
-            
-            # Analyze performance
-            analysis = self.analyze_signal_performance(signal, price_data)
-            
+            price_data_list.append(price_data)
+            extremes.append(window_extremes)
+        
+        # Score every signal in one vectorized pass
+        with METRICS.timed('scoring') as items:
+            analyses = self.analyze_signals_batch(signals, price_data_list, extremes)
+            items['signals'] = len(signals)
+        
+        analyzed_signals = []
+        for signal, analysis in zip(signals, analyses):
             # Combine signal and analysis
             result = signal.copy()
             result['price_analysis'] = analysis
@@ -431,52 +849,78 @@ class SimplePriceAnalyzer:
         
         return analyzed_signals
     
+    def mark_to_market(self, signals: List[Dict]) -> List[Dict]:
+        """
+        Value open signals at current prices, fetched in bulk
+        
+        Args:
+            signals: Trading signal dictionaries (typically the active ones)
+            
+        Returns:
+            Copies of the signals with current_price and unrealized_return
+            (percent from buy_price_1) added; both None when no price is known
+        """
+        prices = self.fetch_current_prices([signal['stock'] for signal in signals])
+        
+        marked_signals = []
+        for signal in signals:
+            marked = signal.copy()
+            price = prices.get(signal['stock'])
+            buy_price = signal.get('buy_price_1')
+            marked['current_price'] = price
+            marked['unrealized_return'] = (
+                round((price - buy_price) / buy_price * 100, 2) if price and buy_price else None
+            )
+            marked_signals.append(marked)
+        
+        return marked_signals
+    
+    def performance_row(self, signal: Dict) -> Dict:
+        """Flatten an analyzed signal into a performance report row"""
+        analysis = signal.get('price_analysis', {})
+        
+        return {
+            'stock': signal['stock'],
+            'listing_date': signal['listing_date'],
+            'cutoff_date': signal['cutoff_date'],
+            'buy_price': signal['buy_price_1'],
+            'stop_loss': signal['stop_loss'],
+            'target_1': signal['target_1'],
+            'target_2': signal.get('target_2'),
+            'target_3': signal.get('target_3'),
+            'time_frame': signal['time_frame'],
+            'current_price': analysis.get('current_price'),
+            'highest_price': analysis.get('highest_price'),
+            'lowest_price': analysis.get('lowest_price'),
+            'target_1_hit': analysis.get('target_1_hit'),
+            'target_2_hit': analysis.get('target_2_hit'),
+            'target_3_hit': analysis.get('target_3_hit'),
+            'stop_loss_hit': analysis.get('stop_loss_hit'),
+            'first_hit_date': analysis.get('first_hit_date'),
+            'first_hit_price': analysis.get('first_hit_price'),
+            'outcome': analysis.get('outcome'),
+            'data_points': analysis.get('data_points')
+        }
+    
     def export_performance_report(self, analyzed_signals: List[Dict], output_path: str):
-        """Export performance analysis to CSV"""
+        """
+        Export performance analysis to CSV, or to a typed columnar file
+        when output_path ends in .npz, .parquet or .arrow
+        """
         try:
             if not analyzed_signals:
                 logger.warning("No analyzed signals to export")
                 return False
             
-            # Define fieldnames for CSV
-            fieldnames = [
-                'stock', 'listing_date', 'cutoff_date', 'buy_price', 'stop_loss',
-                'target_1', 'target_2', 'target_3', 'time_frame', 'current_price',
-                'highest_price', 'lowest_price', 'target_1_hit', 'target_2_hit',
-                'target_3_hit', 'stop_loss_hit', 'first_hit_date', 'first_hit_price',
-                'outcome', 'data_points'
-            ]
-            
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for signal in analyzed_signals:
-                    analysis = signal.get('price_analysis', {})
-                    
-                    row = {
-                        'stock': signal['stock'],
-                        'listing_date': signal['listing_date'],
-                        'cutoff_date': signal['cutoff_date'],
-                        'buy_price': signal['buy_price_1'],
-                        'stop_loss': signal['stop_loss'],
-                        'target_1': signal['target_1'],
-                        'target_2': signal.get('target_2'),
-                        'target_3': signal.get('target_3'),
-                        'time_frame': signal['time_frame'],
-                        'current_price': analysis.get('current_price'),
-                        'highest_price': analysis.get('highest_price'),
-                        'lowest_price': analysis.get('lowest_price'),
-                        'target_1_hit': analysis.get('target_1_hit'),
-                        'target_2_hit': analysis.get('target_2_hit'),
-                        'target_3_hit': analysis.get('target_3_hit'),
-                        'stop_loss_hit': analysis.get('stop_loss_hit'),
-                        'first_hit_date': analysis.get('first_hit_date'),
-                        'first_hit_price': analysis.get('first_hit_price'),
-                        'outcome': analysis.get('outcome'),
-                        'data_points': analysis.get('data_points')
-                    }
-                    writer.writerow(row)
+            rows = (self.performance_row(signal) for signal in analyzed_signals)
+            
+            if is_columnar_path(output_path):
+                write_columnar(rows, output_path, columns=PERFORMANCE_FIELDS)
+            else:
+                with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.DictWriter(csvfile, fieldnames=PERFORMANCE_FIELDS)
+                    writer.writeheader()
+                    writer.writerows(rows)
             
             logger.info(f"Exported performance report to: {output_path}")
             return True
@@ -539,14 +983,17 @@ def main():
     # Initialize price analyzer
     price_analyzer = SimplePriceAnalyzer()
     
-    # Analyze performance
-    performance_results = price_analyzer.analyze_multiple_signals(expired_signals)
-    
-    # Print summary
-    price_analyzer.print_performance_summary(performance_results)
-    
-    # Export results
-    price_analyzer.export_performance_report(performance_results, 'performance_report.csv')
+    try:
+        # Analyze performance
+        performance_results = price_analyzer.analyze_multiple_signals(expired_signals)
+        
+        # Print summary
+        price_analyzer.print_performance_summary(performance_results)
+        
+        # Export results
+        price_analyzer.export_performance_report(performance_results, 'performance_report.csv')
+    finally:
+        price_analyzer.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+"""Replay must only answer requests that were recorded exactly"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from http_replay import RecordReplayClient  # noqa: E402
+from simple_price_analyzer import SimplePriceAnalyzer  # noqa: E402
+from stub_price_server import StubPriceServer  # noqa: E402
+
+FAST_LIMITS = {'yahoo': (1000, 50), 'alpha_vantage': (1000, 50)}
+
+
+def _analyzer(server, client):
+    return SimplePriceAnalyzer('demo', cache_path=None, base_urls=server.base_urls(),
+                               http_client=client, rate_limits=FAST_LIMITS)
+
+
+def _record(server, directory):
+    analyzer = _analyzer(server, RecordReplayClient(directory, 'record'))
+    try:
+        assert analyzer.fetch_stock_price_data('HAL', '2024-05-01', '2024-05-31')
+        assert analyzer._fetch_current_from_alpha_vantage('HAL')
+        assert analyzer._fetch_current_from_yahoo('HAL')
+    finally:
+        analyzer.close()
+
+
+def test_recorded_requests_replay(tmp_path):
+    with StubPriceServer() as server:
+        _record(server, str(tmp_path))
+        analyzer = _analyzer(server, RecordReplayClient(str(tmp_path), 'replay'))
+    try:
+        # The stand-in server is stopped, so these can only come from the recordings
+        assert len(analyzer.fetch_stock_price_data('HAL', '2024-05-01', '2024-05-31')) > 0
+        assert analyzer._fetch_current_from_alpha_vantage('HAL') is not None
+        assert analyzer._fetch_current_from_yahoo('HAL') is not None
+    finally:
+        analyzer.close()
+
+
+def test_unrecorded_symbol_is_a_miss(tmp_path):
+    with StubPriceServer() as server:
+        _record(server, str(tmp_path))
+    client = RecordReplayClient(str(tmp_path), 'replay')
+    analyzer = _analyzer(server, client)
+    try:
+        assert analyzer._fetch_current_from_alpha_vantage('TECHM') is None
+        assert analyzer._fetch_current_from_yahoo('TECHM') is None
+        assert client.misses == 2
+    finally:
+        analyzer.close()
+
+
+def test_unrecorded_window_is_a_miss_and_not_cached(tmp_path):
+    with StubPriceServer() as server:
+        _record(server, str(tmp_path))
+    analyzer = _analyzer(server, RecordReplayClient(str(tmp_path), 'replay'))
+    try:
+        assert not analyzer.fetch_stock_price_data('HAL', '2024-06-01', '2024-06-30')
+        # A miss must not mark the window as fetched
+        missing = analyzer.price_cache.missing_ranges('HAL', '2024-06-01', '2024-06-30')
+        assert missing == [('2024-06-01', '2024-06-30')]
+    finally:
+        analyzer.close()
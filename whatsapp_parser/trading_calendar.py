@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+NSE Trading Calendar
+Weekend and exchange-holiday aware day arithmetic over datetime64 arrays
+"""
+
+from typing import Iterable, Optional, Set
+import logging
+
+import numpy as np
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# NSE equity segment trading holidays falling on weekdays. Years not listed
+# here only skip weekends; pass a holidays file to extend the calendar.
+NSE_HOLIDAYS = [
+    # 2024
+    '2024-01-22', '2024-01-26', '2024-03-08', '2024-03-25', '2024-03-29',
+    '2024-04-11', '2024-04-17', '2024-05-01', '2024-05-20', '2024-06-17',
+    '2024-07-17', '2024-08-15', '2024-10-02', '2024-11-01', '2024-11-15',
+    '2024-11-20', '2024-12-25',
+    # 2025
+    '2025-02-26', '2025-03-14', '2025-03-31', '2025-04-10', '2025-04-14',
+    '2025-04-18', '2025-05-01', '2025-08-15', '2025-08-27', '2025-10-02',
+    '2025-10-21', '2025-10-22', '2025-11-05', '2025-12-25',
+]
+
+# Years the built-in holiday list covers
+NSE_HOLIDAY_YEARS = sorted({int(holiday[:4]) for holiday in NSE_HOLIDAYS})
+
+# Help text of the --holidays option shared by the command line tools
+HOLIDAYS_HELP = (
+    'File with extra exchange holidays, one YYYY-MM-DD per line (implies --trading-days). '
+    f'Required for dates outside {NSE_HOLIDAY_YEARS[0]}-{NSE_HOLIDAY_YEARS[-1]}, '
+    'which the built-in NSE list does not cover'
+)
+
+
+class TradingCalendar:
+    """Trading-day offsets for the Indian equity market (Mon-Fri minus NSE holidays)"""
+
+    def __init__(self, holidays: Optional[Iterable[str]] = None):
+        """
+        Initialize trading calendar
+
+        Args:
+            holidays: Holiday dates (YYYY-MM-DD), defaults to NSE_HOLIDAYS
+        """
+        holidays = NSE_HOLIDAYS if holidays is None else list(holidays)
+        self.holidays = np.array(sorted(set(holidays)), dtype='datetime64[D]')
+        self.busdaycal = np.busdaycalendar(weekmask='1111100', holidays=self.holidays)
+        # Years with at least one holiday listed; other years only skip weekends
+        self.covered_years = set(self._years(self.holidays))
+        self._warned_years: Set[int] = set()
+
+    @classmethod
+    def from_file(cls, file_path: str, include_defaults: bool = True) -> 'TradingCalendar':
+        """
+        Build a calendar from a file with one YYYY-MM-DD holiday per line
+
+        Args:
+            file_path: Path to the holidays file (blank lines and # comments ignored)
+            include_defaults: Whether to keep the built-in NSE_HOLIDAYS as well
+
+        Returns:
+            TradingCalendar with the combined holidays
+        """
+        holidays = list(NSE_HOLIDAYS) if include_defaults else []
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    holidays.append(line)
+        logger.info(f"Loaded trading calendar with {len(holidays)} holidays from {file_path}")
+        return cls(holidays)
+
+    def add_trading_days(self, dates: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """
+        Move each date forward by a number of trading days
+
+        Dates on a weekend or holiday are first rolled to the next trading
+        day, so a signal posted on Saturday with a 5 day time frame expires
+        five sessions after Monday. NaT dates stay NaT.
+
+        Args:
+            dates: datetime64[D] array of start dates
+            days: Trading days to add per date
+
+        Returns:
+            datetime64[D] array of offset dates
+        """
+        offsets = np.busday_offset(dates, days, roll='forward', busdaycal=self.busdaycal)
+        self._check_coverage(dates)
+        self._check_coverage(offsets)
+        return offsets
+
+    def is_trading_day(self, dates: np.ndarray) -> np.ndarray:
+        """Check which datetime64[D] dates are trading sessions"""
+        self._check_coverage(dates)
+        return np.is_busday(dates, busdaycal=self.busdaycal)
+
+    def _years(self, dates: np.ndarray) -> np.ndarray:
+        """Get the distinct calendar years of a datetime64 array, ignoring NaT"""
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        dates = dates[~np.isnat(dates)]
+        return np.unique(dates.astype('datetime64[Y]').astype(np.int64) + 1970).tolist()
+
+    def _check_coverage(self, dates: np.ndarray):
+        """Warn once per year when dates fall in a year without any listed holidays"""
+        for year in self._years(dates):
+            if year not in self.covered_years and year not in self._warned_years:
+                self._warned_years.add(year)
+                logger.warning(f"No exchange holidays listed for {year}; only weekends are skipped "
+                               f"(pass a holidays file with --holidays to cover it)")
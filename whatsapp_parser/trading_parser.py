@@ -7,16 +7,145 @@ Extracts structured trading data from WhatsApp chat exports
 import re
 import csv
 import json
+import hashlib
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator
 import logging
+import os
 import sys
+import time
 import argparse
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+from columnar_io import write_columnar
+from metrics import METRICS
+from ndjson_io import NdjsonWriter, is_ndjson_path
+from signal_store import INSERT_CHUNK_SIZE, SignalStore
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Number of lines sampled from the start of a file to detect its date layout
+DATE_SAMPLE_LINES = 1000
+
+# Column order for exported trading signals
+SIGNAL_FIELDS = [
+    'date', 'sender', 'action', 'stock', 'buy_price_1', 'buy_price_2',
+    'stop_loss', 'target_1', 'target_2', 'target_3', 'time_frame', 'raw_message'
+]
+
+
+class SignalCsvWriter:
+    """Incremental CSV writer for trading signals"""
+    
+    def __init__(self, output_path: str, fieldnames: List[str] = SIGNAL_FIELDS, append: bool = False):
+        """
+        Open the output file
+        
+        Args:
+            output_path: Output file path
+            fieldnames: CSV columns
+            append: Add rows to an existing file instead of overwriting it
+        """
+        has_rows = append and os.path.exists(output_path) and os.path.getsize(output_path) > 0
+        self.file = open(output_path, 'a' if has_rows else 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames)
+        self.needs_header = not has_rows
+        self.count = 0
+    
+    def write(self, signal: Dict):
+        """Write one signal, emitting the header before the first row"""
+        if self.needs_header:
+            self.writer.writeheader()
+            self.needs_header = False
+        self.writer.writerow(signal)
+        self.count += 1
+    
+    def close(self):
+        """Close the output file"""
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SignalJsonWriter:
+    """Incremental writer producing the same JSON array as json.dump(indent=2)"""
+    
+    def __init__(self, output_path: str, append: bool = False):
+        """
+        Open the output file
+        
+        Args:
+            output_path: Output file path
+            append: Add elements to an existing JSON array instead of overwriting it
+        """
+        self.has_elements = append and self._reopen_array(output_path)
+        self.file = open(output_path, 'a' if self.has_elements else 'w', encoding='utf-8')
+        self.count = 0
+    
+    def _reopen_array(self, output_path: str) -> bool:
+        """
+        Strip the closing bracket of an existing non-empty array so it can be extended
+        
+        Returns:
+            True if the file holds a non-empty array ready for appending
+        """
+        if not os.path.exists(output_path):
+            return False
+        
+        with open(output_path, 'rb+') as file:
+            file.seek(0, os.SEEK_END)
+            tail_start = max(0, file.tell() - 64)
+            file.seek(tail_start)
+            tail = file.read().rstrip()
+            if not tail.endswith(b']'):
+                return False
+            body = tail[:-1].rstrip()
+            if not body or body.endswith(b'['):
+                return False
+            file.truncate(tail_start + len(body))
+        return True
+    
+    def write(self, signal: Dict):
+        """Write one signal as the next array element"""
+        self.file.write(',\n' if self.count or self.has_elements else '[\n')
+        record = json.dumps(signal, indent=2, ensure_ascii=False)
+        self.file.write('  ' + record.replace('\n', '\n  '))
+        self.count += 1
+    
+    def close(self):
+        """Terminate the array and close the output file"""
+        self.file.write('\n]' if self.count or self.has_elements else '[]')
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_json_writer(output_path: str, append: bool = False):
+    """
+    Open the JSON signal writer matching the output file extension
+    
+    Args:
+        output_path: Output file path (.ndjson/.jsonl for one record per line)
+        append: Add signals to an existing file instead of overwriting it
+        
+    Returns:
+        NdjsonWriter or SignalJsonWriter
+    """
+    if is_ndjson_path(output_path):
+        return NdjsonWriter(output_path, append=append)
+    return SignalJsonWriter(output_path, append=append)
+
 
 class TradingSignalParser:
     """Parser for trading signals from WhatsApp messages"""
@@ -29,19 +158,19 @@ class TradingSignalParser:
             re.MULTILINE
         )
         
-        # Trading signal patterns - Updated to handle comma-separated buy prices
-        self.trading_patterns = [
-            # Pattern for "BUY STOCK @ PRICE1,PRICE2 SL STOPLOSS TGT TARGET1,TARGET2,TARGET3"
-            re.compile(
-                r'(BUY|SELL|HOLD)\s+([A-Z]+)\s*@\s*([\d,]+\.?\d*)\s+SL\s+([\d,]+\.?\d*)\s+TGT\s+([\d,]+\.?\d*(?:,[\d,]+\.?\d*)*)',
-                re.IGNORECASE
-            ),
-            # Alternative pattern for different formats
-            re.compile(
-                r'(BUY|SELL|HOLD)\s+([A-Z]+)\s*@\s*([\d,]+\.?\d*)\s+SL\s+([\d,]+\.?\d*)\s+TARGET\s+([\d,]+\.?\d*(?:,[\d,]+\.?\d*)*)',
-                re.IGNORECASE
-            )
-        ]
+        # Date and time prefix of a chat message, used for checkpoints
+        self.timestamp_pattern = re.compile(r'(\d{1,2}/\d{1,2}/\d{2,4},?\s*\d{1,2}:\d{2})')
+        
+        # Trading signal grammar - handles comma-separated buy prices and both
+        # "BUY STOCK @ PRICE1,PRICE2 SL STOPLOSS TGT T1,T2,T3" and "... TARGET T1,T2,T3"
+        self.signal_pattern = re.compile(
+            r'(BUY|SELL|HOLD)\s+([A-Z]+)\s*@\s*([\d,]+\.?\d*)\s+SL\s+([\d,]+\.?\d*)\s+(?:TGT|TARGET)\s+([\d,]+\.?\d*(?:,[\d,]+\.?\d*)*)',
+            re.IGNORECASE
+        )
+        
+        # Time frame patterns
+        self.time_frame_pattern = re.compile(r'Time Frame\s*:?\s*([^;\n]+)', re.IGNORECASE)
+        self.days_pattern = re.compile(r'(\d+(?:-\d+)?\s*Days?)', re.IGNORECASE)
         
         # Date formats to try
         self.date_formats = [
@@ -51,39 +180,274 @@ class TradingSignalParser:
             '%d/%m/%Y',  # DD/MM/YYYY
         ]
         
-    def parse_file(self, file_path: str) -> List[Dict]:
+        # Date layout of the current file ('MDY' or 'DMY'), detected once per file
+        self.date_order = None
+        self.date_prefix_pattern = re.compile(r'\s*(\d{1,2})/(\d{1,2})/\d{2,4}')
+        
+        # Memo of date strings already decoded (an export has few distinct dates)
+        self._date_cache = {}
+        
+    def parse_file(self, file_path: str, workers: int = 1) -> List[Dict]:
         """
         Parse WhatsApp chat file and extract trading signals
         
         Args:
             file_path: Path to the TXT file
+            workers: Number of processes to parse with (1 parses in this process)
             
         Returns:
             List of trading signal dictionaries
         """
-        logger.info(f"Parsing trading signals from file: {file_path}")
+        if workers > 1:
+            return list(self.iter_signals_parallel(file_path, workers))
+        return list(self.iter_signals(file_path))
+    
+    def iter_lines(self, file_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+        """
+        Read a chat export line by line with constant memory
+        
+        Lines are decoded as UTF-8, falling back to latin-1 for lines that
+        are not valid UTF-8.
         
+        Args:
+            file_path: Path to the TXT file
+            start: Byte offset of the first line to read
+            end: Byte offset to stop at (lines starting before it are read)
+            
+        Yields:
+            Lines without the trailing newline
+        """
+        for _, raw_line in self._iter_raw_lines(file_path, start, end):
+            yield self._decode_line(raw_line)
+    
+    def _iter_raw_lines(self, file_path: str, start: int = 0,
+                        end: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """Yield (byte offset, raw bytes) for each line starting in [start, end)"""
+        with open(file_path, 'rb') as file:
+            file.seek(start)
+            position = start
+            for raw_line in file:
+                if end is not None and position >= end:
+                    break
+                yield position, raw_line
+                position += len(raw_line)
+    
+    def _decode_line(self, raw_line: bytes) -> str:
+        """Decode a raw line as UTF-8 (latin-1 fallback) without the trailing newline"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
+            line = raw_line.decode('utf-8')
         except UnicodeDecodeError:
-            # Try with different encoding
-            with open(file_path, 'r', encoding='latin-1') as file:
-                content = file.read()
+            line = raw_line.decode('latin-1')
+        return line.rstrip('\n')
+    
+    def split_byte_ranges(self, file_path: str, chunks: int) -> List[Tuple[int, int]]:
+        """
+        Split a file into byte ranges that start and end on line boundaries
+        
+        Args:
+            file_path: Path to the TXT file
+            chunks: Desired number of ranges
+            
+        Returns:
+            List of (start, end) byte offsets covering the whole file in order
+        """
+        size = os.path.getsize(file_path)
+        boundaries = [0]
+        
+        with open(file_path, 'rb') as file:
+            for i in range(1, chunks):
+                # Move each cut forward to the start of the next line
+                file.seek(max(size * i // chunks, boundaries[-1]))
+                file.readline()
+                boundary = min(file.tell(), size)
+                if boundary > boundaries[-1]:
+                    boundaries.append(boundary)
+        
+        boundaries.append(size)
+        return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+    
+    def iter_signals_parallel(self, file_path: str, workers: int) -> Iterator[Dict]:
+        """
+        Parse a chat export in a process pool and yield signals in file order
         
-        # Split content into lines
-        lines = content.split('\n')
-        trading_signals = []
+        The file is cut into line-aligned byte ranges (a few per worker, to
+        balance uneven chunks) that are parsed independently.
+        
+        Args:
+            file_path: Path to the TXT file
+            workers: Number of worker processes
+            
+        Yields:
+            Trading signal dictionaries in file order
+        """
+        logger.info(f"Parsing trading signals from file: {file_path} ({workers} workers)")
+        
+        start_time = time.perf_counter()
+        self.prepare_for_file(file_path)
+        ranges = self.split_byte_ranges(file_path, workers * 4)
+        signal_count = 0
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map returns results in submission order, so file order is kept
+            for chunk_signals in executor.map(
+                _parse_byte_range, [file_path] * len(ranges), [start for start, _ in ranges],
+                [end for _, end in ranges], [self.date_order] * len(ranges)
+            ):
+                signal_count += len(chunk_signals)
+                yield from chunk_signals
+        
+        METRICS.record_stage('parse', time.perf_counter() - start_time, signals=signal_count,
+                             bytes=os.path.getsize(file_path))
+        logger.info(f"Extracted {signal_count} trading signals from {len(ranges)} chunks")
+    
+    def iter_signals(self, file_path: str) -> Iterator[Dict]:
+        """
+        Lazily parse WhatsApp chat file and yield trading signals
+        
+        Args:
+            file_path: Path to the TXT file
+            
+        Yields:
+            Trading signal dictionaries in file order
+        """
+        logger.info(f"Parsing trading signals from file: {file_path}")
+        
+        start_time = time.perf_counter()
+        self.prepare_for_file(file_path)
+        line_count = 0
+        signal_count = 0
         
         # Parse messages
-        for line in lines:
+        for line in self.iter_lines(file_path):
+            line_count += 1
             if line.strip():
                 signal_data = self._parse_trading_line(line)
                 if signal_data:
-                    trading_signals.append(signal_data)
+                    signal_count += 1
+                    yield signal_data
+        
+        METRICS.record_stage('parse', time.perf_counter() - start_time, lines=line_count, signals=signal_count)
+        logger.info(f"Extracted {signal_count} trading signals from {line_count} lines")
+    
+    def parse_incremental(self, file_path: str, csv_path: str, json_path: str,
+                          checkpoint_path: Optional[str] = None,
+                          store: Optional[SignalStore] = None) -> int:
+        """
+        Parse only the messages appended since the last run and append them to the outputs
         
-        logger.info(f"Extracted {len(trading_signals)} trading signals from {len(lines)} lines")
-        return trading_signals
+        A checkpoint next to the CSV output records the byte offset parsed up
+        to, a hash of the last line and the last message timestamp. If the
+        export was truncated or rotated (the line before the offset no longer
+        matches) or an output is missing, the whole file is parsed again.
+        
+        A final line without a newline is parsed, but the offset stays at its
+        start and only its hash is kept, so it is re-read (and skipped if
+        unchanged) once more messages are appended after it.
+        
+        Args:
+            file_path: Path to the TXT file
+            csv_path: CSV output path
+            json_path: JSON output path
+            checkpoint_path: Checkpoint file path (default: next to csv_path)
+            store: Signal store the new signals are also added to (optional)
+            
+        Returns:
+            Number of new trading signals written
+        """
+        checkpoint_path = checkpoint_path or f"{os.path.splitext(csv_path)[0]}.checkpoint.json"
+        checkpoint = self._load_checkpoint(checkpoint_path)
+        
+        resume = (
+            checkpoint is not None
+            and os.path.exists(csv_path)
+            and os.path.exists(json_path)
+            and self._checkpoint_matches(file_path, checkpoint)
+        )
+        if checkpoint is not None and not resume:
+            logger.warning(f"Checkpoint {checkpoint_path} does not match {file_path}, "
+                           "falling back to a full parse")
+        
+        if resume:
+            state = dict(checkpoint)
+            logger.info(f"Resuming {file_path} at byte {state['offset']} "
+                        f"(last message {state.get('last_timestamp')})")
+        else:
+            state = {'offset': 0, 'last_line_start': 0, 'last_line_hash': None,
+                     'tail_hash': None, 'last_timestamp': None}
+        
+        self.prepare_for_file(file_path)
+        resume_offset = state['offset']
+        tail_hash = state.get('tail_hash')
+        new_signals = []
+        
+        with SignalCsvWriter(csv_path, append=resume) as csv_writer, \
+                open_json_writer(json_path, append=resume) as json_writer:
+            for position, raw_line in self._iter_raw_lines(file_path, resume_offset):
+                line = self._decode_line(raw_line)
+                line_hash = self._hash_line(raw_line)
+                # The unterminated last line of the previous run was already written
+                already_written = position == resume_offset and line_hash == tail_hash
+                
+                if line.strip() and not already_written:
+                    timestamp = self.timestamp_pattern.match(line)
+                    if timestamp:
+                        state['last_timestamp'] = timestamp.group(1)
+                    
+                    signal_data = self._parse_trading_line(line)
+                    if signal_data:
+                        csv_writer.write(signal_data)
+                        json_writer.write(signal_data)
+                        new_signals.append(signal_data)
+                
+                if raw_line.endswith(b'\n'):
+                    state['last_line_start'] = position
+                    state['last_line_hash'] = line_hash
+                    state['offset'] = position + len(raw_line)
+                    state['tail_hash'] = None
+                else:
+                    state['tail_hash'] = line_hash
+        
+        if store is not None and new_signals:
+            store.add_signals(new_signals)
+        
+        # Replace the checkpoint atomically; a truncated one would read as
+        # "no checkpoint" and append the whole chat to the outputs again
+        temp_path = f"{checkpoint_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, checkpoint_path)
+        
+        logger.info(f"Appended {csv_writer.count} new trading signals from {file_path}")
+        return csv_writer.count
+    
+    def _load_checkpoint(self, checkpoint_path: str) -> Optional[Dict]:
+        """Load an incremental parse checkpoint, or None if missing or unreadable"""
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _hash_line(self, raw_line: bytes) -> str:
+        """Hash a raw line, ignoring its line ending"""
+        return hashlib.sha256(raw_line.rstrip(b'\r\n')).hexdigest()
+    
+    def _checkpoint_matches(self, file_path: str, checkpoint: Dict) -> bool:
+        """Check that the file still starts with the content the checkpoint was taken from"""
+        try:
+            offset = checkpoint['offset']
+            line_start = checkpoint['last_line_start']
+            if os.path.getsize(file_path) < offset:
+                return False
+            if checkpoint.get('last_line_hash') is None:
+                return offset == 0
+            
+            with open(file_path, 'rb') as f:
+                f.seek(line_start)
+                last_line = f.read(offset - line_start)
+            return self._hash_line(last_line) == checkpoint['last_line_hash']
+        except (KeyError, TypeError, OSError):
+            return False
     
     def _parse_trading_line(self, line: str) -> Optional[Dict]:
         """
@@ -95,6 +459,10 @@ class TradingSignalParser:
         Returns:
             Dictionary with trading signal data or None if not a valid signal
         """
+        # Cheap rejection of chat lines that cannot contain a signal, before any regex
+        if not self._may_contain_signal(line):
+            return None
+        
         # First, extract date and message content
         match = self.message_pattern.match(line)
         if not match:
@@ -144,10 +512,68 @@ class TradingSignalParser:
             'raw_message': message.strip()
         }
     
+    def prepare_for_file(self, file_path: str):
+        """
+        Detect the date layout of a chat export from its first lines
+        
+        Args:
+            file_path: Path to the TXT file
+        """
+        self._date_cache = {}
+        self.date_order = self.detect_date_order(islice(self.iter_lines(file_path), DATE_SAMPLE_LINES))
+        logger.debug(f"Detected {self.date_order} date layout for {file_path}")
+    
+    def detect_date_order(self, lines: Iterable[str]) -> str:
+        """
+        Decide whether a chat writes dates month-first or day-first
+        
+        A leading field above 12 can only be a day and a middle field above
+        12 can only be a day; the majority wins. Without any unambiguous
+        date, month-first is assumed, as in the date_formats order.
+        
+        Args:
+            lines: Sample of chat lines
+            
+        Returns:
+            'MDY' or 'DMY'
+        """
+        month_first = 0
+        day_first = 0
+        for line in lines:
+            match = self.date_prefix_pattern.match(line)
+            if not match:
+                continue
+            first, second = int(match.group(1)), int(match.group(2))
+            if first > 12 >= second:
+                day_first += 1
+            elif second > 12 >= first:
+                month_first += 1
+        
+        return 'DMY' if day_first > month_first else 'MDY'
+    
+    def _may_contain_signal(self, line: str) -> bool:
+        """
+        Check for the keywords every signal needs (@, SL, BUY/SELL/HOLD, TGT/TARGET)
+        
+        Substring tests run in C and reject most chat lines far faster than
+        the full grammar; they never reject a line the grammar would accept.
+        """
+        if '@' not in line:
+            return False
+        upper = line.upper()
+        return (
+            'SL' in upper
+            and ('BUY' in upper or 'SELL' in upper or 'HOLD' in upper)
+            and ('TGT' in upper or 'TARGET' in upper)
+        )
+    
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """
         Parse date string into datetime object
         
+        Uses the layout detected for the current file and a memo of dates
+        already seen, falling back to trying each of date_formats.
+        
         Args:
             date_str: Date string
             
@@ -156,6 +582,45 @@ class TradingSignalParser:
         """
         date_str = date_str.strip()
         
+        if date_str in self._date_cache:
+            return self._date_cache[date_str]
+        
+        date_obj = self._decode_date(date_str) if self.date_order else None
+        if date_obj is None:
+            date_obj = self._parse_date_with_formats(date_str)
+        
+        self._date_cache[date_str] = date_obj
+        return date_obj
+    
+    def _decode_date(self, date_str: str) -> Optional[datetime]:
+        """
+        Decode a D/M/Y or M/D/Y date by integer slicing using the detected layout
+        
+        Args:
+            date_str: Date string such as '6/29/25'
+            
+        Returns:
+            datetime object or None if the string does not fit the layout
+        """
+        parts = date_str.split('/')
+        if len(parts) != 3 or not all(part.isdigit() for part in parts):
+            return None
+        
+        first, second, year = int(parts[0]), int(parts[1]), int(parts[2])
+        if len(parts[2]) == 2:
+            # Same pivot as strptime's %y
+            year += 2000 if year < 69 else 1900
+        elif len(parts[2]) != 4:
+            return None
+        
+        month, day = (first, second) if self.date_order == 'MDY' else (second, first)
+        try:
+            return datetime(year, month, day)
+        except ValueError:
+            return None
+    
+    def _parse_date_with_formats(self, date_str: str) -> Optional[datetime]:
+        """Parse a date by trying each of date_formats in turn"""
         for date_format in self.date_formats:
             try:
                 return datetime.strptime(date_str, date_format)
@@ -175,11 +640,10 @@ class TradingSignalParser:
         Returns:
             Tuple of (action, stock, buy_price, stop_loss, targets) or None
         """
-        for pattern in self.trading_patterns:
-            match = pattern.search(message)
-            if match:
-                action, stock, buy_price, stop_loss, targets = match.groups()
-                return (action, stock, buy_price, stop_loss, targets)
+        match = self.signal_pattern.search(message)
+        if match:
+            action, stock, buy_price, stop_loss, targets = match.groups()
+            return (action, stock, buy_price, stop_loss, targets)
         
         return None
     
@@ -229,12 +693,12 @@ class TradingSignalParser:
         Stop at 'Days' or 'days' and don't include any text after that
         """
         # Look for 'Time Frame:' or 'Time Frame :' and extract the value
-        match = re.search(r'Time Frame\s*:?\s*([^;\n]+)', message, re.IGNORECASE)
+        match = self.time_frame_pattern.search(message)
         if match:
             time_frame_text = match.group(1).strip()
             
             # Find the position of 'Days' or 'days' and cut off everything after it
-            days_match = re.search(r'(\d+(?:-\d+)?\s*Days?)', time_frame_text, re.IGNORECASE)
+            days_match = self.days_pattern.search(time_frame_text)
             if days_match:
                 return days_match.group(1).strip()
             
@@ -306,60 +770,148 @@ class TradingSignalParser:
             'avg_stop_loss': sum(stop_losses) / len(stop_losses) if stop_losses else 0
         }
     
-    def export_csv(self, signals: List[Dict], output_path: str) -> bool:
+    def export_csv(self, signals: Iterable[Dict], output_path: str) -> bool:
         """
         Export trading signals to CSV file
         
         Args:
-            signals: List of trading signal dictionaries
+            signals: Trading signal dictionaries (list or iterator, consumed once)
             output_path: Output file path
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                if not signals:
-                    return True
-                
-                fieldnames = [
-                    'date', 'sender', 'action', 'stock', 'buy_price_1', 'buy_price_2',
-                    'stop_loss', 'target_1', 'target_2', 'target_3', 'time_frame', 'raw_message'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
+            with SignalCsvWriter(output_path) as writer:
                 for signal in signals:
-                    writer.writerow(signal)
+                    writer.write(signal)
             
-            logger.info(f"Successfully exported {len(signals)} trading signals to CSV: {output_path}")
+            logger.info(f"Successfully exported {writer.count} trading signals to CSV: {output_path}")
             return True
             
         except Exception as e:
             logger.error(f"CSV export failed: {e}")
             return False
     
-    def export_json(self, signals: List[Dict], output_path: str) -> bool:
+    def export_json(self, signals: Iterable[Dict], output_path: str) -> bool:
         """
         Export trading signals to JSON file
         
+        Paths ending in .ndjson or .jsonl get one compact record per line
+        instead of an indented array.
+        
         Args:
-            signals: List of trading signal dictionaries
+            signals: Trading signal dictionaries (list or iterator, consumed once)
             output_path: Output file path
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as jsonfile:
-                json.dump(signals, jsonfile, indent=2, ensure_ascii=False)
+            with open_json_writer(output_path) as writer:
+                for signal in signals:
+                    writer.write(signal)
             
-            logger.info(f"Successfully exported {len(signals)} trading signals to JSON: {output_path}")
+            logger.info(f"Successfully exported {writer.count} trading signals to JSON: {output_path}")
             return True
             
         except Exception as e:
             logger.error(f"JSON export failed: {e}")
             return False
+    
+    def export_columnar(self, signals: Iterable[Dict], output_path: str) -> bool:
+        """
+        Export trading signals to a typed columnar file (.npz, .parquet, .arrow)
+        
+        Args:
+            signals: Trading signal dictionaries (list or iterator, consumed once)
+            output_path: Output file path; the extension selects the format
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            count = write_columnar(signals, output_path, columns=SIGNAL_FIELDS)
+            logger.info(f"Successfully exported {count} trading signals to {output_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Columnar export failed: {e}")
+            return False
+    
+    def export_store(self, signals: Iterable[Dict], store: SignalStore) -> bool:
+        """
+        Add trading signals to an indexed signal store, skipping duplicates
+        
+        Args:
+            signals: Trading signal dictionaries (list or iterator, consumed once)
+            store: Signal store to write to
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            count = store.add_signals(signals)
+            logger.info(f"Successfully stored {count} new trading signals in {store.db_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Signal store export failed: {e}")
+            return False
+    
+    def tee_to_store(self, signals: Iterable[Dict], store: SignalStore) -> Iterator[Dict]:
+        """
+        Pass signals through unchanged while adding them to a signal store in chunks
+        
+        Args:
+            signals: Trading signal dictionaries
+            store: Signal store to write to
+            
+        Yields:
+            The same signals, in order
+        """
+        chunk = []
+        for signal in signals:
+            chunk.append(signal)
+            yield signal
+            if len(chunk) >= INSERT_CHUNK_SIZE:
+                store.add_signals(chunk)
+                chunk = []
+        if chunk:
+            store.add_signals(chunk)
+    
+    def export_stream(self, signals: Iterable[Dict], csv_path: str, json_path: str) -> int:
+        """
+        Export signals to CSV and JSON in a single pass with constant memory
+        
+        Args:
+            signals: Trading signal dictionaries, typically from iter_signals
+            csv_path: Output CSV file path
+            json_path: Output JSON file path
+            
+        Returns:
+            Number of signals written
+        """
+        with SignalCsvWriter(csv_path) as csv_writer, open_json_writer(json_path) as json_writer:
+            for signal in signals:
+                csv_writer.write(signal)
+                json_writer.write(signal)
+        
+        logger.info(f"Streamed {csv_writer.count} trading signals to {csv_path} and {json_path}")
+        return csv_writer.count
+
+
+def _parse_byte_range(file_path: str, start: int, end: int, date_order: Optional[str] = None) -> List[Dict]:
+    """Parse one line-aligned byte range of a chat export (process pool worker)"""
+    parser = TradingSignalParser()
+    parser.date_order = date_order
+    signals = []
+    for line in parser.iter_lines(file_path, start, end):
+        if line.strip():
+            signal_data = parser._parse_trading_line(line)
+            if signal_data:
+                signals.append(signal_data)
+    return signals
 
 
 def main():
@@ -371,14 +923,51 @@ def main():
     parser_arg.add_argument('--output-csv', default='trading_signals.csv',
                            help='Output CSV file (default: trading_signals.csv)')
     parser_arg.add_argument('--output-json', default='trading_signals.json',
-                           help='Output JSON file (default: trading_signals.json)')
+                           help='Output JSON file; .ndjson/.jsonl writes one signal per line '
+                                '(default: trading_signals.json)')
+    parser_arg.add_argument('--output-columnar',
+                           help='Also write a typed columnar file (.npz, or .parquet/.arrow with pyarrow)')
+    parser_arg.add_argument('--store',
+                           help='Also add the signals to an indexed SQLite signal store (duplicates skipped)')
+    parser_arg.add_argument('--stream', action='store_true',
+                           help='Stream signals straight to the output files without statistics '
+                                '(constant memory, for very large exports)')
+    parser_arg.add_argument('--workers', type=int, default=1,
+                           help='Number of processes used to parse the file (default: 1)')
+    parser_arg.add_argument('--incremental', action='store_true',
+                           help='Only parse messages appended since the last run and append them '
+                                'to the outputs (checkpoint kept next to the CSV output)')
     
     args = parser_arg.parse_args()
     
+    if args.incremental:
+        if args.workers > 1:
+            parser_arg.error('--incremental parses in a single process; it cannot be combined with --workers')
+        if args.output_columnar:
+            parser_arg.error('--incremental only appends to the CSV and JSON outputs; '
+                             'it cannot be combined with --output-columnar')
+    
     parser = TradingSignalParser()
+    store = SignalStore(args.store) if args.store else None
+    
+    if args.incremental:
+        count = parser.parse_incremental(args.input_file, args.output_csv, args.output_json, store=store)
+        print(f"Appended {count} new trading signals to {args.output_csv} and {args.output_json}")
+        return
+    
+    if args.stream:
+        if args.workers > 1:
+            signals = parser.iter_signals_parallel(args.input_file, args.workers)
+        else:
+            signals = parser.iter_signals(args.input_file)
+        if store:
+            signals = parser.tee_to_store(signals, store)
+        count = parser.export_stream(signals, args.output_csv, args.output_json)
+        print(f"Streamed {count} trading signals to {args.output_csv} and {args.output_json}")
+        return
     
     # Parse the trading chat file
-    signals = parser.parse_file(args.input_file)
+    signals = parser.parse_file(args.input_file, workers=args.workers)
     
     if not signals:
         print("No trading signals found!")
@@ -412,6 +1001,10 @@ def main():
     # Export to CSV and JSON
     parser.export_csv(signals, args.output_csv)
     parser.export_json(signals, args.output_json)
+    if args.output_columnar:
+        parser.export_columnar(signals, args.output_columnar)
+    if store:
+        parser.export_store(signals, store)
     
     print("\n" + "="*60)
     print("Trading parser test completed!")